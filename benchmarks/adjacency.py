@@ -0,0 +1,122 @@
+"""
+Leitura de adjacências do SimpleGraph contra a representação antiga (dicionário de listas).
+
+    python -m benchmarks.adjacency --size 2e5 --output adj.json
+
+Mede, para o mesmo grafo aleatório: memória em repouso e com a cache cheia (tracemalloc),
+uma passagem de get_outgoing_edges a frio e a quente, e um BMSSP completo por rótulos.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from src.solver import BoundedMultiSourceShortestPath
+from src.structures import SimpleGraph
+
+
+class DictOfListsGraph:
+    """Representação anterior aos arrays: {nó: [(vizinho, peso)]} nos dois sentidos."""
+
+    def __init__(self):
+        self.edges: Dict = {}
+        self.reverse_edges: Dict = {}
+
+    def add_edge(self, u, v, weight: float):
+        self.edges.setdefault(u, []).append((v, weight))
+        self.edges.setdefault(v, [])
+        self.reverse_edges.setdefault(v, []).append((u, weight))
+
+    def get_outgoing_edges(self, u):
+        return self.edges.get(u, [])
+
+
+BUILDERS = {
+    'dict_of_lists': DictOfListsGraph,
+    'simple_graph': SimpleGraph,
+    'simple_graph_cached': lambda: SimpleGraph(cache_adjacency=True),
+}
+
+
+def _read_pass(graph, nodes) -> float:
+    start = time.perf_counter()
+    for u in nodes:
+        graph.get_outgoing_edges(u)
+    return time.perf_counter() - start
+
+
+def _build(name: str, edges: List):
+    graph = BUILDERS[name]()
+    for u, v, w in edges:
+        graph.add_edge(u, v, w)
+    return graph
+
+
+def measure(name: str, edges: List, nodes: List, repeat: int) -> Dict:
+    # Memória num grafo à parte: o tracemalloc atrasa muito os tempos
+    tracemalloc.start()
+    graph = _build(name, edges)
+    if isinstance(graph, SimpleGraph):
+        graph.compact()
+    rest_bytes = tracemalloc.get_traced_memory()[0]
+    _read_pass(graph, nodes)
+    warm_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del graph
+
+    graph = _build(name, edges)
+    start = time.perf_counter()
+    if isinstance(graph, SimpleGraph):
+        graph.compact()
+    compact_s = time.perf_counter() - start
+    cold_s = _read_pass(graph, nodes)
+    warm_s = min(_read_pass(graph, nodes) for _ in range(repeat))
+
+    solve_s = float('inf')
+    for _ in range(repeat):
+        dist = dict.fromkeys(nodes, float('inf'))
+        dist[nodes[0]] = 0.0
+        start = time.perf_counter()
+        BoundedMultiSourceShortestPath(graph, dist, {}).solve({nodes[0]})
+        solve_s = min(solve_s, time.perf_counter() - start)
+    return {'graph': name, 'rest_bytes': rest_bytes, 'warm_bytes': warm_bytes, 'compact_s': compact_s,
+            'cold_read_s': cold_s, 'warm_read_s': warm_s, 'solve_s': solve_s}
+
+
+def run_adjacency(num_edges: int, seed: int = 0, repeat: int = 3) -> Dict:
+    rng = random.Random(seed)
+    n = max(2, num_edges // 4)
+    edges = [(rng.randrange(n), rng.randrange(n), rng.randint(1, 100) + 0.5) for _ in range(num_edges)]
+    nodes = list(range(n))
+    results = [measure(name, edges, nodes, repeat) for name in BUILDERS]
+    base = results[0]
+    for record in results:
+        record['solve_vs_dict'] = record['solve_s'] / base['solve_s']
+        record['rest_memory_vs_dict'] = record['rest_bytes'] / base['rest_bytes']
+        record['warm_memory_vs_dict'] = record['warm_bytes'] / base['warm_bytes']
+    return {'meta': {'edges': num_edges, 'nodes': n, 'seed': seed, 'repeat': repeat}, 'results': results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', default='2e5', help="número de arestas")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="ficheiro JSON de saída (por omissão, stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_adjacency(int(float(args.size)), args.seed, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import math
+import random
+from array import array
+from typing import Callable, Dict
+
+from src.csr import CSRGraph
+
+# Pesos inteiros (guardados como float): somas exatas, logo BMSSP e Dijkstra têm de coincidir bit a bit
+_MAX_WEIGHT = 100
+
+
+def _graph(num_nodes: int, sources: array, targets: array, weights: array) -> CSRGraph:
+    return CSRGraph.from_arrays(range(num_nodes), sources, targets, weights)
+
+
+def random_sparse(num_edges: int, seed: int = 0) -> CSRGraph:
+    """Grafo aleatório uniforme com grau médio 4."""
+    rng = random.Random(seed)
+    n = max(2, num_edges // 4)
+    sources = array('q', (rng.randrange(n) for _ in range(num_edges)))
+    targets = array('q', (rng.randrange(n) for _ in range(num_edges)))
+    weights = array('d', (rng.randint(1, _MAX_WEIGHT) for _ in range(num_edges)))
+    return _graph(n, sources, targets, weights)
+
+
+def grid(num_edges: int, seed: int = 0) -> CSRGraph:
+    """Malha tipo rede viária: vizinhos nas 4 direções, ruas nos dois sentidos com o mesmo custo."""
+    rng = random.Random(seed)
+    side = max(2, int(math.sqrt(num_edges / 4)))
+    sources, targets, weights = array('q'), array('q'), array('d')
+    for row in range(side):
+        for col in range(side):
+            u = row * side + col
+            for v in ((u + 1) if col + 1 < side else None, (u + side) if row + 1 < side else None):
+                if v is None:
+                    continue
+                w = rng.randint(1, _MAX_WEIGHT)
+                sources.extend((u, v))
+                targets.extend((v, u))
+                weights.extend((w, w))
+    return _graph(side * side, sources, targets, weights)
+
+
+def power_law(num_edges: int, seed: int = 0) -> CSRGraph:
+    """Anexação preferencial (Barabási–Albert, 2 ligações por nó novo, nos dois sentidos)."""
+    rng = random.Random(seed)
+    links = 2
+    n = max(links + 1, num_edges // (2 * links))
+    sources, targets, weights = array('q'), array('q'), array('d')
+    # Cada extremidade aparece uma vez por aresta: sortear daqui é sortear proporcional ao grau
+    endpoints = list(range(links))
+    for u in range(links, n):
+        for v in {rng.choice(endpoints) for _ in range(links)}:
+            w = rng.randint(1, _MAX_WEIGHT)
+            sources.extend((u, v))
+            targets.extend((v, u))
+            weights.extend((w, w))
+            endpoints.extend((u, v))
+    return _graph(n, sources, targets, weights)
+
+
+def chain(num_edges: int, seed: int = 0) -> CSRGraph:
+    """Caminho longo 0 -> 1 -> ... -> m: profundidade máxima, fronteira de um só vértice."""
+    rng = random.Random(seed)
+    sources = array('q', range(num_edges))
+    targets = array('q', range(1, num_edges + 1))
+    weights = array('d', (rng.randint(1, _MAX_WEIGHT) for _ in range(num_edges)))
+    return _graph(num_edges + 1, sources, targets, weights)
+
+
+GENERATORS: Dict[str, Callable[[int, int], CSRGraph]] = {
+    'random': random_sparse,
+    'grid': grid,
+    'power_law': power_law,
+    'chain': chain,
+}
@@ -0,0 +1,96 @@
+"""
+Speedup do modo paralelo (ParallelSolver) contra o BMSSP sequencial, por número de processos.
+
+    python -m benchmarks.parallel --family grid --size 1e6 --processes 1,2,4,8 --output par.json
+
+Cada número de processos corre `--repeat` consultas a partir do id 0 (fica o melhor tempo);
+as distâncias são comparadas com as do solver sequencial.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from array import array
+from typing import Dict, List, Optional
+
+from src.parallel import ParallelSolver
+from src.solver import BoundedMultiSourceShortestPath
+from .generators import GENERATORS
+
+
+def sequential(graph) -> Dict:
+    view = graph.index_view()
+    dist = array('d', [float('inf')]) * graph.num_nodes
+    dist[0] = 0.0
+    start = time.perf_counter()
+    BoundedMultiSourceShortestPath(view, dist, {}).solve({0})
+    return {'wall_s': time.perf_counter() - start, 'dist': dist}
+
+
+def run_parallel(family: str, num_edges: int, processes: List[int], seed: int = 0, repeat: int = 3,
+                 parts: Optional[int] = None) -> Dict:
+    graph = GENERATORS[family](num_edges, seed)
+    reference = sequential(graph)
+    results = []
+    for count in processes:
+        start = time.perf_counter()
+        with ParallelSolver(graph, processes=count, parts=parts) as solver:
+            setup_s = time.perf_counter() - start
+            runs = [solver.solve(0) for _ in range(repeat)]
+        best = min(runs, key=lambda r: r.wall_s)
+        results.append({
+            'processes': count, 'parts': solver.parts, 'delta': solver.delta, 'setup_s': setup_s,
+            'wall_s': best.wall_s, 'rounds': best.rounds, 'messages': best.messages,
+            'settled': best.settled, 'matches_sequential': best.dist == reference['dist'],
+        })
+    base = results[0]['wall_s'] if results else None
+    for record in results:
+        record['speedup_vs_sequential'] = reference['wall_s'] / record['wall_s']
+        record['speedup_vs_first'] = base / record['wall_s']
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'family': family, 'edges': graph.num_edges, 'nodes': graph.num_nodes, 'seed': seed,
+        },
+        'sequential_s': reference['wall_s'],
+        'results': results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--family', default='grid', choices=list(GENERATORS))
+    parser.add_argument('--size', default='1e5', help="número de arestas")
+    parser.add_argument('--processes', default=None,
+                        help="lista de processos, ex.: 1,2,4 (por omissão, potências de 2 até ao número de CPUs)")
+    parser.add_argument('--parts', type=int, default=None, help="partes da partição (por omissão, uma por processo)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="ficheiro JSON de saída (por omissão, stdout)")
+    args = parser.parse_args(argv)
+
+    if args.processes:
+        processes = [int(p) for p in args.processes.split(',')]
+    else:
+        cpus = os.cpu_count() or 1
+        processes = [1 << i for i in range(cpus.bit_length()) if 1 << i <= cpus]
+        if processes[-1] != cpus:
+            processes.append(cpus)
+
+    report = run_parallel(args.family, int(float(args.size)), processes, args.seed, args.repeat, args.parts)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0 if all(r['matches_sequential'] for r in report['results']) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
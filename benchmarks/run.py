@@ -0,0 +1,200 @@
+"""
+Benchmark BMSSP vs. Dijkstra em grafos gerados (sementes fixas).
+
+    python -m benchmarks.run --sizes 1e3,1e4,1e5 --output bench.json
+    python -m benchmarks.run --families grid,chain --config k=4,t=2 --config k=64,t=3,level=2
+
+Cada execução corre num processo próprio, para que o pico de RSS seja só seu.
+"""
+import argparse
+import heapq
+import json
+import platform
+import sys
+import time
+from array import array
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src.solver import BoundedMultiSourceShortestPath
+from .generators import GENERATORS
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_CONFIGS = [
+    {'k': 5000, 't': 50, 'level': None},
+    {'k': 4, 't': 2, 'level': None},
+    {'k': 64, 't': 3, 'level': 2},
+]
+
+
+def reference_dijkstra(graph, num_nodes: int, source: int) -> array:
+    """Dijkstra com heap binário (lazy deletion) sobre a vista por ids do CSRGraph."""
+    dist = array('d', [float('inf')]) * num_nodes
+    dist[source] = 0.0
+    pq = [(0.0, source)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        for v, w in graph.get_outgoing_edges(u):
+            if d + w < dist[v]:
+                dist[v] = d + w
+                heapq.heappush(pq, (d + w, v))
+    return dist
+
+
+class _CountingView:
+    """Vista por ids que conta as arestas devolvidas: cada uma é um relaxamento tentado."""
+
+    def __init__(self, view):
+        self._view = view
+        self.relaxations = 0
+
+    def get_outgoing_edges(self, u: int):
+        out = self._view.get_outgoing_edges(u)
+        self.relaxations += len(out)
+        return out
+
+    def __getattr__(self, name):
+        return getattr(self._view, name)
+
+
+def _run_algorithm(view, n: int, config: Optional[Dict]) -> Tuple[array, Optional[object]]:
+    if config is None:
+        return reference_dijkstra(view, n, 0), None
+    dist = array('d', [float('inf')]) * n
+    dist[0] = 0.0
+    solver = BoundedMultiSourceShortestPath(view, dist, config)
+    return dist, solver.solve({0}, level=config.get('level'))
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_case(family: str, num_edges: int, seed: int, config: Optional[Dict]) -> Tuple[Dict, array]:
+    """Gera o grafo e corre Dijkstra (config=None) ou o BMSSP com a configuração dada."""
+    start = time.perf_counter()
+    graph = GENERATORS[family](num_edges, seed)
+    build_s = time.perf_counter() - start
+    view = graph.index_view()
+    n = graph.num_nodes
+
+    record = {'family': family, 'edges': graph.num_edges, 'nodes': n, 'seed': seed, 'build_s': build_s}
+    if config is None:
+        record['algorithm'] = 'dijkstra'
+    else:
+        record.update(algorithm='bmssp', **config)
+    start = time.perf_counter()
+    dist, result = _run_algorithm(view, n, config)
+    wall_s = time.perf_counter() - start
+    if result is not None:
+        record.update(budget_hits=result.budget_hits, resumes=result.resumes)
+
+    # Segunda execução, fora do tempo medido, só para contar as arestas relaxadas (é determinística)
+    counter = _CountingView(view)
+    _run_algorithm(counter, n, config)
+
+    record.update(
+        wall_s=wall_s,
+        relaxations=counter.relaxations,
+        relaxations_per_s=counter.relaxations / wall_s if wall_s > 0 else None,
+        reached=sum(1 for d in dist if d < float('inf')),
+        peak_rss_kb=_peak_rss_kb(),
+    )
+    return record, dist
+
+
+def _child(conn, args):
+    conn.send(run_case(*args))
+    conn.close()
+
+
+def _run_isolated(args) -> Tuple[Dict, array]:
+    ctx = get_context('spawn')
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_child, args=(child_conn, args))
+    process.start()
+    child_conn.close()
+    try:
+        return parent_conn.recv()
+    finally:
+        process.join()
+
+
+def run_benchmarks(families: List[str], sizes: List[int], configs: List[Dict], seed: int = 0,
+                   isolate: bool = True) -> Dict:
+    """Corre todas as combinações e devolve o relatório (serializável em JSON)."""
+    run = _run_isolated if isolate else (lambda args: run_case(*args))
+    results = []
+    for family in families:
+        for size in sizes:
+            reference, expected = run((family, size, seed, None))
+            results.append(reference)
+            for config in configs:
+                record, dist = run((family, size, seed, config))
+                mismatches = sum(1 for a, b in zip(dist, expected) if a != b)
+                record.update(mismatches=mismatches, matches_dijkstra=mismatches == 0,
+                              speedup_vs_dijkstra=reference['wall_s'] / record['wall_s'] if record['wall_s'] else None)
+                results.append(record)
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'isolated_processes': isolate,
+        },
+        'results': results,
+    }
+
+
+def _parse_config(text: str) -> Dict:
+    config = {'k': 5000, 't': 50, 'level': None}
+    for item in filter(None, text.split(',')):
+        key, _, value = item.partition('=')
+        if key not in config:
+            raise argparse.ArgumentTypeError(f"parâmetro desconhecido: {key}")
+        config[key] = int(value)
+    return config
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--families', default=','.join(GENERATORS),
+                        help=f"famílias de grafos ({', '.join(GENERATORS)})")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="número de arestas, ex.: 1e3,1e5,1e7")
+    parser.add_argument('--config', action='append', type=_parse_config,
+                        help="configuração do BMSSP, ex.: k=4,t=2,level=3 (repetível)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="ficheiro JSON de saída (por omissão, stdout)")
+    parser.add_argument('--no-isolate', action='store_true', help="corre tudo no processo atual")
+    args = parser.parse_args(argv)
+
+    families = args.families.split(',')
+    unknown = set(families) - set(GENERATORS)
+    if unknown:
+        parser.error(f"famílias desconhecidas: {', '.join(sorted(unknown))}")
+    sizes = [int(float(size)) for size in args.sizes.split(',')]
+
+    report = run_benchmarks(families, sizes, args.config or DEFAULT_CONFIGS, args.seed, not args.no_isolate)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0 if all(r.get('matches_dijkstra', True) for r in report['results']) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
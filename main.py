@@ -1,138 +1,96 @@
 import os    # <--- IMPORTANTE: Deve ser o primeiro
 import sys   # <--- IMPORTANTE: Deve ser o segundo
-import json
 import webbrowser
-from pyvis.network import Network
 
 # Adiciona a raiz do projeto ao PATH para que o Python encontre a pasta 'src'
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
 # Imports do seu código fonte
-from src.structures import SimpleGraph
-from src.solver import BoundedMultiSourceShortestPath
+from src.session import SolverSession
+from src.loaders import read_json_graph
+from src.planner import plan_parameters
+from src.export import export_route
 
-def print_path_summary(dist_map, start_node, target_node, graph):
-    """Extrai e imprime a rota e o custo total no console."""
-    path = []
-    curr = target_node
+def print_path_summary(dist_map, start_node, target_node, path):
+    """Imprime no console a rota (vinda de solver.path_to) e o custo total."""
     total_cost = dist_map.get(target_node, float('inf'))
 
     if total_cost == float('inf'):
         print(f"\n❌ ROTA NÃO ENCONTRADA: Não há caminho de {start_node} para {target_node}")
         return
 
-    # Backtracking para reconstruir a lista de nós
-    while curr != start_node:
-        path.append(curr)
-        found = False
-        for p, w in graph.get_incoming_edges(curr):
-            if abs(dist_map.get(p, float('inf')) + w - dist_map[curr]) < 1e-5:
-                curr = p
-                found = True
-                break
-        if not found: break
-    
-    path.append(start_node)
-    path.reverse() # Inverte para ficar de Start -> Target
-
     # Imprime no console com setas
     print("\n" + "="*50)
     print(f"📍 RESUMO DA ROTA (GPS)")
     print(f"🟩 Origem: {start_node} | 🏁 Destino: {target_node}")
-    print(f"🛣️  Caminho: {' ➔ '.join(path)}")
+    print(f"🛣️  Caminho: {' ➔ '.join(map(str, path))}")
     print(f"💰 Custo Total: {total_cost:.2f}")
     print("="*50 + "\n")
 
-def visualize_interactive_gps(graph, dist_map, start_node, target_node, filename="resultado_gps.html"):
-    # 1. Backtracking (Lógica da rota amarela)
-    path_edges = set()
-    curr = target_node
-    if dist_map.get(curr, float('inf')) != float('inf'):
-        while curr != start_node:
-            found = False
-            for p, w in graph.get_incoming_edges(curr):
-                if abs(dist_map.get(p, float('inf')) + w - dist_map[curr]) < 1e-5:
-                    path_edges.add((p, curr))
-                    curr = p
-                    found = True
-                    break
-            if not found: break
-
-    # 2. CRIAR O OBJETO 'net' (ESTA LINHA DEVE VIR ANTES DE QUALQUER 'net.')
-    net = Network(height="700px", width="100%", bgcolor="#0d0d0d", font_color="white", directed=True)
-    
-    # 3. Adicionar Nós e Arestas
-    for n, d in dist_map.items():
-        color = "#00FF00" if n == start_node else ("#FF0000" if n == target_node else "#444444")
-        net.add_node(n, label=f"{n}\n({d:.1f})", color=color, size=25)
-
-    for u, edges in graph.edges.items():
-        for v, w in edges:
-            is_gps = (u, v) in path_edges
-            net.add_edge(u, v, label=str(w), 
-                         color="#FFFF00" if is_gps else "#333333", 
-                         width=5 if is_gps else 1, arrows="to")
-
-    net.force_atlas_2based(spring_length=250)
-    
-    # 4. AGORA SIM, GERAR O HTML (net já existe aqui)
-    html_content = net.generate_html()
-    
-    # Injeção do título e gravação na pasta 'output'
-    output_dir = "output"
-    if not os.path.exists(output_dir): os.makedirs(output_dir)
-    
+def visualize_interactive_gps(graph, dist_map, start_node, target_node, filename="resultado_gps.html", path=None,
+                              output_dir="output", hops=1, radius=None, open_browser=False):
+    """
+    Exporta a rota e a sua vizinhança (hops/radius) para output/<filename>: HTML com
+    posições fixas e física desligada, ou .geojson/.jsonl pela extensão. Só desenha o
+    que está à volta da rota, por isso escala para grafos grandes e corre sem browser.
+    """
     filepath = os.path.join(output_dir, filename)
-    
-    custom_header = f'<div style="background:#1a1a1a; color:white; padding:15px; text-align:center;"><h2 style="margin:0;">SSSP: <span style="color:#00FF00">{start_node}</span> para <span style="color:#FF0000">{target_node}</span></h2></div>'
-    html_content = html_content.replace("<body>", f"<body>{custom_header}")
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(html_content)
-    
-    webbrowser.open("file://" + os.path.abspath(filepath))
-
-def load_graph_data(filename, graph_obj):
-    """Carrega nós e arestas de um JSON e popula o grafo."""
+    title = f'SSSP: <span style="color:#00FF00">{start_node}</span> para <span style="color:#FF0000">{target_node}</span>'
+    html_options = {'start_node': start_node, 'target_node': target_node, 'title': title} if filepath.endswith('.html') else {}
+    subgraph = export_route(graph, dist_map, path or [start_node], filepath, hops=hops, radius=radius, **html_options)
+    print(f"🗺️  {len(subgraph.nodes)} nós / {len(subgraph.edges)} arestas exportados para {filepath}")
+
+    if open_browser:
+        webbrowser.open("file://" + os.path.abspath(filepath))
+    return filepath
+
+def load_graph_data(filename):
+    """
+    Carrega o cenário JSON em streaming e monta o grafo de uma vez (SimpleGraph.from_arrays).
+    Devolve (grafo, nós, grafo do solver, escala): com pesos decimais o solver corre sobre
+    uma cópia em unidades inteiras de 1/escala, para somas exatas.
+    """
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            for edge in data['edges']:
-                graph_obj.add_edge(edge['u'], edge['v'], edge['w'])
-            return data['nodes']
+        edges, data = read_json_graph(filename)
     except FileNotFoundError:
         print(f"❌ Erro: O ficheiro {filename} não foi encontrado!")
-        return None
+        return None, None, None, 1
+    graph = edges.to_simple_graph()
+    scale = edges.weight_profile().scale
+    solver_graph = edges.scaled(scale).to_simple_graph() if scale > 1 else graph
+    return graph, data.get('nodes', []), solver_graph, scale
 
 def main():
     print("=== FINAL BMSSP (EXECUTANDO CENÁRIO COMPLEXO) ===")
-    graph = SimpleGraph()
-    
+
     # 1. Carregar Dados do SEU ficheiro
     cenario_arquivo = os.path.join("data", "cenario_complexo.json")
-    all_nodes = load_graph_data(cenario_arquivo, graph)
+    graph, all_nodes, solver_graph, scale = load_graph_data(cenario_arquivo)
     
     if not all_nodes:
         return 
 
-    # 2. Configuração Inicial das Distâncias
-    # Para o algoritmo funcionar como SSSP, a origem deve ser 0.0
-    dist_map = {node: float('inf') for node in all_nodes}
-    dist_map["A"] = 0.0 
-    
-    # 3. Executar o Solver (Onde a magia acontece)
-    constants = {'k': 5000, 't': 50} 
-    solver = BoundedMultiSourceShortestPath(graph, dist_map, constants)
+    # 2. Parâmetros (level, k, t, limite) derivados do tamanho do grafo e dos pesos
+    plan = plan_parameters(solver_graph, num_nodes=len(all_nodes))
+    print(f"⚙️  Plano: level={plan.level}, k={plan.k}, t={plan.t}, B={plan.bound:g}, fila={plan.queue}, escala={scale}")
+
+    # Sessão do Solver: buffers de distância/predecessores alocados uma única vez
+    session = SolverSession(solver_graph, plan.constants, nodes=all_nodes, weight_scale=scale)
+    dist_map = session.distances
     
-    # O solver vai preencher o dist_map com os valores corretos
-    solver.bmssp(level=2, bound=5000.0, sources={"A"}) 
+    # 3. Consulta ponto-a-ponto: para assim que F fica com a distância final
+    # (o limite do plano está em unidades do solver; a sessão volta a multiplicá-lo pela escala)
+    result = session.query("A", "F", bound=plan.bound / scale, level=plan.level)
+    print(f"ℹ️  Vértices completados: {result.settled}/{result.total_vertices} ({result.settled_fraction:.0%})")
 
-    # 🆕 NOVO: Mostrar no console
-    print_path_summary(dist_map, "A", "F", graph)
+    # 🆕 NOVO: Mostrar no console (rota pelos predecessores, sem backtracking)
+    path = result.path or []
+    print_path_summary(dist_map, "A", "F", path)
 
     # 4. Visualização Final (CHAMADA ÚNICA)
     # Removido o argumento extra {"A"} para evitar o TypeError
-    visualize_interactive_gps(graph, dist_map, start_node="A", target_node="F")
+    visualize_interactive_gps(graph, dist_map, start_node="A", target_node="F", path=path,
+                              open_browser="--abrir" in sys.argv)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
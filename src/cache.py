@@ -0,0 +1,115 @@
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from .session import SolverSession
+
+
+@dataclass
+class ShortestPathTree:
+    """Árvore de caminhos mínimos de uma fonte em arrays compactos indexados pelo id do nó."""
+    source: Any
+    dist: array        # 'd': distância de cada id (inf = inalcançável)
+    pred: array        # 'q': id do pai (-1 = fonte ou inalcançável)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.dist) * self.dist.itemsize + len(self.pred) * self.pred.itemsize
+
+    def distance(self, node_id: int) -> float:
+        # Nós criados depois da árvore não são alcançáveis a partir dela
+        return self.dist[node_id] if node_id < len(self.dist) else float('inf')
+
+    def path(self, node_id: int) -> List[int]:
+        """Ids da fonte até 'node_id' seguindo os pais: O(comprimento do caminho)."""
+        if self.distance(node_id) == float('inf'):
+            return []
+        path = [node_id]
+        while self.pred[path[-1]] != -1:
+            path.append(self.pred[path[-1]])
+        path.reverse()
+        return path
+
+
+class TreeCache:
+    """
+    Cache LRU de árvores de caminhos mínimos por fonte, com orçamento em bytes.
+
+    Cada falha corre o BMSSP completo a partir da fonte (numa SolverSession sobre ids) e
+    guarda as distâncias e os pais em arrays; qualquer alvo dessa fonte passa a custar O(1)
+    (distância) ou O(caminho) (rota). Quando `graph.version` muda, todas as árvores caem.
+    """
+
+    def __init__(self, graph, constants: Optional[Dict] = None, max_bytes: int = 64 << 20,
+                 nodes: Optional[Sequence] = None):
+        if not hasattr(graph, 'id_of'):
+            raise TypeError("a cache precisa de um grafo com ids internos (SimpleGraph ou CSRGraph)")
+        self.graph = graph
+        self.constants = constants
+        self.max_bytes = max_bytes
+        self.session = SolverSession(graph, constants, nodes=nodes)
+        self._trees: "OrderedDict[Any, ShortestPathTree]" = OrderedDict()
+        self._version = getattr(graph, 'version', 0)
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def tree(self, source) -> ShortestPathTree:
+        self._check_version()
+        tree = self._trees.get(source)
+        if tree is not None:
+            self.hits += 1
+            self._trees.move_to_end(source)
+            return tree
+
+        self.misses += 1
+        self.session.solve({source})
+        tree = ShortestPathTree(source, *self.session.tree_arrays())
+        self._store(tree)
+        return tree
+
+    def distance(self, source, target) -> float:
+        return self.tree(source).distance(self.graph.id_of(target))
+
+    def path(self, source, target) -> List:
+        label_of = self.graph.label_of
+        return [label_of(v) for v in self.tree(source).path(self.graph.id_of(target))]
+
+    def invalidate(self):
+        self._trees.clear()
+        self.bytes_used = 0
+        self.invalidations += 1
+
+    def __contains__(self, source) -> bool:
+        return source in self._trees and getattr(self.graph, 'version', 0) == self._version
+
+    def __len__(self) -> int:
+        return len(self._trees)
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'invalidations': self.invalidations, 'trees': len(self._trees),
+                'bytes_used': self.bytes_used, 'max_bytes': self.max_bytes}
+
+    def _check_version(self):
+        version = getattr(self.graph, 'version', 0)
+        if version == self._version:
+            return
+        self.invalidate()
+        self._version = version
+        # A sessão não é refeita: ela própria ganha slots para os nós novos do grafo
+
+    def _store(self, tree: ShortestPathTree):
+        size = tree.nbytes
+        if size > self.max_bytes:
+            # Maior do que o orçamento inteiro: responde à consulta mas não fica guardada
+            return
+        while self._trees and self.bytes_used + size > self.max_bytes:
+            _, evicted = self._trees.popitem(last=False)
+            self.bytes_used -= evicted.nbytes
+            self.evictions += 1
+        self._trees[tree.source] = tree
+        self.bytes_used += size
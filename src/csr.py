@@ -0,0 +1,213 @@
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .structures import SimpleGraph, _AdjacencyView
+
+
+class CSRGraph:
+    """
+    Grafo imutável em formato CSR (compressed sparse row).
+
+    Cada nó recebe um id inteiro denso (0..n-1). As arestas de saída do nó `i`
+    ocupam `targets[offsets[i]:offsets[i + 1]]` e `weights[...]` no mesmo
+    intervalo. A interface por rótulo (`get_outgoing_edges`/`get_incoming_edges`)
+    é a mesma do SimpleGraph, por isso o solver e o main.py funcionam sem mudanças.
+    """
+
+    def __init__(self, labels: Sequence, offsets: array, targets: array, weights: array):
+        if len(offsets) != len(labels) + 1:
+            raise ValueError("offsets deve ter exatamente len(labels) + 1 entradas")
+        if len(targets) != len(weights) or offsets[-1] != len(targets):
+            raise ValueError("targets/weights não batem com o último offset")
+
+        index = {label: i for i, label in enumerate(labels)}
+        if len(index) != len(labels):
+            raise ValueError("rótulos de nós duplicados")
+
+        object.__setattr__(self, "_labels", list(labels))
+        object.__setattr__(self, "_index", index)
+        object.__setattr__(self, "_offsets", offsets)
+        object.__setattr__(self, "_targets", targets)
+        object.__setattr__(self, "_weights", weights)
+        # A CSR inversa só é montada quando alguém pede arestas de entrada
+        object.__setattr__(self, "_reverse", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CSRGraph é imutável")
+
+    # --- Construtores ---
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[Any, Any, float]], nodes: Optional[Iterable] = None) -> "CSRGraph":
+        """Monta o grafo a partir de triplas (u, v, w). `nodes` permite incluir nós isolados."""
+        labels: List = []
+        index: Dict[Any, int] = {}
+
+        def intern(label) -> int:
+            node_id = index.get(label)
+            if node_id is None:
+                node_id = index[label] = len(labels)
+                labels.append(label)
+            return node_id
+
+        for node in nodes or ():
+            intern(node)
+
+        sources, targets, weights = array("q"), array("q"), array("d")
+        for u, v, w in edges:
+            sources.append(intern(u))
+            targets.append(intern(v))
+            weights.append(w)
+
+        return cls.from_arrays(labels, sources, targets, weights)
+
+    @classmethod
+    def from_arrays(cls, labels: Sequence, sources: Sequence[int], targets: Sequence[int],
+                    weights: Sequence[float]) -> "CSRGraph":
+        """
+        Construtor em massa: arestas já em colunas de ids (origem, destino, peso), na ordem
+        de `labels`. Evita criar uma tupla por aresta; arrays 'q'/'d' são usados sem cópia.
+        """
+        if not len(sources) == len(targets) == len(weights):
+            raise ValueError("sources/targets/weights com tamanhos diferentes")
+        if not isinstance(sources, array):
+            sources = array("q", sources)
+        if not isinstance(targets, array):
+            targets = array("q", targets)
+        if not isinstance(weights, array):
+            weights = array("d", weights)
+        offsets, targets, weights = _build_csr(len(labels), sources, targets, weights)
+        return cls(labels, offsets, targets, weights)
+
+    @classmethod
+    def from_simple_graph(cls, graph: SimpleGraph, nodes: Optional[Iterable] = None) -> "CSRGraph":
+        """Converte um SimpleGraph preservando a ordem das arestas de cada nó."""
+        all_nodes = list(nodes or ()) + list(graph.edges)
+        edges = ((u, v, w) for u, out in graph.edges.items() for v, w in out)
+        return cls.from_edges(edges, nodes=all_nodes)
+
+    # --- Mapeamento rótulo <-> id ---
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self._labels)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self._targets)
+
+    @property
+    def labels(self) -> Tuple:
+        return tuple(self._labels)
+
+    def id_of(self, label) -> int:
+        return self._index[label]
+
+    def label_of(self, node_id: int):
+        return self._labels[node_id]
+
+    def __contains__(self, label) -> bool:
+        return label in self._index
+
+    # --- Arrays CSR (só de leitura) ---
+
+    @property
+    def offsets(self) -> memoryview:
+        return memoryview(self._offsets).toreadonly()
+
+    @property
+    def targets(self) -> memoryview:
+        return memoryview(self._targets).toreadonly()
+
+    @property
+    def weights(self) -> memoryview:
+        return memoryview(self._weights).toreadonly()
+
+    def out_degree(self, label) -> int:
+        i = self._index[label]
+        return self._offsets[i + 1] - self._offsets[i]
+
+    # --- Interface compatível com SimpleGraph ---
+
+    @property
+    def edges(self) -> _AdjacencyView:
+        return _AdjacencyView(self)
+
+    @property
+    def reverse_edges(self) -> _AdjacencyView:
+        return _AdjacencyView(self, reverse=True)
+
+    def get_outgoing_edges(self, u) -> List[Tuple[Any, float]]:
+        i = self._index.get(u)
+        if i is None:
+            return []
+        start, end = self._offsets[i], self._offsets[i + 1]
+        labels = self._labels
+        return [(labels[v], w) for v, w in zip(self._targets[start:end], self._weights[start:end])]
+
+    def get_incoming_edges(self, v) -> List[Tuple[Any, float]]:
+        i = self._index.get(v)
+        if i is None:
+            return []
+        offsets, sources, weights = self._reverse_csr()
+        start, end = offsets[i], offsets[i + 1]
+        labels = self._labels
+        return [(labels[u], w) for u, w in zip(sources[start:end], weights[start:end])]
+
+    def index_view(self) -> "CSRIndexView":
+        """Mesma interface, mas com os ids inteiros no lugar dos rótulos."""
+        return CSRIndexView(self)
+
+    def _reverse_csr(self) -> Tuple[array, array, array]:
+        if self._reverse is None:
+            sources = array("q", bytes(8 * len(self._targets)))
+            for i in range(len(self._labels)):
+                for pos in range(self._offsets[i], self._offsets[i + 1]):
+                    sources[pos] = i
+            object.__setattr__(self, "_reverse", _build_csr(len(self._labels), self._targets, sources, self._weights))
+        return self._reverse
+
+
+class CSRIndexView:
+    """
+    Vista de um CSRGraph onde os vértices são os ids inteiros (0..n-1).
+    Usada pelo solver quando as distâncias vivem num array indexado por id.
+    """
+
+    def __init__(self, graph: CSRGraph):
+        self.graph = graph
+        self._offsets = graph._offsets
+        self._targets = graph._targets
+        self._weights = graph._weights
+
+    @property
+    def num_nodes(self) -> int:
+        return self.graph.num_nodes
+
+    def get_outgoing_edges(self, u: int) -> List[Tuple[int, float]]:
+        start, end = self._offsets[u], self._offsets[u + 1]
+        return list(zip(self._targets[start:end], self._weights[start:end]))
+
+    def get_incoming_edges(self, v: int) -> List[Tuple[int, float]]:
+        offsets, sources, weights = self.graph._reverse_csr()
+        start, end = offsets[v], offsets[v + 1]
+        return list(zip(sources[start:end], weights[start:end]))
+
+
+def _build_csr(num_nodes: int, sources: array, targets: array, weights: array) -> Tuple[array, array, array]:
+    """Counting sort estável das arestas pela origem -> (offsets, targets, weights)."""
+    offsets = array("q", bytes(8 * (num_nodes + 1)))
+    for u in sources:
+        offsets[u + 1] += 1
+    for i in range(num_nodes):
+        offsets[i + 1] += offsets[i]
+
+    cursor = array("q", offsets[:-1])
+    sorted_targets = array("q", bytes(8 * len(targets)))
+    sorted_weights = array("d", bytes(8 * len(weights)))
+    for u, v, w in zip(sources, targets, weights):
+        pos = cursor[u]
+        sorted_targets[pos] = v
+        sorted_weights[pos] = w
+        cursor[u] = pos + 1
+    return offsets, sorted_targets, sorted_weights
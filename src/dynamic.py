@@ -0,0 +1,118 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .solver import BoundedMultiSourceShortestPath, SolveResult
+from .structures import EdgeChange, IndexedHeap, SimpleGraph
+
+
+@dataclass
+class RepairResult:
+    """Resultado de uma reparação incremental depois de um lote de alterações."""
+    changes: List[EdgeChange] = field(default_factory=list)
+    invalidated: int = 0   # vértices da subárvore que perdeu a aresta da árvore
+    settled: int = 0       # vértices re-completados pela pesquisa de reparação
+
+
+class DynamicShortestPaths:
+    """
+    Distâncias e árvore de caminhos mínimos a partir de 'sources', mantidas enquanto os
+    pesos do grafo mudam (trânsito, cortes de estrada). O cálculo inicial é o BMSSP;
+    depois, cada lote de alterações só repara a região afetada:
+
+    * aumentos/remoções de uma aresta da árvore invalidam a subárvore pendurada nela,
+      que volta a receber distâncias a partir da sua fronteira (arestas de entrada);
+    * diminuições/inserções semeiam a cabeça da aresta quando a melhoram.
+
+    A propagação usa o Dijkstra com decrease-key do caso base e só relaxa com melhoria
+    estrita, por isso vértices cuja distância não muda não voltam a ser visitados.
+    """
+
+    def __init__(self, graph: SimpleGraph, sources: Iterable, constants: Optional[Dict] = None,
+                 nodes: Optional[Sequence] = None):
+        if not graph.track_reverse:
+            raise ValueError("a reparação incremental precisa do índice inverso (track_reverse=True)")
+        self.graph = graph
+        self.sources = set(sources)
+        self.dist: Dict = {node: float('inf') for node in (nodes if nodes is not None else graph.labels)}
+        self.solver = BoundedMultiSourceShortestPath(graph, self.dist, constants or {}, track_predecessors=True)
+        self.pred: Dict = self.solver.pred
+
+    def solve(self) -> SolveResult:
+        """Cálculo completo (BMSSP) a partir das fontes."""
+        for node in self.dist:
+            self.dist[node] = float('inf')
+        self.pred.clear()
+        for source in self.sources:
+            self.dist[source] = 0.0
+        return self.solver.solve(set(self.sources))
+
+    def apply(self, updates: Iterable[Tuple]) -> RepairResult:
+        """Aplica (u, v, peso | None) ao grafo e repara as distâncias."""
+        return self.repair(self.graph.apply_updates(updates))
+
+    def repair(self, changes: List[EdgeChange]) -> RepairResult:
+        dist, pred = self.dist, self.pred
+        net = _net_changes(changes)
+        for change in net:
+            dist.setdefault(change.u, float('inf'))
+            dist.setdefault(change.v, float('inf'))
+
+        # 1. Aresta da árvore piorou ou desapareceu: a subárvore deixa de ter distância válida
+        roots = [c.v for c in net if c.old is not None and (c.new is None or c.new > c.old) and pred.get(c.v) == c.u]
+        invalid = self._subtree(roots)
+        for x in invalid:
+            dist[x] = float('inf')
+            pred.pop(x, None)
+
+        # 2. Fronteira: cada vértice invalidado recebe a melhor aresta vinda de fora
+        heap = IndexedHeap()
+        for x in invalid:
+            for y, weight in self.graph.get_incoming_edges(x):
+                self._improve(heap, y, x, dist[y] + weight)
+
+        # 3. Arestas que melhoraram: semeia a cabeça se a distância baixar
+        for c in net:
+            if c.new is not None and (c.old is None or c.new < c.old):
+                self._improve(heap, c.u, c.v, dist[c.u] + c.new)
+
+        # 4. Propagação limitada à região que realmente muda
+        settled = 0
+        while heap:
+            d, u = heap.pop()
+            settled += 1
+            for v, weight in self.graph.get_outgoing_edges(u):
+                self._improve(heap, u, v, d + weight)
+        return RepairResult(changes, len(invalid), settled)
+
+    def _improve(self, heap: IndexedHeap, u, v, new_dist: float):
+        if new_dist < self.dist.get(v, float('inf')):
+            self.dist[v] = new_dist
+            self.pred[v] = u
+            heap.push(v, new_dist)
+
+    def _subtree(self, roots: List) -> Set:
+        """Descendentes (inclusive) na árvore de predecessores: filhos = vizinhos cujo pai é o nó."""
+        invalid = set(roots) - self.sources
+        stack = list(invalid)
+        while stack:
+            x = stack.pop()
+            for y, _ in self.graph.get_outgoing_edges(x):
+                if y not in invalid and self.pred.get(y) == x:
+                    invalid.add(y)
+                    stack.append(y)
+        return invalid
+
+    def distance(self, v) -> float:
+        return self.dist.get(v, float('inf'))
+
+    def path_to(self, target) -> List:
+        return self.solver.path_to(target)
+
+
+def _net_changes(changes: List[EdgeChange]) -> List[EdgeChange]:
+    """Junta as alterações da mesma aresta do lote: peso antes do lote -> peso depois."""
+    net: Dict[Tuple, EdgeChange] = {}
+    for c in changes:
+        first = net.get((c.u, c.v))
+        net[(c.u, c.v)] = c if first is None else EdgeChange(c.u, c.v, first.old, c.new)
+    return [c for c in net.values() if c.old != c.new]
@@ -0,0 +1,218 @@
+import json
+import math
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .structures import IndexedHeap
+
+FORMATS = ('html', 'geojson', 'jsonl')
+
+
+@dataclass
+class Subgraph:
+    """Rota e a vizinhança à volta dela: o único pedaço do grafo que chega ao ficheiro exportado."""
+    nodes: List
+    edges: List[Tuple[Any, Any, float]]
+    path: List
+    dist: Dict = field(default_factory=dict)
+
+    @property
+    def path_edges(self) -> set:
+        return set(zip(self.path, self.path[1:]))
+
+
+def extract_subgraph(graph, dist: Mapping, path: Sequence, hops: int = 1, radius: Optional[float] = None,
+                     max_nodes: int = 2000, undirected: bool = False) -> Subgraph:
+    """
+    Rota + vizinhança: os nós a até `hops` arestas de saída da rota (também de entrada com
+    `undirected`, se o grafo tiver índice inverso) e, com `radius`, os alcançáveis a partir
+    da rota com custo <= radius. `max_nodes` trava a expansão à volta de hubs; os nós da
+    rota entram sempre. O custo depende do tamanho da vizinhança, nunca do grafo inteiro
+    (exceto `undirected` num CSRGraph, que monta a CSR inversa inteira na primeira vez).
+    """
+    selected = dict.fromkeys(path)
+    _expand_hops(graph, selected, hops, max_nodes, undirected)
+    if radius is not None:
+        _expand_radius(graph, selected, radius, max_nodes)
+
+    edges = [(u, v, w) for u in selected for v, w in graph.get_outgoing_edges(u) if v in selected]
+    nodes = list(selected)
+    return Subgraph(nodes, edges, list(path), {node: dist.get(node, math.inf) for node in nodes})
+
+
+def _neighbours(graph, u, undirected: bool) -> Iterator:
+    for v, _ in graph.get_outgoing_edges(u):
+        yield v
+    if undirected and getattr(graph, 'track_reverse', True):
+        for v, _ in graph.get_incoming_edges(u):
+            yield v
+
+
+def _expand_hops(graph, selected: Dict, hops: int, max_nodes: int, undirected: bool):
+    queue = deque((node, 0) for node in selected)
+    while queue and len(selected) < max_nodes:
+        u, depth = queue.popleft()
+        if depth == hops:
+            continue
+        for v in _neighbours(graph, u, undirected):
+            if v not in selected:
+                selected[v] = None
+                queue.append((v, depth + 1))
+                if len(selected) >= max_nodes:
+                    return
+
+
+def _expand_radius(graph, selected: Dict, radius: float, max_nodes: int):
+    """Dijkstra local a partir da rota (todos os nós a custo 0), parado em `radius`."""
+    heap = IndexedHeap()
+    best: Dict = {}
+    for node in list(selected):
+        best[node] = 0.0
+        heap.push(node, 0.0)
+    while heap and len(selected) < max_nodes:
+        d, u = heap.pop()
+        selected.setdefault(u, None)
+        for v, w in graph.get_outgoing_edges(u):
+            if d + w <= radius and d + w < best.get(v, math.inf):
+                best[v] = d + w
+                heap.push(v, d + w)
+
+
+def compute_layout(subgraph: Subgraph, spacing: float = 150.0) -> Dict[Any, Tuple[float, float]]:
+    """
+    Posições fixas em O(nós + arestas), para desenhar sem motor de física: a rota numa
+    linha horizontal e cada outro nó por baixo/por cima do nó da rota de onde foi alcançado,
+    afastado pela distância em saltos.
+    """
+    positions: Dict[Any, Tuple[float, float]] = {}
+    anchor: Dict[Any, Tuple[float, int]] = {}
+    queue = deque()
+    for i, node in enumerate(subgraph.path):
+        if node not in anchor:
+            anchor[node] = (i * spacing, 0)
+            queue.append(node)
+    if not queue and subgraph.nodes:
+        first = subgraph.nodes[0]
+        anchor[first] = (0.0, 0)
+        queue.append(first)
+
+    adjacency: Dict[Any, List] = {}
+    for u, v, _ in subgraph.edges:
+        adjacency.setdefault(u, []).append(v)
+        adjacency.setdefault(v, []).append(u)
+
+    while queue:
+        u = queue.popleft()
+        x, depth = anchor[u]
+        for v in adjacency.get(u, ()):
+            if v not in anchor:
+                anchor[v] = (x, depth + 1)
+                queue.append(v)
+
+    # Quantos nós já ocupam cada (coluna, profundidade): espalha-os na vertical
+    slots: Dict[Tuple[float, int], int] = {}
+    for node in subgraph.nodes:
+        x, depth = anchor.get(node, (0.0, 1))
+        if depth == 0:
+            positions[node] = (x, 0.0)
+            continue
+        slot = slots.get((x, depth), 0)
+        slots[(x, depth)] = slot + 1
+        sign = 1 if slot % 2 == 0 else -1
+        positions[node] = (x + (slot // 2) * spacing / 3, sign * depth * spacing)
+    return positions
+
+
+def _finite(value: float) -> Optional[float]:
+    return value if math.isfinite(value) else None
+
+
+def write_geojson(subgraph: Subgraph, filepath: str, layout: Optional[Dict] = None):
+    """FeatureCollection com os nós (Point) e as arestas (LineString), escrita feature a feature."""
+    layout = layout or compute_layout(subgraph)
+    path_edges = subgraph.path_edges
+    on_route = set(subgraph.path)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write('{"type": "FeatureCollection", "features": [\n')
+        first = True
+        for feature in _features(subgraph, layout, on_route, path_edges):
+            f.write(('' if first else ',\n') + json.dumps(feature, ensure_ascii=False))
+            first = False
+        f.write('\n]}\n')
+
+
+def _features(subgraph: Subgraph, layout: Dict, on_route: set, path_edges: set) -> Iterator[Dict]:
+    for node in subgraph.nodes:
+        yield {'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': list(layout[node])},
+               'properties': {'id': node, 'dist': _finite(subgraph.dist[node]), 'route': node in on_route}}
+    for u, v, w in subgraph.edges:
+        yield {'type': 'Feature', 'geometry': {'type': 'LineString', 'coordinates': [list(layout[u]), list(layout[v])]},
+               'properties': {'u': u, 'v': v, 'w': w, 'route': (u, v) in path_edges}}
+
+
+def write_jsonl(subgraph: Subgraph, filepath: str):
+    """Um objeto JSON por linha ({"type": "node"|"edge", ...}): legível em streaming, linha a linha."""
+    path_edges = subgraph.path_edges
+    on_route = set(subgraph.path)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        for node in subgraph.nodes:
+            record = {'type': 'node', 'id': node, 'dist': _finite(subgraph.dist[node]), 'route': node in on_route}
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        for u, v, w in subgraph.edges:
+            record = {'type': 'edge', 'u': u, 'v': v, 'w': w, 'route': (u, v) in path_edges}
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def write_html(subgraph: Subgraph, filepath: str, start_node=None, target_node=None, title: Optional[str] = None,
+               layout: Optional[Dict] = None):
+    """HTML PyVis com posições pré-calculadas e física desligada: o browser não simula nada."""
+    from pyvis.network import Network
+
+    layout = layout or compute_layout(subgraph)
+    path_edges = subgraph.path_edges
+    net = Network(height="700px", width="100%", bgcolor="#0d0d0d", font_color="white", directed=True)
+    # O PyVis só aceita ids str/int: os nós entram pela posição e o rótulo fica no texto
+    node_ids = {node: i for i, node in enumerate(subgraph.nodes)}
+    for node, i in node_ids.items():
+        color = "#00FF00" if node == start_node else ("#FF0000" if node == target_node else "#444444")
+        x, y = layout[node]
+        net.add_node(i, label=f"{node}\n({subgraph.dist[node]:.1f})", color=color, size=25,
+                     x=x, y=y, physics=False)
+    for u, v, w in subgraph.edges:
+        is_gps = (u, v) in path_edges
+        net.add_edge(node_ids[u], node_ids[v], label=str(w), color="#FFFF00" if is_gps else "#333333",
+                     width=5 if is_gps else 1, arrows="to")
+    net.toggle_physics(False)
+
+    html_content = net.generate_html()
+    if title:
+        header = f'<div style="background:#1a1a1a; color:white; padding:15px; text-align:center;"><h2 style="margin:0;">{title}</h2></div>'
+        html_content = html_content.replace("<body>", f"<body>{header}")
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(html_content)
+
+
+def export_route(graph, dist: Mapping, path: Sequence, filepath: str, fmt: Optional[str] = None,
+                 hops: int = 1, radius: Optional[float] = None, max_nodes: int = 2000, undirected: bool = False,
+                 **html_options) -> Subgraph:
+    """
+    Extrai a rota e a vizinhança e grava-as em `filepath` (formato pela extensão ou por
+    `fmt`: html, geojson, jsonl). Não abre browser: funciona em testes e servidores.
+    """
+    fmt = fmt or os.path.splitext(filepath)[1].lstrip('.').lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"formato de exportação desconhecido: {fmt!r} (use {', '.join(FORMATS)})")
+
+    subgraph = extract_subgraph(graph, dist, path, hops, radius, max_nodes, undirected)
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if fmt == 'html':
+        write_html(subgraph, filepath, **html_options)
+    elif fmt == 'geojson':
+        write_geojson(subgraph, filepath)
+    else:
+        write_jsonl(subgraph, filepath)
+    return subgraph
@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class LevelStats:
+    """Contadores de um nível da recursão (tempo inclusivo: conta também os níveis abaixo)."""
+    calls: int = 0
+    time_s: float = 0.0
+    sources: int = 0          # soma de |S| recebido pelas chamadas deste nível
+    settled: int = 0          # soma de |U| devolvido
+    pulls: int = 0            # lotes puxados da BatchQueue (níveis >= 1)
+    batch_sources: int = 0    # soma de |batch_sources| dos lotes
+    max_batch: int = 0
+    rec_vertices: int = 0     # soma de |rec_vertices| devolvidos pela recursão
+
+
+@dataclass
+class SolverStats:
+    """Contadores recolhidos por um solver criado com instrument=True."""
+    levels: Dict[int, LevelStats] = field(default_factory=dict)
+    relax_attempts: int = 0   # arestas examinadas nos relaxamentos após cada lote
+    relax_successes: int = 0  # relaxamentos com d[u] + w <= d[v] (só no modo escalar)
+    heap_pops: int = 0        # extrações do heap no caso base
+    max_heap_size: int = 0    # maior heap do caso base (limitado por |V|: sem entradas obsoletas)
+    pivot_calls: int = 0
+    pivots: int = 0
+    reached_w: int = 0
+
+    def level(self, level: int) -> LevelStats:
+        stats = self.levels.get(level)
+        if stats is None:
+            stats = self.levels[level] = LevelStats()
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['levels'] = {str(level): data['levels'][level] for level in sorted(self.levels, reverse=True)}
+        return data
+
+
+class Tracer:
+    """Regista intervalos (início, duração) e exporta-os no formato Chrome trace (chrome://tracing, Perfetto)."""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+
+    def complete(self, name: str, start: float, end: float, **args):
+        self.events.append({
+            'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+            'ts': (start - self._origin) * 1e6, 'dur': (end - start) * 1e6, 'args': args,
+        })
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        return {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def attach(solver, tracer: Optional[Tracer] = None) -> SolverStats:
+    """
+    Instala versões instrumentadas dos métodos do solver como atributos da instância.
+    Um solver sem instrumentação não tem verificações extra: o custo só existe quando ligado.
+    """
+    stats = SolverStats()
+    # Frames abertos (nível, início, |S|): a execução dos níveis usa uma pilha explícita
+    levels: List[Tuple[int, float, int]] = []
+    open_frame = solver._open_frame
+    close_frame = solver._close_frame
+    base_case = solver._handle_base_case
+    process_edges = solver._process_edges_and_update_queue
+    relax_edge = solver._relax_edge
+    relax_vectorized = solver._relax_frontier_vectorized
+    settle_next = solver._settle_next
+    find_pivots = solver._find_pivots
+    dist = solver.dist
+
+    def finish_call(level, start, num_sources, reached_bound, settled):
+        end = time.perf_counter()
+        level_stats = stats.level(level)
+        level_stats.calls += 1
+        level_stats.sources += num_sources
+        level_stats.time_s += end - start
+        level_stats.settled += len(settled)
+        if tracer is not None:
+            tracer.complete(f"bmssp L{level}", start, end, level=level, sources=num_sources,
+                            settled=len(settled), bound=str(reached_bound))
+
+    def traced_open_frame(level, bound, sources):
+        levels.append((level, time.perf_counter(), len(sources)))
+        return open_frame(level, bound, sources)
+
+    def traced_close_frame(frame):
+        level, start, num_sources = levels.pop()
+        reached_bound, settled = close_frame(frame)
+        finish_call(level, start, num_sources, reached_bound, settled)
+        return reached_bound, settled
+
+    def traced_base_case(bound, sources):
+        start = time.perf_counter()
+        reached_bound, settled = base_case(bound, sources)
+        finish_call(0, start, len(sources), reached_bound, settled)
+        return reached_bound, settled
+
+    def traced_process_edges(new_vertices_u, batch_sources, *args):
+        level_stats = stats.level(levels[-1][0])
+        level_stats.pulls += 1
+        level_stats.batch_sources += len(batch_sources)
+        level_stats.max_batch = max(level_stats.max_batch, len(batch_sources))
+        level_stats.rec_vertices += len(new_vertices_u)
+        return process_edges(new_vertices_u, batch_sources, *args)
+
+    def counted_relax_edge(u, v, weight, *args):
+        stats.relax_attempts += 1
+        if dist[u] + weight <= dist[v]:
+            stats.relax_successes += 1
+        return relax_edge(u, v, weight, *args)
+
+    def counted_relax_vectorized(new_vertices_u, *args):
+        offsets = solver._relaxer.offsets
+        stats.relax_attempts += sum(int(offsets[u + 1] - offsets[u]) for u in new_vertices_u)
+        return relax_vectorized(new_vertices_u, *args)
+
+    def counted_settle_next(heap, bound, visited_u):
+        stats.heap_pops += 1
+        stats.max_heap_size = max(stats.max_heap_size, len(heap))
+        return settle_next(heap, bound, visited_u)
+
+    def counted_find_pivots(bound, sources):
+        start = time.perf_counter()
+        pivots, reached_w = find_pivots(bound, sources)
+        stats.pivot_calls += 1
+        stats.pivots += len(pivots)
+        stats.reached_w += len(reached_w)
+        if tracer is not None:
+            tracer.complete("find_pivots", start, time.perf_counter(), sources=len(sources),
+                            pivots=len(pivots), reached_w=len(reached_w))
+        return pivots, reached_w
+
+    solver._open_frame = traced_open_frame
+    solver._close_frame = traced_close_frame
+    solver._handle_base_case = traced_base_case
+    solver._process_edges_and_update_queue = traced_process_edges
+    solver._relax_edge = counted_relax_edge
+    solver._relax_frontier_vectorized = counted_relax_vectorized
+    solver._settle_next = counted_settle_next
+    solver._find_pivots = counted_find_pivots
+    return stats
@@ -0,0 +1,259 @@
+import random
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .solver import BoundedMultiSourceShortestPath, QueryResult
+
+# Cabeçalho: magic, versão, n, m, número de landmarks, CRC32 das arestas (graph_checksum)
+_MAGIC = b"BMSSPL\x00\x01"
+_HEADER = struct.Struct("<8sIQQQI")
+_VERSION = 2
+
+INF = float('inf')
+
+
+class _ReversedView:
+    """Vista com as arestas invertidas: o BMSSP sobre ela dá as distâncias *até* a fonte."""
+
+    def __init__(self, view):
+        self._view = view
+
+    def get_outgoing_edges(self, u: int) -> List[Tuple[int, float]]:
+        return self._view.get_incoming_edges(u)
+
+
+class _PotentialView:
+    """
+    Pesos reduzidos w(u, v) - π(u) + π(v), com π(v) = limite inferior ALT de d(v, alvo).
+    Com π viável os pesos ficam >= 0, o BMSSP continua correto e, por ordenar por d + π,
+    passa a ser uma pesquisa A*. Vértices com π = inf não alcançam o alvo e são cortados.
+    """
+
+    def __init__(self, view, index: "LandmarkIndex", target: int):
+        self._view = view
+        self._index = index
+        self._target = target
+        self._potential: Dict[int, float] = {}
+
+    def potential(self, v: int) -> float:
+        p = self._potential.get(v)
+        if p is None:
+            p = self._potential[v] = self._index.lower_bound(v, self._target)
+        return p
+
+    def get_outgoing_edges(self, u: int) -> List[Tuple[int, float]]:
+        pu = self.potential(u)
+        out = []
+        for v, w in self._view.get_outgoing_edges(u):
+            pv = self.potential(v)
+            if pv != INF:
+                # max(0, ...): só absorve o arredondamento de pesos não inteiros
+                out.append((v, max(0.0, w - pu + pv)))
+        return out
+
+
+class LandmarkIndex:
+    """
+    Índice ALT: para cada landmark L, d(L, v) (forward) e d(v, L) (backward) para todos os
+    ids v. Pela desigualdade triangular, d(v, t) >= max(d(L, t) - d(L, v), d(v, L) - d(t, L)),
+    um limite inferior usado para orientar as consultas ponto-a-ponto para o alvo.
+    """
+
+    def __init__(self, graph, landmarks: Sequence[int], forward: List[array], backward: List[array]):
+        self.graph = graph
+        self.landmarks = list(landmarks)
+        self.forward = forward
+        self.backward = backward
+
+    # --- Pré-cálculo ---
+
+    @classmethod
+    def build(cls, graph, count: int = 8, method: str = 'avoid', constants: Optional[Dict] = None,
+              seed: int = 0) -> "LandmarkIndex":
+        """
+        Escolhe `count` landmarks ('farthest': o mais longe dos já escolhidos; 'avoid':
+        a folha da subárvore com pior cobertura, de Goldberg & Werneck) e calcula as
+        distâncias com o próprio BMSSP, nos dois sentidos.
+        """
+        if method not in ('farthest', 'avoid'):
+            raise ValueError(f"método de seleção desconhecido: {method!r}")
+        index = cls(graph, [], [], [])
+        view = graph.index_view()
+        n = graph.num_nodes
+        rng = random.Random(seed)
+        for _ in range(min(count, n)):
+            if method == 'farthest':
+                landmark = index._farthest(view, rng, constants)
+            else:
+                landmark = index._avoid(view, rng, constants)
+            if landmark is None or landmark in index.landmarks:
+                break
+            index.landmarks.append(landmark)
+            index.forward.append(_distances(view, landmark, n, constants)[0])
+            index.backward.append(_distances(_ReversedView(view), landmark, n, constants)[0])
+        return index
+
+    def _farthest(self, view, rng: random.Random, constants) -> Optional[int]:
+        n = self.graph.num_nodes
+        if not self.landmarks:
+            dist, _ = _distances(view, rng.randrange(n), n, constants)
+            return max(range(n), key=lambda v: (dist[v] != INF, dist[v]))
+        # Vértices que nenhum landmark alcança contam como os mais afastados
+        best, best_score = None, -1.0
+        for v in range(n):
+            if v in self.landmarks:
+                continue
+            score = min(forward[v] for forward in self.forward)
+            if score > best_score:
+                best, best_score = v, score
+        return best
+
+    def _avoid(self, view, rng: random.Random, constants) -> Optional[int]:
+        n = self.graph.num_nodes
+        root = rng.randrange(n)
+        dist, pred = _distances(view, root, n, constants)
+        children: Dict[int, List[int]] = {}
+        for v in range(n):
+            if pred[v] != -1:
+                children.setdefault(pred[v], []).append(v)
+
+        # Peso = quanto o melhor limite atual falha d(raiz, v); subárvores com landmark valem 0
+        order = [root]
+        for v in order:
+            order.extend(children.get(v, ()))
+        chosen = set(self.landmarks)
+        size = {v: dist[v] - self.lower_bound(root, v) for v in order}
+        covered = set()
+        for v in reversed(order):
+            if v in chosen or v in covered:
+                covered.add(v)
+                size[v] = 0.0
+                if pred[v] != -1:
+                    covered.add(pred[v])
+            elif pred[v] != -1:
+                size[pred[v]] += size[v]
+
+        # Desce pela subárvore mais pesada até uma folha
+        v = root
+        while True:
+            candidates = [c for c in children.get(v, ()) if size[c] > 0]
+            if not candidates:
+                break
+            v = max(candidates, key=size.__getitem__)
+        if v in chosen:
+            return self._farthest(view, rng, constants)
+        return v
+
+    # --- Limites inferiores ---
+
+    def lower_bound(self, v: int, t: int) -> float:
+        """Maior limite inferior de d(v, t) dado pelos landmarks (inf = t inalcançável de v)."""
+        best = 0.0
+        for forward, backward in zip(self.forward, self.backward):
+            # d(L, t) <= d(L, v) + d(v, t)
+            if forward[v] != INF:
+                best = max(best, forward[t] - forward[v])
+            # d(v, L) <= d(v, t) + d(t, L)
+            if backward[t] != INF:
+                best = max(best, backward[v] - backward[t])
+        return best
+
+    # --- Consulta orientada ao alvo ---
+
+    def query(self, source, target, constants: Optional[Dict] = None) -> QueryResult:
+        """
+        Consulta ponto-a-ponto (por rótulo) com o BMSSP sobre pesos reduzidos pelos
+        landmarks: o heap do caso base e os lotes ficam ordenados por d + π, e o limite
+        do modo query corta tudo o que não pode melhorar a rota.
+        """
+        graph = self.graph
+        s, t = graph.id_of(source), graph.id_of(target)
+        view = graph.index_view()
+        reduced = _PotentialView(view, self, t)
+        n = graph.num_nodes
+        dist = array('d', [INF]) * n
+        solver = BoundedMultiSourceShortestPath(reduced, dist, constants or {}, track_predecessors=True)
+        if reduced.potential(s) == INF:
+            return QueryResult(INF, None, 0, n)
+
+        result = solver.query(s, t)
+        if result.distance == INF:
+            return QueryResult(INF, None, result.settled, n)
+        # A distância real é a soma dos pesos originais ao longo da rota
+        path = result.path
+        distance = sum(min(w for x, w in view.get_outgoing_edges(u) if x == v) for u, v in zip(path, path[1:]))
+        return QueryResult(distance, [graph.label_of(v) for v in path], result.settled, n)
+
+    # --- Persistência ---
+
+    def save(self, path: str):
+        """Grava landmarks e as 2 x L tabelas de distâncias (float64) num ficheiro binário."""
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.graph.num_nodes, self.graph.num_edges, len(self.landmarks),
+                                 graph_checksum(self.graph)))
+            f.write(_native(array('q', self.landmarks)))
+            for table in self.forward + self.backward:
+                f.write(_native(table))
+
+    @classmethod
+    def load(cls, path: str, graph) -> "LandmarkIndex":
+        """
+        Lê um índice gravado com save(). O grafo tem de ter os mesmos n, m e arestas (CRC32):
+        com outros pesos os limites inferiores deixariam de ser válidos e o A* erraria rotas.
+        """
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"{path}: não é um índice de landmarks suportado")
+            magic, version, n, m, count, checksum = _HEADER.unpack(header)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{path}: não é um índice de landmarks suportado")
+            if (n, m) != (graph.num_nodes, graph.num_edges):
+                raise ValueError(f"{path}: índice feito para outro grafo (n={n}, m={m})")
+            if checksum != graph_checksum(graph):
+                raise ValueError(f"{path}: índice feito para outro grafo (arestas ou pesos diferentes)")
+            landmarks = _read(f, 'q', count)
+            tables = [_read(f, 'd', n) for _ in range(2 * count)]
+        return cls(graph, list(landmarks), tables[:count], tables[count:])
+
+
+def graph_checksum(graph) -> int:
+    """CRC32 das arestas (origem, destino, peso) por id, com as de cada nó ordenadas: O(m log grau)."""
+    view = graph.index_view()
+    crc = 0
+    for u in range(graph.num_nodes):
+        out = sorted(view.get_outgoing_edges(u))
+        if out:
+            targets, weights = zip(*out)
+            crc = zlib.crc32(_native(array('q', [u, len(out)])), crc)
+            crc = zlib.crc32(_native(array('q', targets)), crc)
+            crc = zlib.crc32(_native(array('d', weights)), crc)
+    return crc
+
+
+def _distances(view, source: int, n: int, constants: Optional[Dict]) -> Tuple[array, array]:
+    """BMSSP completo a partir de 'source' sobre uma vista por ids: (distâncias, pais)."""
+    dist = array('d', [INF]) * n
+    dist[source] = 0.0
+    solver = BoundedMultiSourceShortestPath(view, dist, constants or {}, track_predecessors=True)
+    solver.solve({source})
+    return dist, solver.pred
+
+
+def _native(values: array) -> array:
+    """O ficheiro é sempre little-endian."""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _read(f, typecode: str, count: int) -> array:
+    values = array(typecode)
+    values.frombytes(f.read(count * values.itemsize))
+    if len(values) != count:
+        raise ValueError("índice de landmarks truncado")
+    return _native(values)
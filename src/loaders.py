@@ -0,0 +1,187 @@
+import csv
+import json
+from array import array
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+from .csr import CSRGraph
+from .queues import WeightProfile, scale_weights, weight_profile
+from .structures import SimpleGraph
+
+_WHITESPACE = " \t\n\r"
+
+
+class EdgeArrays:
+    """
+    Arestas guardadas em colunas (array('q') para ids, array('d') para pesos) com os
+    rótulos internados em ids densos. Ocupa ~24 bytes por aresta, sem objetos por aresta,
+    e serve de entrada para os construtores em massa dos grafos.
+    """
+
+    def __init__(self):
+        self.labels: List = []
+        self.index: Dict[Any, int] = {}
+        self.sources = array('q')
+        self.targets = array('q')
+        self.weights = array('d')
+
+    def intern(self, label) -> int:
+        node_id = self.index.get(label)
+        if node_id is None:
+            node_id = self.index[label] = len(self.labels)
+            self.labels.append(label)
+        return node_id
+
+    def add(self, u, v, weight: float):
+        self.sources.append(self.intern(u))
+        self.targets.append(self.intern(v))
+        self.weights.append(weight)
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def weight_profile(self) -> WeightProfile:
+        """Pesos inteiros (ou decimais com escala 10^d) permitem as filas Dial/radix."""
+        return weight_profile(self.weights)
+
+    def scaled(self, scale: int) -> "EdgeArrays":
+        """Cópia com os pesos em unidades inteiras de 1/scale (rótulos e ids partilhados)."""
+        copy = EdgeArrays()
+        copy.labels, copy.index = self.labels, self.index
+        copy.sources, copy.targets = self.sources, self.targets
+        copy.weights = array('d', scale_weights(self.weights, scale))
+        return copy
+
+    def to_csr(self) -> CSRGraph:
+        return CSRGraph.from_arrays(self.labels, self.sources, self.targets, self.weights)
+
+    def to_simple_graph(self, track_reverse: bool = True) -> SimpleGraph:
+        return SimpleGraph.from_arrays(self.labels, self.sources, self.targets, self.weights, track_reverse)
+
+
+class _JsonStream:
+    """Leitor incremental: mantém só um bloco do ficheiro em memória e descodifica valores um a um."""
+
+    def __init__(self, handle: IO[str], chunk_size: int):
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Próximo caractere significativo (salta espaços); '' no fim do ficheiro."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"JSON inválido: esperado '{char}' na posição {self._pos}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        # Cada tentativa falhada volta a descodificar desde o início do valor: ler blocos
+        # cada vez maiores mantém o custo linear mesmo num valor enorme (ex: "nodes")
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # Um número colado ao fim do bloco pode estar cortado: lê mais antes de aceitar
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+
+def iter_json_graph(path: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, Any]]:
+    """
+    Percorre o objeto de topo do esquema {"nodes": [...], "edges": [{"u", "v", "w"}], ...}.
+
+    Devolve pares (chave, valor); a lista "edges" é devolvida aresta a aresta, como
+    ("edges", {"u": ..., "v": ..., "w": ...}), sem montar a árvore JSON inteira.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f, chunk_size)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            key = stream.value()
+            stream.expect(':')
+            if key == 'edges' and stream.peek() == '[':
+                stream.expect('[')
+                if stream.peek() != ']':
+                    while True:
+                        yield key, stream.value()
+                        if stream.peek() != ',':
+                            break
+                        stream.expect(',')
+                stream.expect(']')
+            else:
+                yield key, stream.value()
+            if stream.peek() != ',':
+                break
+            stream.expect(',')
+        stream.expect('}')
+
+
+def read_json_graph(path: str) -> Tuple[EdgeArrays, Dict[str, Any]]:
+    """Lê o cenário em streaming: arestas em EdgeArrays e as restantes chaves num dicionário."""
+    edges = EdgeArrays()
+    extra: Dict[str, Any] = {}
+    for key, value in iter_json_graph(path):
+        if key == 'edges':
+            edges.add(value['u'], value['v'], value['w'])
+            continue
+        if key == 'nodes':
+            for node in value:
+                edges.intern(node)
+        extra[key] = value
+    return edges, extra
+
+
+def read_edge_list(path: str, delimiter: Optional[str] = None) -> EdgeArrays:
+    """
+    Caminho rápido para listas de arestas CSV/TSV (u, v, w por linha). O separador é
+    detetado na primeira linha quando não é indicado; um cabeçalho é ignorado se a
+    terceira coluna não for numérica.
+    """
+    edges = EdgeArrays()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        first = f.readline()
+        if delimiter is None:
+            delimiter = '\t' if '\t' in first else (',' if ',' in first else ' ')
+        f.seek(0)
+        rows = csv.reader(f, delimiter=delimiter, skipinitialspace=True)
+        for line_number, row in enumerate(rows):
+            if not row or row[0].startswith('#'):
+                continue
+            try:
+                weight = float(row[2])
+            except (IndexError, ValueError):
+                if line_number == 0:
+                    continue
+                raise ValueError(f"{path}:{line_number + 1}: linha de aresta inválida: {row!r}")
+            edges.add(row[0], row[1], weight)
+    return edges
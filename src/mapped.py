@@ -0,0 +1,159 @@
+import argparse
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Sequence as SequenceABC
+from typing import Any, Dict, Optional
+
+from .csr import CSRGraph
+from .loaders import read_json_graph
+
+# Cabeçalho: magic, versão, flags, n, m, bytes do blob de rótulos
+_MAGIC = b"BMSSPG\x00\x01"
+_HEADER = struct.Struct("<8sIIQQQ")
+_VERSION = 1
+_FLAG_STR_LABELS = 1
+_FLAG_BIG_ENDIAN = 2
+
+
+class _LabelTable(SequenceABC):
+    """Tabela de rótulos str sobre o mapeamento: cada rótulo só é descodificado quando pedido."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], 'utf-8')
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def write_mapped_graph(graph: CSRGraph, path: str):
+    """
+    Grava o grafo no formato binário: cabeçalho, offsets/targets/weights CSR e a
+    tabela de rótulos (int64 se todos forem inteiros, senão offsets + blob UTF-8).
+    Todas as secções ficam alinhadas a 8 bytes para serem lidas sem cópia.
+    """
+    labels = graph.labels
+    if all(type(label) is int for label in labels):
+        flags, label_offsets, blob = 0, array("q", labels), b""
+    elif all(isinstance(label, str) for label in labels):
+        encoded = [label.encode("utf-8") for label in labels]
+        label_offsets = array("q", [0])
+        for raw in encoded:
+            label_offsets.append(label_offsets[-1] + len(raw))
+        flags, blob = _FLAG_STR_LABELS, b"".join(encoded)
+    else:
+        raise TypeError("o formato binário só aceita rótulos todos int ou todos str")
+    if sys.byteorder == "big":
+        flags |= _FLAG_BIG_ENDIAN
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, flags, graph.num_nodes, graph.num_edges, len(blob)))
+        for section in (graph.offsets, graph.targets, graph.weights, memoryview(label_offsets)):
+            f.write(section)
+        f.write(blob)
+        f.write(b"\x00" * _pad(len(blob)))
+
+
+class MappedGraph(CSRGraph):
+    """
+    CSRGraph lido diretamente de um ficheiro mapeado com mmap: abrir não faz parsing,
+    só valida o cabeçalho e cria vistas sobre as secções. Vários processos que abram o
+    mesmo ficheiro partilham as páginas pela page cache. O índice rótulo -> id só é
+    montado na primeira consulta por rótulo; o solver sobre `index_view()` nunca o usa.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, flags, n, m, blob_size = _HEADER.unpack_from(mapping, 0)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{path}: não é um grafo binário BMSSP (versão {_VERSION})")
+            if bool(flags & _FLAG_BIG_ENDIAN) != (sys.byteorder == "big"):
+                raise ValueError(f"{path}: gravado noutra ordem de bytes")
+            expected = _HEADER.size + 8 * (n + 1) + 16 * m + 8 * (n + 1 if flags & _FLAG_STR_LABELS else n)
+            if len(mapping) < expected + blob_size:
+                raise ValueError(f"{path}: ficheiro truncado")
+        except Exception:
+            mapping.close()
+            raise
+
+        view = memoryview(mapping)
+        pos = _HEADER.size
+
+        def section(count: int, typecode: str) -> memoryview:
+            nonlocal pos
+            start, pos = pos, pos + 8 * count
+            return view[start:pos].cast(typecode)
+
+        offsets, targets, weights = section(n + 1, "q"), section(m, "q"), section(m, "d")
+        if flags & _FLAG_STR_LABELS:
+            labels = _LabelTable(section(n + 1, "q"), view[pos:pos + blob_size])
+        else:
+            labels = section(n, "q")
+
+        object.__setattr__(self, "path", path)
+        object.__setattr__(self, "_mmap", mapping)
+        object.__setattr__(self, "_view", view)
+        object.__setattr__(self, "_labels", labels)
+        object.__setattr__(self, "_offsets", offsets)
+        object.__setattr__(self, "_targets", targets)
+        object.__setattr__(self, "_weights", weights)
+        object.__setattr__(self, "_reverse", None)
+        object.__setattr__(self, "_lazy_index", None)
+
+    @property
+    def _index(self) -> Dict[Any, int]:
+        if self._lazy_index is None:
+            object.__setattr__(self, "_lazy_index", {label: i for i, label in enumerate(self._labels)})
+        return self._lazy_index
+
+    def close(self):
+        """Liberta as vistas e o mapeamento; o grafo deixa de poder ser usado."""
+        if self._mmap.closed:
+            return
+        labels = self._labels
+        views = [self._offsets, self._targets, self._weights]
+        views += [labels._offsets, labels._blob] if isinstance(labels, _LabelTable) else [labels]
+        for v in views + [self._view]:
+            v.release()
+        object.__setattr__(self, "_reverse", None)
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedGraph":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert_json(json_path: str, output_path: str) -> MappedGraph:
+    """Converte um cenário JSON ({"nodes", "edges"}) para o formato binário e abre o resultado."""
+    edges, _ = read_json_graph(json_path)
+    write_mapped_graph(edges.to_csr(), output_path)
+    return MappedGraph(output_path)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Converte cenários JSON para o grafo binário mapeável.")
+    parser.add_argument("json_path")
+    parser.add_argument("output_path")
+    args = parser.parse_args(argv)
+    with convert_json(args.json_path, args.output_path) as graph:
+        print(f"{args.output_path}: {graph.num_nodes} nós, {graph.num_edges} arestas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
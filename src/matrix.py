@@ -0,0 +1,123 @@
+import os
+from multiprocessing import get_context, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .csr import CSRGraph
+from .session import SolverSession
+
+# Estado de cada processo do pool: preenchido uma vez pelo initializer
+_worker: Dict = {}
+
+
+class SharedCSR:
+    """
+    Publica os arrays CSR de um grafo (e a matriz de resultado) em shared memory.
+    Os processos do pool ligam-se aos blocos pelo nome: o grafo nunca é serializado
+    por tarefa, e cada linha da matriz é escrita diretamente no bloco partilhado.
+    """
+
+    def __init__(self, graph: CSRGraph, rows: int, cols: int):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.offsets = self._publish(graph.offsets)
+        self.targets = self._publish(graph.targets)
+        self.weights = self._publish(graph.weights)
+        self.result = self._allocate(max(1, rows * cols * 8))
+        self.shape = (rows, cols)
+
+    def _publish(self, view: memoryview) -> str:
+        block = self._allocate(max(1, view.nbytes))
+        block.buf[:view.nbytes] = view.cast('B')
+        return block.name
+
+    def _allocate(self, size: int) -> shared_memory.SharedMemory:
+        block = shared_memory.SharedMemory(create=True, size=size)
+        self._blocks.append(block)
+        return block
+
+    @property
+    def names(self) -> Tuple[str, str, str, str]:
+        return self.offsets, self.targets, self.weights, self.result.name
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def attach_shared_csr(names: Sequence[str], num_nodes: int, num_edges: int) -> Tuple[CSRGraph, List[shared_memory.SharedMemory]]:
+    """
+    Liga-se aos blocos de um SharedCSR pelo nome e devolve o grafo (ids 0..n-1) sobre eles,
+    mais os blocos abertos, que têm de ficar vivos enquanto o grafo for usado.
+    """
+    # Os blocos pertencem ao processo principal, que os apaga no fim (SharedCSR.close)
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    offsets, targets, weights = blocks[:3]
+    graph = CSRGraph(
+        range(num_nodes),
+        offsets.buf[:8 * (num_nodes + 1)].cast('q'),
+        targets.buf[:8 * num_edges].cast('q'),
+        weights.buf[:8 * num_edges].cast('d'),
+    )
+    return graph, blocks
+
+
+def _init_worker(names: Tuple[str, str, str, str], num_nodes: int, num_edges: int,
+                 shape: Tuple[int, int], destinations: Sequence[int], constants: Dict):
+    graph, blocks = attach_shared_csr(names, num_nodes, num_edges)
+    _worker['blocks'] = blocks
+    _bind_state(graph, np.ndarray(shape, dtype=np.float64, buffer=blocks[3].buf), destinations, constants)
+
+
+def _bind_state(graph: CSRGraph, matrix: np.ndarray, destinations: Sequence[int], constants: Dict):
+    _worker['session'] = SolverSession(graph.index_view(), constants, nodes=range(graph.num_nodes), track_predecessors=False)
+    _worker['matrix'] = matrix
+    _worker['destinations'] = list(destinations)
+
+
+def _solve_rows(rows: Sequence[Tuple[int, int]]) -> int:
+    session, matrix, destinations = _worker['session'], _worker['matrix'], _worker['destinations']
+    for row, origin in rows:
+        session.solve({origin})
+        matrix[row] = [session.distance(v) for v in destinations]
+    return len(rows)
+
+
+def distance_matrix(graph, origins: Sequence, destinations: Sequence, constants: Optional[Dict] = None,
+                    processes: Optional[int] = None, chunk_size: Optional[int] = None) -> np.ndarray:
+    """
+    Tabela de distâncias N origens x M destinos como matriz NumPy densa (inf = inalcançável).
+
+    As origens são divididas em blocos por um pool de processos; o grafo vai para shared
+    memory uma única vez. Com processes=1 tudo corre no processo atual.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_simple_graph(graph)
+    origin_ids = [csr.id_of(u) for u in origins]
+    destination_ids = [csr.id_of(v) for v in destinations]
+    constants = constants or {}
+    processes = processes or os.cpu_count() or 1
+    shape = (len(origin_ids), len(destination_ids))
+    rows = list(enumerate(origin_ids))
+
+    if processes == 1 or len(rows) <= 1:
+        matrix = np.empty(shape, dtype=np.float64)
+        _bind_state(csr, matrix, destination_ids, constants)
+        try:
+            _solve_rows(rows)
+        finally:
+            _worker.clear()
+        return matrix
+
+    shared = SharedCSR(csr, *shape)
+    try:
+        init_args = (shared.names, csr.num_nodes, csr.num_edges, shape, destination_ids, constants)
+        # Blocos pequenos o bastante para equilibrar a carga entre os processos
+        size = chunk_size or max(1, len(rows) // (processes * 4))
+        chunks = [rows[i:i + size] for i in range(0, len(rows), size)]
+        with get_context().Pool(processes, initializer=_init_worker, initargs=init_args) as pool:
+            pool.map(_solve_rows, chunks)
+        return np.array(np.ndarray(shape, dtype=np.float64, buffer=shared.result.buf))
+    finally:
+        shared.close()
@@ -0,0 +1,226 @@
+import os
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .csr import CSRGraph
+from .matrix import SharedCSR, attach_shared_csr
+from .structures import IndexedHeap
+
+INF = float('inf')
+
+# Estado de cada processo do pool: preenchido uma vez pelo initializer
+_worker: Dict = {}
+
+
+def bfs_partition(graph: CSRGraph, parts: int) -> array:
+    """
+    Partição por BFS: percorre o grafo sem sentido (arestas de saída e de entrada) a partir
+    do id 0 e corta a ordem de visita em `parts` blocos contíguos de tamanho igual. Vértices
+    próximos caem na mesma parte, o que mantém poucas arestas de fronteira em malhas e redes
+    viárias. Devolve owner[v] (array 'q').
+    """
+    view = graph.index_view()
+    n = graph.num_nodes
+    parts = max(1, min(parts, n))
+    owner = array('q', [-1]) * n
+    position = 0
+    for root in range(n):
+        if owner[root] != -1:
+            continue
+        owner[root] = position * parts // n
+        position += 1
+        frontier = deque([root])
+        while frontier:
+            u = frontier.popleft()
+            for v, _ in view.get_outgoing_edges(u) + view.get_incoming_edges(u):
+                if owner[v] == -1:
+                    owner[v] = position * parts // n
+                    position += 1
+                    frontier.append(v)
+    return owner
+
+
+def _bind_state(state: Dict, graph: CSRGraph, dist, pred, owner) -> Dict:
+    state['view'] = graph.index_view()
+    state['dist'] = dist
+    state['pred'] = pred
+    state['owner'] = owner
+    return state
+
+
+def _init_worker(names: Sequence[str], num_nodes: int, num_edges: int):
+    graph, blocks = attach_shared_csr(names, num_nodes, num_edges)
+    _worker['blocks'] = blocks
+    dist, pred, owner = blocks[3:]
+    _bind_state(_worker, graph, dist.buf[:8 * num_nodes].cast('d'), pred.buf[:8 * num_nodes].cast('q'),
+                owner.buf[:8 * num_nodes].cast('q'))
+
+
+def _round(task: Tuple[int, Sequence[int], float],
+           state: Optional[Dict] = None) -> Tuple[List[int], List[Tuple[int, float, int]], int]:
+    """
+    Uma ronda numa parte: Dijkstra limitado a `bound` a partir das sementes, só com arestas
+    internas. Escreve d/pai dos vértices da parte no array partilhado e devolve
+    (sementes por completar, relaxamentos de fronteira (v, d, pai), vértices completados).
+    `state` é o do próprio solver quando a ronda corre no processo atual; no pool é o do processo.
+    """
+    part, seeds, bound = task
+    state = _worker if state is None else state
+    view, dist, pred, owner = state['view'], state['dist'], state['pred'], state['owner']
+    heap = IndexedHeap()
+    for s in seeds:
+        heap.push(s, dist[s])
+    outbox: Dict[int, Tuple[float, int]] = {}
+    settled = 0
+    while heap:
+        d, u = heap.pop()
+        if d >= bound:
+            # Acima do limite da ronda: fica para a próxima, com a distância já escrita
+            leftovers = [u]
+            while heap:
+                leftovers.append(heap.pop()[1])
+            break
+        settled += 1
+        for v, w in view.get_outgoing_edges(u):
+            new_dist = d + w
+            if owner[v] == part:
+                if new_dist < dist[v]:
+                    dist[v] = new_dist
+                    pred[v] = u
+                    heap.push(v, new_dist)
+            # Leitura sem sincronização de outra parte: no pior caso envia uma mensagem inútil
+            elif new_dist < dist[v] and new_dist < outbox.get(v, (INF,))[0]:
+                outbox[v] = (new_dist, u)
+    else:
+        leftovers = []
+    return leftovers, [(v, d, u) for v, (d, u) in outbox.items()], settled
+
+
+@dataclass
+class ParallelResult:
+    """Distâncias e pais (arrays por id) de uma consulta paralela e o custo das rondas."""
+    dist: array
+    pred: array
+    rounds: int
+    messages: int          # relaxamentos de fronteira que melhoraram uma distância
+    settled: int           # vértices completados, somando todas as partes e rondas
+    wall_s: float
+
+
+class ParallelSolver:
+    """
+    Modo paralelo (opcional) para uma consulta de fonte única muito grande.
+
+    O grafo é partido em `parts` regiões (bfs_partition) e cada ronda corre, em paralelo,
+    um Dijkstra limitado por parte sobre um array de distâncias em shared memory (cada
+    processo só escreve nos vértices da sua parte). Os relaxamentos que atravessam a
+    fronteira voltam ao coordenador, que os aplica e semeia a ronda seguinte; quando nenhuma
+    parte tem sementes, as distâncias são o ponto fixo de d(v) = min(d(u) + w), as mesmas
+    do solver sequencial. O limite da ronda (menor semente + `delta`) evita propagar
+    distâncias provisórias longe demais antes de as fronteiras estarem atualizadas.
+
+    O grafo e os buffers vão para shared memory uma vez e servem todas as consultas.
+    Com processes=1 as rondas correm no processo atual.
+    """
+
+    def __init__(self, graph, processes: Optional[int] = None, parts: Optional[int] = None,
+                 delta: Optional[float] = None):
+        self.graph = graph if isinstance(graph, CSRGraph) else CSRGraph.from_simple_graph(graph)
+        self.processes = processes or os.cpu_count() or 1
+        self.parts = parts or self.processes
+        self.owner = bfs_partition(self.graph, self.parts)
+        if delta is not None and not delta > 0:
+            # Com delta = 0 nenhuma semente fica abaixo do limite da ronda e solve() nunca acaba
+            raise ValueError(f"delta tem de ser positivo: {delta!r}")
+        self.delta = delta if delta is not None else self._default_delta()
+        n = self.graph.num_nodes
+        self._shared: Optional[SharedCSR] = None
+        self._pool = None
+        self._state: Optional[Dict] = None
+        if self.processes == 1:
+            self.dist = array('d', [INF]) * n
+            self.pred = array('q', [-1]) * n
+            # Estado próprio: outro ParallelSolver no mesmo processo não o pode substituir
+            self._state = _bind_state({}, self.graph, self.dist, self.pred, self.owner)
+            return
+
+        self._shared = SharedCSR(self.graph, 0, 0)
+        blocks = [self._shared._allocate(8 * max(1, n)) for _ in range(3)]
+        self.dist, self.pred, owner = (block.buf[:8 * n].cast(code) for block, code in zip(blocks, 'dqq'))
+        owner[:] = self.owner
+        owner.release()
+        names = self._shared.names[:3] + tuple(block.name for block in blocks)
+        self._pool = get_context().Pool(self.processes, initializer=_init_worker,
+                                        initargs=(names, n, self.graph.num_edges))
+
+    def _default_delta(self) -> float:
+        """
+        Largura da ronda: o custo médio de atravessar uma parte (peso médio x lado de uma
+        região de n/parts vértices numa malha). Grande o bastante para que cada ronda faça
+        trabalho útil, pequeno o bastante para não completar vértices com distâncias erradas.
+        Com média 0 (muitos pesos nulos) usa o menor peso positivo; sem nenhum, inf.
+        """
+        weights = self.graph.weights
+        if not len(weights):
+            return INF
+        mean = sum(weights) / len(weights)
+        if mean <= 0:
+            mean = min((w for w in weights if w > 0), default=INF)
+        return mean * max(1.0, (self.graph.num_nodes / self.parts) ** 0.5)
+
+    def solve(self, source) -> ParallelResult:
+        start = time.perf_counter()
+        graph, dist, pred, owner = self.graph, self.dist, self.pred, self.owner
+        n = graph.num_nodes
+        dist[:] = array('d', [INF]) * n
+        pred[:] = array('q', [-1]) * n
+        s = graph.id_of(source)
+        dist[s] = 0.0
+        seeds: Dict[int, List[int]] = {owner[s]: [s]}
+        rounds = messages = settled = 0
+
+        while seeds:
+            bound = min(dist[v] for part_seeds in seeds.values() for v in part_seeds) + self.delta
+            tasks = [(part, part_seeds, bound) for part, part_seeds in seeds.items()]
+            if self._pool is not None:
+                results = self._pool.map(_round, tasks, chunksize=1)
+            else:
+                results = [_round(task, self._state) for task in tasks]
+            seeds = {}
+            for (part, _, _), (leftovers, outbox, count) in zip(tasks, results):
+                settled += count
+                if leftovers:
+                    seeds.setdefault(part, []).extend(leftovers)
+                for v, d, u in outbox:
+                    if d < dist[v]:
+                        dist[v] = d
+                        pred[v] = u
+                        seeds.setdefault(owner[v], []).append(v)
+                        messages += 1
+            rounds += 1
+
+        return ParallelResult(array('d', dist), array('q', pred), rounds, messages, settled,
+                              time.perf_counter() - start)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._shared is not None:
+            # As vistas sobre os blocos têm de ser libertadas antes de os fechar
+            self.dist.release()
+            self.pred.release()
+            self._shared.close()
+            self._shared = None
+        self._state = None
+
+    def __enter__(self) -> "ParallelSolver":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,156 @@
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .queues import QUEUES, weight_profile
+from .session import SolverSession
+
+PARAMETERS = ('level', 'k', 't', 'bound', 'queue')
+
+
+@dataclass
+class Plan:
+    """Parâmetros escolhidos para um grafo e de onde vieram ('paper', 'override' ou 'autotune')."""
+    level: int
+    k: int
+    t: int
+    bound: float
+    num_nodes: int
+    num_edges: int
+    max_weight: float = 0.0
+    queue: str = 'binary'      # fila do caso base (ver queues.py)
+    weight_scale: int = 1      # escala que tornaria os pesos inteiros (1 = já são)
+    origin: str = 'paper'
+    timings: Dict[Tuple[int, int, int], float] = field(default_factory=dict)  # (k, t, level) -> segundos
+
+    @property
+    def constants(self) -> Dict:
+        """Dicionário no formato esperado pelo solver e pela SolverSession."""
+        constants = {'k': self.k, 't': self.t}
+        if self.queue != 'binary':
+            constants.update(queue=self.queue, max_weight=self.max_weight)
+        return constants
+
+
+def paper_parameters(num_nodes: int) -> Tuple[int, int, int]:
+    """(level, k, t) do artigo: k = ⌊log^(1/3) n⌋, t = ⌊log^(2/3) n⌋, level = ⌈log n / t⌉."""
+    log_n = math.log2(max(num_nodes, 2))
+    # A folga evita que 27 ** (1 / 3) = 2.9999... caia para 2
+    k = max(1, math.floor(log_n ** (1 / 3) + 1e-9))
+    t = max(1, math.floor(log_n ** (2 / 3) + 1e-9))
+    return max(1, math.ceil(log_n / t)), k, t
+
+
+def weight_bound(graph) -> Tuple[float, float]:
+    """
+    (limite inicial, maior peso). Um caminho mínimo simples usa no máximo uma aresta de
+    saída por vértice, logo a soma do maior peso de saída de cada vértice majora todas as
+    distâncias; o limite fica logo acima dela (o BMSSP só completa d[v] < B).
+    """
+    total = max_weight = 0.0
+    count = 0
+    for u, out in graph.edges.items():
+        node_max = 0.0
+        for _, w in out:
+            if w < 0:
+                raise ValueError(f"peso negativo na aresta que sai de {u!r}: o BMSSP requer pesos >= 0")
+            node_max = max(node_max, w)
+            count += 1
+        total += node_max
+        max_weight = max(max_weight, node_max)
+    # Folga para os erros de arredondamento ao somar até n - 1 parcelas
+    total *= 1 + count * sys.float_info.epsilon
+    return math.nextafter(total, math.inf), max_weight
+
+
+def plan_parameters(graph, overrides: Optional[Dict] = None, num_nodes: Optional[int] = None) -> Plan:
+    """
+    Deriva level, k, t e o limite inicial a partir de |V|, |E| e dos pesos do grafo.
+    `overrides` substitui qualquer um deles (ex: {'k': 64}); `num_nodes` conta nós isolados.
+    """
+    overrides = dict(overrides or {})
+    unknown = set(overrides) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"parâmetros desconhecidos: {sorted(unknown)}")
+
+    n = num_nodes if num_nodes is not None else graph.num_nodes
+    level, k, t = paper_parameters(n)
+    if 't' in overrides and 'level' not in overrides:
+        # Com outro t, o número de níveis volta a cobrir log n
+        level = max(1, math.ceil(math.log2(max(n, 2)) / max(1, int(overrides['t']))))
+    bound, max_weight = weight_bound(graph)
+    if 'bound' in overrides:
+        bound = float(overrides['bound'])
+
+    plan = Plan(level, k, t, bound, n, graph.num_edges, max_weight)
+    for name in ('level', 'k', 't'):
+        if name in overrides:
+            setattr(plan, name, max(1, int(overrides[name])))
+    profile = weight_profile(w for _, out in graph.edges.items() for _, w in out)
+    plan.weight_scale = profile.scale
+    plan.queue = _choose_queue(profile, overrides)
+    if overrides:
+        plan.origin = 'override'
+    return plan
+
+
+def autotune(graph, samples: int = 3, candidates: Optional[Iterable[Tuple[int, int]]] = None,
+             overrides: Optional[Dict] = None, nodes: Optional[Sequence] = None, seed: int = 0) -> Plan:
+    """
+    Cronometra `samples` consultas de fontes aleatórias para cada (k, t) candidato e fica
+    com o mais rápido. Sem `candidates`, testa à volta dos valores do artigo. As distâncias
+    são exatas com qualquer candidato; só muda o tempo.
+    """
+    nodes = list(nodes) if nodes is not None else list(graph.labels)
+    base = plan_parameters(graph, overrides, num_nodes=len(nodes))
+    if candidates is None:
+        candidates = _neighbourhood(base.k, base.t)
+
+    rng = random.Random(seed)
+    sample_sources = [rng.choice(nodes) for _ in range(samples)] if nodes else []
+    log_n = math.log2(max(len(nodes), 2))
+
+    best: Optional[Tuple[float, int, int, int]] = None
+    timings: Dict[Tuple[int, int, int], float] = {}
+    for k, t in candidates:
+        level = base.level if 'level' in (overrides or {}) else max(1, math.ceil(log_n / t))
+        constants = dict(base.constants, k=k, t=t)
+        session = SolverSession(graph, constants, nodes=nodes, track_predecessors=False)
+        start = time.perf_counter()
+        for source in sample_sources:
+            session.solve({source}, base.bound, level)
+        elapsed = time.perf_counter() - start
+        timings[(k, t, level)] = elapsed
+        if best is None or elapsed < best[0]:
+            best = (elapsed, k, t, level)
+
+    if best is not None:
+        _, base.k, base.t, base.level = best
+    base.origin = 'autotune'
+    base.timings = timings
+    return base
+
+
+def _choose_queue(profile, overrides: Dict) -> str:
+    """
+    Pesos já inteiros: Dial (peso máximo pequeno) ou radix heap, qualquer que seja k. Com o
+    k do artigo (<= 3) o caso base é pequeno e as três filas medem o mesmo; com k grande
+    as filas inteiras evitam as comparações de tuplos do heap binário.
+    """
+    if 'queue' in overrides:
+        if overrides['queue'] not in QUEUES:
+            raise ValueError(f"fila desconhecida: {overrides['queue']!r}")
+        return overrides['queue']
+    if profile.integral and profile.scale == 1:
+        return profile.queue
+    return 'binary'
+
+
+def _neighbourhood(k: int, t: int) -> List[Tuple[int, int]]:
+    """Candidatos à volta de (k, t): k e t do artigo, metade/dobro de k e t ± 1."""
+    ks = sorted({max(1, k // 2), k, 2 * k})
+    ts = sorted({max(1, t - 1), t, t + 1})
+    return [(k_, t_) for k_ in ks for t_ in ts]
@@ -0,0 +1,220 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .structures import IndexedHeap
+
+# Acima deste peso máximo (já escalado) os baldes do Dial ficam demasiado esparsos
+DIAL_MAX_WEIGHT = 1 << 10
+# Casas decimais testadas ao procurar a escala inteira dos pesos
+MAX_DECIMALS = 6
+# Inteiros exatos num float64
+_EXACT_LIMIT = 1 << 53
+
+
+def _check_key(key: float, last: int):
+    """Erro de uma chave que a fila não aceita (só chamado no caminho raro)."""
+    if int(key) != key:
+        raise ValueError(f"chave não inteira {key!r}: esta fila exige pesos inteiros (use weight_scale)")
+    raise ValueError(f"chave {key!r} menor do que a última extraída ({last})")
+
+
+class RadixHeap:
+    """
+    Radix heap monótono com decrease-key, para chaves inteiras não negativas.
+
+    O balde i guarda as chaves cujo bit mais alto diferente de `last` (a última chave
+    extraída) é o i-ésimo; cada item desce de balde no máximo ~64 vezes, logo push/pop
+    custam O(log C) amortizado sem comparações entre tuplos. Como no Dijkstra, nenhuma
+    chave inserida pode ser menor do que a última extraída.
+    """
+    __slots__ = ('_buckets', '_keys', '_bucket_of', '_last')
+
+    def __init__(self):
+        self._buckets: List[Dict[Any, float]] = [{} for _ in range(65)]
+        self._keys: Dict[Any, float] = {}
+        self._bucket_of: Dict[Any, int] = {}
+        self._last = 0
+
+    def push(self, item, key: float) -> bool:
+        ikey = int(key)
+        if ikey != key or ikey < self._last:
+            _check_key(key, self._last)
+        keys = self._keys
+        old = keys.get(item)
+        if old is not None:
+            if key >= old:
+                return False
+            del self._buckets[self._bucket_of[item]][item]
+        index = (ikey ^ self._last).bit_length()
+        self._buckets[index][item] = key
+        self._bucket_of[item] = index
+        keys[item] = key
+        return True
+
+    def _refill(self):
+        """Garante que o balde 0 tem os itens de chave mínima (e move `last` para ela)."""
+        buckets = self._buckets
+        if buckets[0]:
+            return
+        index = 1
+        while not buckets[index]:
+            index += 1
+        moving = buckets[index]
+        buckets[index] = {}
+        last = self._last = int(min(moving.values()))
+        bucket_of = self._bucket_of
+        for item, key in moving.items():
+            target = (int(key) ^ last).bit_length()
+            buckets[target][item] = key
+            bucket_of[item] = target
+
+    def pop(self) -> Tuple[float, Any]:
+        bucket = self._buckets[0]
+        if not bucket:
+            self._refill()
+        item, key = bucket.popitem()
+        del self._keys[item]
+        del self._bucket_of[item]
+        return key, item
+
+    def peek_key(self) -> float:
+        self._refill()
+        return float(self._last)
+
+    def key(self, item) -> float:
+        return self._keys[item]
+
+    def __contains__(self, item) -> bool:
+        return item in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class BucketQueue:
+    """
+    Fila de Dial: um balde por valor inteiro de chave e um cursor que só avança.
+    Com pesos inteiros <= C, as chaves vivas ficam a no máximo C do cursor, por isso
+    cada pop percorre O(C) baldes no pior caso e push/decrease-key são O(1).
+    """
+    __slots__ = ('_buckets', '_keys', '_cursor', '_max_gap')
+
+    def __init__(self, max_weight: int = DIAL_MAX_WEIGHT):
+        self._buckets: Dict[int, Dict[Any, float]] = {}
+        self._keys: Dict[Any, float] = {}
+        self._cursor = 0
+        self._max_gap = max(1, max_weight)
+
+    def push(self, item, key: float) -> bool:
+        ikey = int(key)
+        if ikey != key or ikey < self._cursor:
+            _check_key(key, self._cursor)
+        keys = self._keys
+        old = keys.get(item)
+        if old is not None:
+            if key >= old:
+                return False
+            self._discard(item, int(old))
+        bucket = self._buckets.get(ikey)
+        if bucket is None:
+            bucket = self._buckets[ikey] = {}
+        bucket[item] = key
+        keys[item] = key
+        return True
+
+    def _discard(self, item, ikey: int):
+        bucket = self._buckets[ikey]
+        del bucket[item]
+        if not bucket:
+            del self._buckets[ikey]
+
+    def _advance(self) -> int:
+        buckets, cursor = self._buckets, self._cursor
+        # Fontes iniciais espalhadas (mais do que C de distância): salta direto para o menor balde
+        for _ in range(self._max_gap + 1):
+            if cursor in buckets:
+                break
+            cursor += 1
+        else:
+            cursor = min(buckets)
+        self._cursor = cursor
+        return cursor
+
+    def pop(self) -> Tuple[float, Any]:
+        buckets = self._buckets
+        cursor = self._cursor
+        bucket = buckets.get(cursor)
+        if bucket is None:
+            cursor = self._advance()
+            bucket = buckets[cursor]
+        item, key = bucket.popitem()
+        if not bucket:
+            del buckets[cursor]
+        del self._keys[item]
+        return key, item
+
+    def peek_key(self) -> float:
+        return float(self._advance())
+
+    def key(self, item) -> float:
+        return self._keys[item]
+
+    def __contains__(self, item) -> bool:
+        return item in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+QUEUES = {'binary': IndexedHeap, 'radix': RadixHeap, 'dial': BucketQueue}
+
+
+@dataclass
+class WeightProfile:
+    """O que os pesos permitem: escala inteira (10^d) e o maior peso depois de escalado."""
+    integral: bool
+    scale: int
+    max_weight: float
+
+    @property
+    def queue(self) -> str:
+        """Fila recomendada para o caso base: Dial, radix heap ou heap binário."""
+        if not self.integral:
+            return 'binary'
+        return 'dial' if self.max_weight <= DIAL_MAX_WEIGHT else 'radix'
+
+
+def weight_profile(weights: Iterable[float], max_decimals: int = MAX_DECIMALS) -> WeightProfile:
+    """
+    Procura a menor escala 10^d (d <= max_decimals) que torna todos os pesos inteiros:
+    2.5 e 0.25 dão escala 100. Pesos com mais casas (ou que somados deixariam de ser
+    inteiros exatos num float64) ficam com a fila binária e escala 1.
+    """
+    values = list(weights)
+    max_weight = max(values, default=0.0)
+    if any(w < 0 for w in values):
+        return WeightProfile(False, 1, max_weight)
+    for decimals in range(max_decimals + 1):
+        scale = 10 ** decimals
+        if all(round(w * scale) / scale == w for w in values):
+            scaled_max = round(max_weight * scale)
+            # Um caminho soma até n - 1 pesos: a soma também tem de caber em 2^53
+            if scaled_max * max(len(values), 1) >= _EXACT_LIMIT:
+                break
+            return WeightProfile(True, scale, float(scaled_max))
+    return WeightProfile(False, 1, max_weight)
+
+
+def scale_weights(weights: Iterable[float], scale: int) -> List[float]:
+    """Pesos em unidades inteiras de 1/scale (floats com valor inteiro exato)."""
+    return [float(round(w * scale)) for w in weights]
+
+
+def make_queue(name: Optional[str], max_weight: float = DIAL_MAX_WEIGHT):
+    """Fábrica do caso base; None é o heap binário."""
+    name = name or 'binary'
+    if name not in QUEUES:
+        raise ValueError(f"fila desconhecida: {name!r} (use {', '.join(QUEUES)})")
+    if name == 'dial':
+        return lambda: BucketQueue(int(max_weight))
+    return QUEUES[name]
@@ -0,0 +1,379 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .cache import ShortestPathTree
+from .csr import CSRGraph
+from .matrix import SharedCSR, attach_shared_csr
+from .session import SolverSession
+
+# Estado de cada processo do pool: preenchido uma vez pelo initializer
+_worker: Dict = {}
+
+# Amostras de latência guardadas por endpoint (janela deslizante)
+LATENCY_WINDOW = 4096
+# Limites do pedido HTTP: linha + cabeçalhos e corpo JSON
+MAX_HEADER_BYTES = 16 << 10
+MAX_BODY_BYTES = 1 << 20
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+def _init_worker(names: Sequence[str], num_nodes: int, num_edges: int, constants: Dict):
+    graph, blocks = attach_shared_csr(names[:3], num_nodes, num_edges)
+    _worker['blocks'] = blocks
+    _worker['session'] = SolverSession(graph.index_view(), constants, nodes=range(num_nodes))
+
+
+def _solve_with(session: SolverSession, source: int) -> Tuple[Any, Any]:
+    session.solve({source})
+    return session.tree_arrays()
+
+
+def _solve_tree(source: int) -> Tuple[Any, Any]:
+    return _solve_with(_worker['session'], source)
+
+
+class LatencyWindow:
+    """Últimas N latências (segundos) de um endpoint, com percentis por ordenação da janela."""
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self.samples: deque = deque(maxlen=size)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {'count': self.count}
+
+        def rank(p: float) -> float:
+            # Percentil pelo método nearest-rank, em milissegundos
+            return ordered[max(0, -(-len(ordered) * p // 100) - 1)] * 1000.0
+
+        return {'count': self.count, 'p50_ms': rank(50), 'p90_ms': rank(90),
+                'p99_ms': rank(99), 'max_ms': ordered[-1] * 1000.0}
+
+
+class ServerMetrics:
+    """Contadores do servidor: pedidos, latências por endpoint e profundidade da fila de solves."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self.latency: Dict[str, LatencyWindow] = {}
+        self.errors = 0
+        self.solves = 0          # execuções do BMSSP submetidas ao pool
+        self.coalesced = 0       # pedidos servidos por um solve já em curso
+        self.queue_depth = 0     # solves submetidos e ainda por terminar
+        self.max_queue_depth = 0
+        self.active_requests = 0
+
+    def record(self, endpoint: str, seconds: float):
+        window = self.latency.get(endpoint)
+        if window is None:
+            window = self.latency[endpoint] = LatencyWindow(self.window)
+        window.record(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'solves': self.solves, 'coalesced': self.coalesced, 'errors': self.errors,
+                'queue_depth': self.queue_depth, 'max_queue_depth': self.max_queue_depth,
+                'active_requests': self.active_requests,
+                'latency': {name: window.summary() for name, window in sorted(self.latency.items())}}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class QueryServer:
+    """
+    Serviço de consultas de longa duração: o grafo é carregado uma vez (CSR em shared
+    memory) e os solves correm num pool de processos, fora do event loop.
+
+    Pedidos com a mesma origem em curso ao mesmo tempo partilham um único BMSSP: a árvore
+    completa dessa origem responde a todos os destinos. Em troca, cada solve devolve do pool
+    os dois arrays O(V) da árvore (16 bytes por nó, serializados com pickle), mesmo quando
+    só um destino foi pedido; em grafos muito grandes esse custo soma-se a cada /route.
+    Com processes=0 os solves correm numa thread do próprio processo (útil para grafos
+    pequenos e testes), sem essa cópia.
+    """
+
+    def __init__(self, graph, constants: Optional[Dict] = None, processes: Optional[int] = None,
+                 window: int = LATENCY_WINDOW):
+        self.graph = graph if isinstance(graph, CSRGraph) else CSRGraph.from_simple_graph(graph)
+        if constants is None:
+            from .planner import plan_parameters
+            constants = plan_parameters(self.graph).constants
+        self.constants = constants
+        self.metrics = ServerMetrics(window)
+        self._inflight: Dict[int, asyncio.Future] = {}
+        self._servers: List[asyncio.AbstractServer] = []
+        self._shared: Optional[SharedCSR] = None
+        self._executor = self._start_executor((os.cpu_count() or 1) if processes is None else processes)
+
+    def _start_executor(self, processes: int) -> Executor:
+        if processes == 0:
+            session = SolverSession(self.graph.index_view(), self.constants, nodes=range(self.graph.num_nodes))
+            self._solve = partial(_solve_with, session)
+            # Uma só thread: a sessão reutiliza os buffers e não pode ser partilhada
+            return ThreadPoolExecutor(1)
+        self._shared = SharedCSR(self.graph, 0, 0)
+        self._solve = _solve_tree
+        init_args = (self._shared.names, self.graph.num_nodes, self.graph.num_edges, self.constants)
+        return ProcessPoolExecutor(processes, mp_context=get_context(),
+                                   initializer=_init_worker, initargs=init_args)
+
+    # --- Consultas ---
+
+    async def tree(self, source) -> ShortestPathTree:
+        """Árvore de caminhos mínimos da origem; junta-se a um solve em curso se houver."""
+        source_id = self._resolve(source)
+        future = self._inflight.get(source_id)
+        if future is not None:
+            self.metrics.coalesced += 1
+        else:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, self._solve, source_id)
+            self._inflight[source_id] = future
+            future.add_done_callback(partial(self._finished, source_id))
+            self.metrics.solves += 1
+            self.metrics.queue_depth += 1
+            self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
+        # shield: um cliente que desiste não cancela o solve dos outros
+        dist, pred = await asyncio.shield(future)
+        return ShortestPathTree(source, dist, pred)
+
+    def _finished(self, source_id: int, _future: asyncio.Future):
+        del self._inflight[source_id]
+        self.metrics.queue_depth -= 1
+
+    async def route(self, source, target) -> Dict[str, Any]:
+        target_id = self._resolve(target)
+        tree = await self.tree(source)
+        distance = tree.distance(target_id)
+        path = [self.graph.label_of(v) for v in tree.path(target_id)]
+        return {'source': source, 'target': target, 'distance': _json_float(distance), 'path': path}
+
+    async def table(self, origins: Sequence, destinations: Sequence) -> Dict[str, Any]:
+        destination_ids = [self._resolve(v) for v in destinations]
+        trees = await asyncio.gather(*(self.tree(u) for u in origins))
+        rows = [[_json_float(tree.distance(v)) for v in destination_ids] for tree in trees]
+        return {'origins': list(origins), 'destinations': list(destinations), 'distances': rows}
+
+    def _resolve(self, label) -> int:
+        graph = self.graph
+        if label in graph:
+            return graph.id_of(label)
+        # Na query string tudo chega como texto: tenta o rótulo inteiro equivalente
+        if isinstance(label, str):
+            try:
+                number = int(label)
+            except ValueError:
+                pass
+            else:
+                if number in graph:
+                    return graph.id_of(number)
+        raise HTTPError(404, f"nó desconhecido: {label!r}")
+
+    # --- HTTP ---
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080,
+                    unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Começa a aceitar ligações em TCP (host, port) ou num Unix socket (unix_path)."""
+        if unix_path is not None:
+            server = await asyncio.start_unix_server(self._handle, path=unix_path)
+        else:
+            server = await asyncio.start_server(self._handle, host, port)
+        self._servers.append(server)
+        return server
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        self._executor.shutdown(wait=True)
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            # HTTP/1.1 com keep-alive: vários pedidos por ligação até 'Connection: close' ou EOF
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except HTTPError as error:
+                    await _write_response(writer, error.status, {'error': str(error)}, close=True)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                close = headers.get('connection', '').lower() == 'close'
+                status, payload = await self._dispatch(method, target, body)
+                await _write_response(writer, status, payload, close)
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Dict]:
+        url = urlsplit(target)
+        endpoint = url.path.rstrip('/') or '/'
+        start = time.perf_counter()
+        self.metrics.active_requests += 1
+        try:
+            params = _params(method, url.query, body)
+            if endpoint == '/route':
+                payload = await self.route(_required(params, 'source'), _required(params, 'target'))
+            elif endpoint == '/distance':
+                route = await self.route(_required(params, 'source'), _required(params, 'target'))
+                payload = {key: route[key] for key in ('source', 'target', 'distance')}
+            elif endpoint == '/table':
+                payload = await self.table(_listed(params, 'origins'), _listed(params, 'destinations'))
+            elif endpoint == '/metrics':
+                return 200, self.metrics.snapshot()
+            elif endpoint == '/health':
+                return 200, {'status': 'ok', 'nodes': self.graph.num_nodes, 'edges': self.graph.num_edges}
+            else:
+                raise HTTPError(404, f"endpoint desconhecido: {endpoint}")
+        except HTTPError as error:
+            self.metrics.errors += 1
+            return error.status, {'error': str(error)}
+        except Exception as error:
+            self.metrics.errors += 1
+            return 500, {'error': f"{type(error).__name__}: {error}"}
+        finally:
+            self.metrics.active_requests -= 1
+        self.metrics.record(endpoint, time.perf_counter() - start)
+        return 200, payload
+
+
+def _json_float(value: float) -> Optional[float]:
+    """JSON não tem infinito: destino inalcançável vai como null."""
+    return None if value == float('inf') else value
+
+
+def _params(method: str, query: str, body: bytes) -> Dict[str, Any]:
+    if method == 'GET':
+        return {key: values[-1] for key, values in parse_qs(query).items()}
+    if method == 'POST':
+        try:
+            params = json.loads(body or b'{}')
+        except ValueError as error:
+            raise HTTPError(400, f"corpo JSON inválido: {error}")
+        if not isinstance(params, dict):
+            raise HTTPError(400, "o corpo tem de ser um objeto JSON")
+        return params
+    raise HTTPError(405, f"método não suportado: {method}")
+
+
+def _required(params: Dict[str, Any], name: str):
+    if name not in params:
+        raise HTTPError(400, f"parâmetro em falta: {name}")
+    return params[name]
+
+
+def _listed(params: Dict[str, Any], name: str) -> List:
+    """Lista JSON no corpo ou valores separados por vírgulas na query string."""
+    values = _required(params, name)
+    return values.split(',') if isinstance(values, str) else list(values)
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """Lê um pedido (método, alvo, cabeçalhos, corpo); None se o cliente fechou a ligação."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, _version = line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, "linha de pedido inválida")
+    headers: Dict[str, str] = {}
+    size = len(line)
+    while True:
+        line = await reader.readline()
+        size += len(line)
+        if size > MAX_HEADER_BYTES:
+            raise HTTPError(413, "cabeçalhos demasiado grandes")
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length', 0) or 0)
+    except ValueError:
+        raise HTTPError(400, "Content-Length inválido")
+    if length < 0:
+        raise HTTPError(400, "Content-Length inválido")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "corpo demasiado grande")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, headers, body
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: int, payload: Dict, close: bool):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+
+
+def load_graph(path: str) -> CSRGraph:
+    """Cenário JSON ou grafo binário (.bin, aberto com mmap)."""
+    if path.endswith('.bin'):
+        from .mapped import MappedGraph
+        return MappedGraph(path)
+    from .loaders import read_json_graph
+    edges, _ = read_json_graph(path)
+    return edges.to_csr()
+
+
+async def serve(graph, host: str, port: int, unix_path: Optional[str], processes: Optional[int]):
+    server = QueryServer(graph, processes=processes)
+    try:
+        listener = await server.start(host, port, unix_path)
+        address = unix_path or f"http://{host}:{listener.sockets[0].getsockname()[1]}"
+        print(f"🛰️  A servir {graph.num_nodes} nós / {graph.num_edges} arestas em {address}")
+        await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Servidor HTTP de rotas e tabelas de distâncias (BMSSP).")
+    parser.add_argument("graph_path", help="cenário JSON ou grafo binário (.bin)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix", dest="unix_path", help="Unix socket em vez de TCP")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="processos do pool de solves (0 = thread no próprio processo)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(load_graph(args.graph_path), args.host, args.port, args.unix_path, args.processes))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
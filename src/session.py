@@ -0,0 +1,282 @@
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
+
+from .solver import BoundedMultiSourceShortestPath, MultiSourceResult, QueryResult, SolveResult
+
+
+class VersionedMap(MutableMapping):
+    """
+    Mapa de tamanho fixo (um slot por nó) sobre um buffer pré-alocado.
+
+    Cada slot guarda o valor e a versão em que foi escrito; um slot com versão antiga
+    vale `default`. `reset()` só incrementa a versão, por isso limpar o mapa entre
+    consultas custa O(1) em vez de O(V), e a próxima consulta só paga pelos nós que tocar.
+    """
+
+    def __init__(self, keys: Sequence, typecode: str = 'd', default: Any = float('inf')):
+        self._keys = keys
+        # Grafos por id (0..n-1) dispensam o dicionário rótulo -> slot
+        self._slots: Optional[Dict] = None if isinstance(keys, range) and keys.start == 0 and keys.step == 1 \
+            else {key: slot for slot, key in enumerate(keys)}
+        self._values = array(typecode, [0]) * len(keys)
+        self._stamps = array('q', [0]) * len(keys)
+        self._version = 1
+        self._touched = array('q')
+        self.default = default
+
+    def reset(self):
+        self._version += 1
+        del self._touched[:]
+
+    def _slot(self, key) -> int:
+        return key if self._slots is None else self._slots[key]
+
+    def __getitem__(self, key):
+        slot = self._slot(key)
+        if self._stamps[slot] != self._version:
+            return self.default
+        return self._values[slot]
+
+    def __setitem__(self, key, value):
+        slot = self._slot(key)
+        if self._stamps[slot] != self._version:
+            self._stamps[slot] = self._version
+            self._touched.append(slot)
+        self._values[slot] = value
+
+    def __delitem__(self, key):
+        raise TypeError("VersionedMap tem um slot fixo por nó; use reset()")
+
+    def extend(self, keys: Sequence):
+        """Passa a cobrir 'keys' (as chaves atuais seguidas de nós novos), sem perder valores."""
+        added = len(keys) - len(self._keys)
+        if added <= 0:
+            return
+        if self._slots is not None:
+            for slot in range(len(self._keys), len(keys)):
+                self._slots[keys[slot]] = slot
+        self._keys = keys
+        self._values.extend(array(self._values.typecode, [0]) * added)
+        # Carimbo 0 é sempre antigo (a versão começa em 1): os slots novos valem `default`
+        self._stamps.extend(array('q', [0]) * added)
+
+    def __contains__(self, key) -> bool:
+        return key in self._slots if self._slots is not None else 0 <= key < len(self._keys)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def touched(self) -> int:
+        """Quantos nós foram escritos desde o último reset."""
+        return len(self._touched)
+
+    def touched_slots(self) -> Iterator[Tuple[int, Any]]:
+        """(slot, valor guardado) dos slots escritos desde o último reset, sem traduzir rótulos."""
+        values = self._values
+        for slot in self._touched:
+            yield slot, values[slot]
+
+    def touched_items(self) -> Iterator[Tuple[Any, Any]]:
+        keys, values = self._keys, self._values
+        for slot in self._touched:
+            yield keys[slot], values[slot]
+
+
+class VersionedPredecessorMap(VersionedMap):
+    """VersionedMap de predecessores: guarda o slot do pai (array 'q') e devolve o rótulo."""
+
+    def __init__(self, keys: Sequence):
+        super().__init__(keys, typecode='q', default=None)
+
+    def __getitem__(self, key):
+        parent = super().__getitem__(key)
+        return None if parent is None else self._keys[parent]
+
+    def __setitem__(self, key, parent):
+        super().__setitem__(key, self._slot(parent))
+
+    def touched_items(self) -> Iterator[Tuple[Any, Any]]:
+        keys = self._keys
+        for key, parent in super().touched_items():
+            yield key, keys[parent]
+
+
+class LabelView(Mapping):
+    """
+    Vista só de leitura {rótulo: valor} sobre um mapa indexado pelos ids inteiros do grafo
+    (graph=None: as chaves já são as do mapa). Com `scale`, divide os valores por ela.
+    """
+
+    def __init__(self, values: Mapping, graph=None, scale: int = 1):
+        self._values = values
+        self._graph = graph
+        self._scale = scale
+
+    def __getitem__(self, label):
+        value = self._values[label if self._graph is None else self._graph.id_of(label)]
+        return value if self._scale == 1 else value / self._scale
+
+    def __iter__(self) -> Iterator:
+        return iter(self._values if self._graph is None else self._graph.labels)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, label) -> bool:
+        return label in (self._values if self._graph is None else self._graph)
+
+
+class SolverSession:
+    """
+    Sessão de longa duração presa a um grafo. Os buffers de distância e de predecessores
+    são alocados uma vez; cada consulta começa com um reset O(1) por versão e reaproveita
+    o mesmo solver, sem reconstruir o dicionário {nó: inf} a cada pedido.
+
+    Se o grafo tem ids internos (`index_view`/`id_of`: SimpleGraph, CSRGraph), o solver
+    corre só sobre inteiros: os rótulos são traduzidos à entrada e à saída da API
+    (fontes, rotas, vértices completos), nunca dentro dos heaps e conjuntos.
+
+    `weight_scale` indica que os pesos do grafo estão em unidades inteiras de 1/scale
+    (EdgeArrays.scaled): limites e custos entram multiplicados e as distâncias saem
+    divididas, e as somas do solver ficam exatas.
+    """
+
+    def __init__(self, graph, constants: Optional[Dict] = None, nodes: Optional[Sequence] = None,
+                 track_predecessors: bool = True, weight_scale: int = 1):
+        self.graph = graph
+        self.weight_scale = weight_scale
+        self._interned = hasattr(graph, 'index_view') and hasattr(graph, 'id_of')
+        if self._interned:
+            self._intern_nodes(nodes or ())
+            nodes = range(graph.num_nodes)
+            solver_graph = graph.index_view()
+        else:
+            if nodes is None:
+                nodes = graph.labels if hasattr(graph, 'labels') else list(graph.edges)
+            solver_graph = graph
+        self.dist = VersionedMap(nodes)
+        self.pred = VersionedPredecessorMap(nodes) if track_predecessors else None
+        self.owner: Optional[VersionedMap] = None
+        self.solver = BoundedMultiSourceShortestPath(solver_graph, self.dist, constants or {}, predecessor_map=self.pred)
+        self.queries = 0
+        self._graph_version = getattr(graph, 'version', 0)
+
+    def _sync(self):
+        """Nós acrescentados ao grafo desde a última consulta (version mudou) ganham slots."""
+        version = getattr(self.graph, 'version', 0)
+        if version == self._graph_version:
+            return
+        self._graph_version = version
+        if self._interned and self.graph.num_nodes > len(self.dist):
+            nodes = range(self.graph.num_nodes)
+            for buffer in (self.dist, self.pred, self.owner):
+                if buffer is not None:
+                    buffer.extend(nodes)
+
+    def _intern_nodes(self, nodes: Iterable):
+        """Nós isolados pedidos em 'nodes' ganham um id (só um SimpleGraph aceita nós novos)."""
+        for node in nodes:
+            if node not in self.graph:
+                if not hasattr(self.graph, 'add_node'):
+                    raise KeyError(node)
+                self.graph.add_node(node)
+
+    # --- Tradução rótulo <-> id na fronteira da API ---
+
+    def _id(self, label):
+        return self.graph.id_of(label) if self._interned else label
+
+    def _label(self, node_id):
+        return self.graph.label_of(node_id) if self._interned else node_id
+
+    def _labels(self, node_ids: Iterable) -> Set:
+        if not self._interned:
+            return set(node_ids)
+        label_of = self.graph.label_of
+        return {label_of(i) for i in node_ids}
+
+    def _unscale(self, value: float) -> float:
+        return value if self.weight_scale == 1 else value / self.weight_scale
+
+    @property
+    def distances(self) -> Mapping:
+        """Distâncias da última consulta como {rótulo: distância}."""
+        if not self._interned and self.weight_scale == 1:
+            return self.dist
+        return LabelView(self.dist, self.graph if self._interned else None, self.weight_scale)
+
+    def reset(self):
+        self._sync()
+        self.dist.reset()
+        if self.pred is not None:
+            self.pred.reset()
+
+    def solve(self, sources: Set, bound: float = float('inf'), level: Optional[int] = None) -> SolveResult:
+        self.reset()
+        self.queries += 1
+        ids = {self._id(source) for source in sources}
+        for source in ids:
+            self.dist[source] = 0.0
+        result = self.solver.solve(ids, bound * self.weight_scale, level)
+        result.settled = self._labels(result.settled)
+        result.bound = self._unscale(result.bound)
+        return result
+
+    def query(self, source, target, bound: float = float('inf'), level: Optional[int] = None) -> QueryResult:
+        self.reset()
+        self.queries += 1
+        result = self.solver.query(self._id(source), self._id(target), bound * self.weight_scale, level)
+        result.distance = self._unscale(result.distance)
+        if result.path is not None:
+            result.path = [self._label(v) for v in result.path]
+        return result
+
+    def multi_source(self, sources, bound: float = float('inf'), level: Optional[int] = None) -> MultiSourceResult:
+        """Várias fontes (ou {fonte: custo inicial}) com a fonte dona de cada vértice."""
+        self.reset()
+        self.queries += 1
+        # O buffer das donas só é criado na primeira consulta multi-fonte
+        if self.owner is None:
+            self.owner = VersionedMap(self.dist._keys, 'q', -1)
+        else:
+            self.owner.reset()
+        if hasattr(sources, 'items'):
+            ids = {self._id(source): cost * self.weight_scale for source, cost in sources.items()}
+        else:
+            ids = [self._id(source) for source in sources]
+        result = self.solver.multi_source(ids, bound * self.weight_scale, level, owner_map=self.owner)
+        result.bound = self._unscale(result.bound)
+        if self._interned:
+            result = MultiSourceResult([self._label(v) for v in result.sources], LabelView(self.owner, self.graph),
+                                       self._labels(result.settled), result.bound)
+        return result
+
+    def tree_arrays(self) -> Tuple[array, array]:
+        """
+        Cópia compacta da última consulta, indexada pelo slot do nó: (distâncias 'd' nas
+        unidades do solver, predecessores 'q' com -1 = sem pai). Custa O(nós tocados) além
+        da alocação.
+        """
+        size = len(self.dist)
+        dist = array('d', [float('inf')]) * size
+        for slot, d in self.dist.touched_slots():
+            dist[slot] = d
+        pred = array('q', [-1]) * size
+        if self.pred is not None:
+            for slot, parent in self.pred.touched_slots():
+                pred[slot] = parent
+        return dist, pred
+
+    def distance(self, v) -> float:
+        self._sync()
+        return self._unscale(self.dist[self._id(v)])
+
+    def path_to(self, target):
+        self._sync()
+        return [self._label(v) for v in self.solver.path_to(self._id(target))]
+
@@ -1,90 +1,437 @@
-import heapq
-from typing import Set, Tuple, Dict
-from .structures import SimpleGraph, BatchQueue
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Set, Tuple, Dict
+from .structures import SimpleGraph, BatchQueue, IndexedHeap
+
+@dataclass
+class SolveResult:
+    """Resultado de `solve`: todas as distâncias abaixo de `bound` são exatas."""
+    bound: float
+    settled: Set = field(default_factory=set)
+    budget_hits: int = 0   # níveis que pararam por atingir |U| >= k * 2^(l*t)
+    resumes: int = 0       # reinícios do nível de topo a partir da fronteira
+
+@dataclass
+class QueryResult:
+    """Resultado de `query`: distância e rota até ao alvo, e o trabalho gasto para as obter."""
+    distance: float
+    path: Optional[List]
+    settled: int           # vértices completados até o alvo ficar fixo
+    total_vertices: int    # vértices que uma execução completa poderia completar
+
+    @property
+    def settled_fraction(self) -> float:
+        return self.settled / self.total_vertices if self.total_vertices else 0.0
+
+@dataclass
+class MultiSourceResult:
+    """Resultado de `multi_source`: vértices completos abaixo de `bound` e a fonte dona de cada um."""
+    sources: List
+    owner: Any             # dict ou array('q'): índice em `sources` (-1 = sem dona)
+    settled: Set
+    bound: float
+
+    def owner_of(self, v) -> Optional[Any]:
+        index = self.owner.get(v, -1) if hasattr(self.owner, 'get') else self.owner[v]
+        return None if index == -1 else self.sources[index]
+
+    def partition(self) -> Dict[Any, List]:
+        """Partição de Voronoi dos vértices completos: {fonte: [vértices mais próximos dela]}."""
+        cells: Dict[Any, List] = {source: [] for source in self.sources}
+        for v in self.settled:
+            owner = self.owner_of(v)
+            if owner is not None:
+                cells[owner].append(v)
+        return cells
+
+class _LevelFrame:
+    """Estado de uma chamada BMSSP de nível >= 1 na pilha explícita."""
+    __slots__ = ('level', 'queue', 'bound', 'reached_w', 'settled', 'b_prime', 'budget',
+                 'batch_bound', 'batch_sources')
+
+    def __init__(self, level: int):
+        self.level = level
+        self.queue = BatchQueue()
+        self.bound = float('inf')
+        self.reached_w: Optional[Set] = None
+        self.settled: Optional[Set] = None
+        self.b_prime = float('inf')
+        self.budget = 0
+        self.batch_bound = float('inf')
+        self.batch_sources: Optional[Set] = None
 
 class BoundedMultiSourceShortestPath:
-    def __init__(self, graph: SimpleGraph, distance_map: Dict, constants: Dict):
+    def __init__(self, graph: SimpleGraph, distance_map: Dict, constants: Dict, vectorized: bool = False,
+                 track_predecessors: bool = False, predecessor_map=None, instrument: bool = False,
+                 tracer=None):
         self.graph = graph
         self.dist = distance_map
-        self.k = constants.get('k', 5000)
-        self.t = constants.get('t', 50)
+        # Sem k/t explícitos usa os valores do artigo para o tamanho do grafo (ver planner.py)
+        if 'k' not in constants or 't' not in constants:
+            from .planner import paper_parameters
+            _, default_k, default_t = paper_parameters(len(distance_map))
+            constants = {'k': default_k, 't': default_t, **constants}
+        self.k = max(1, int(constants['k']))
+        self.t = max(1, int(constants['t']))
+        # Fila do caso base: 'binary' (IndexedHeap), ou 'dial'/'radix' para pesos inteiros
+        self._new_heap = IndexedHeap
+        if constants.get('queue', 'binary') != 'binary':
+            from .queues import DIAL_MAX_WEIGHT, make_queue
+            self._new_heap = make_queue(constants['queue'], constants.get('max_weight', DIAL_MAX_WEIGHT))
+        self.budget_hits = 0
+        # Pool de frames (com a sua BatchQueue) por nível: há no máximo um ativo por nível
+        self._frames: Dict[int, _LevelFrame] = {}
+
+        # Modo ponto-a-ponto (query): alvo atual e se já foi completado
+        self._target = None
+        self._target_settled = False
+
+        # Predecessores: dict para mapas por rótulo, array compacto (-1 = sem pai) para arrays por id
+        self.pred = predecessor_map
+        if track_predecessors and predecessor_map is None:
+            self.pred = {} if hasattr(distance_map, 'items') else array('q', [-1]) * len(distance_map)
+        # Fonte dona de cada vértice (índice em `sources` de multi_source); só existe nesse modo
+        self.owner = None
+        self._tracking = self.pred is not None
+
+        # Modo vetorizado: CSRGraph + array float64 indexado por id; o resto do solver usa os ids
+        self._relaxer = None
+        if vectorized:
+            from .vectorized import FrontierRelaxer
+            if not hasattr(graph, 'offsets'):
+                raise TypeError("o modo vetorizado requer um CSRGraph")
+            self._relaxer = FrontierRelaxer(graph)
+            self.graph = graph.index_view()
+
+        # Instrumentação opcional (contadores por nível e trace): sem custo quando desligada
+        self.stats = None
+        if instrument or tracer is not None:
+            from .instrumentation import attach
+            self.stats = attach(self, tracer)
+
+    def solve(self, sources: Set, bound: float = float('inf'), level: Optional[int] = None) -> SolveResult:
+        """
+        Executa o BMSSP de topo até ao fim. Se o orçamento de trabalho do nível de topo
+        parar a execução antes de 'bound', recomeça a partir da fronteira
+        {v : B' <= d[v] < bound} em vez de devolver distâncias incompletas.
+        """
+        if level is None:
+            # Como no artigo: ceil(log n / t) níveis garantem k * 2^(l*t) >= n
+            level = max(1, math.ceil(math.log2(max(len(self.dist), 2)) / self.t))
+
+        hits_before = self.budget_hits
+        result = SolveResult(bound=bound)
+        frontier = set(sources)
+        while frontier:
+            reached_bound, settled = self.bmssp(level, bound, frontier)
+            result.settled.update(settled)
+            self._note_settled(settled)
+            if reached_bound >= bound or self._target_settled:
+                break
+            # A fronteira é varrida em O(V): só acontece quando o orçamento do topo é atingido
+            if hasattr(self.dist, 'touched_items'):
+                entries = self.dist.touched_items()
+            else:
+                entries = self.dist.items() if hasattr(self.dist, 'items') else enumerate(self.dist)
+            frontier = {v for v, d in entries if reached_bound <= d < bound}
+            result.resumes += 1
+            if not settled and frontier == sources:
+                raise RuntimeError("BMSSP não progrediu a partir da fronteira")
+            sources = frontier
+
+        result.budget_hits = self.budget_hits - hits_before
+        return result
+
+    def query(self, source, target, bound: float = float('inf'), level: Optional[int] = None) -> QueryResult:
+        """
+        Caminho mínimo de 'source' até 'target'. Para assim que o alvo fica completo e,
+        enquanto procura, aperta o limite para a melhor distância já conhecida do alvo.
+        """
+        self.dist[source] = 0.0
+        self._target, self._target_settled = target, False
+        try:
+            result = self.solve({source}, bound, level)
+        finally:
+            # Um solve() seguinte no mesmo solver não pode herdar o alvo já completado
+            self._target, self._target_settled = None, False
+
+        distance = self.dist[target] if target in result.settled else float('inf')
+        path = self.path_to(target) if self.pred is not None and distance < float('inf') else None
+        return QueryResult(distance, path, len(result.settled), len(self.dist))
+
+    def multi_source(self, sources, bound: float = float('inf'), level: Optional[int] = None,
+                     owner_map=None) -> "MultiSourceResult":
+        """
+        Várias fontes de uma vez (super-fonte): 'sources' é uma coleção de vértices (custo
+        inicial 0) ou um dicionário {fonte: custo inicial}. Cada vértice fica com a fonte
+        que o alcança mais barato (partição de Voronoi) e, com 'bound', o resultado são
+        exatamente os vértices a distância < bound (área de serviço / isócrona).
+        """
+        initial = sources if hasattr(sources, 'items') else dict.fromkeys(sources, 0.0)
+        order = list(initial)
+        if owner_map is None:
+            owner_map = {} if hasattr(self.dist, 'items') else array('q', [-1]) * len(self.dist)
+        previous = self.owner, self._tracking
+        self.owner, self._tracking = owner_map, True
+        try:
+            for index, source in enumerate(order):
+                if initial[source] < self.dist[source]:
+                    self.dist[source] = initial[source]
+                    owner_map[source] = index
+            result = self.solve(set(order), bound, level)
+        finally:
+            # Um solve()/query() seguinte não pode continuar a escrever neste mapa de donas
+            self.owner, self._tracking = previous
+        return MultiSourceResult(order, owner_map, result.settled, result.bound)
+
+    def _set_parent(self, u, v):
+        """Melhoria estrita de v através de u: atualiza o pai e herda a fonte dona."""
+        if self.pred is not None:
+            self.pred[v] = u
+        if self.owner is not None:
+            self.owner[v] = self.owner[u]
+
+    def _cap(self, bound: float) -> float:
+        """Em modo query, nada acima da distância provisória do alvo pode melhorar a rota."""
+        if self._target is None:
+            return bound
+        return min(bound, math.nextafter(self.dist[self._target], math.inf))
+
+    def _note_settled(self, vertices: Set):
+        if self._target is not None and self._target in vertices:
+            self._target_settled = True
+
+    def predecessor(self, v) -> Optional[Any]:
+        if self.pred is None:
+            raise RuntimeError("o solver foi criado sem track_predecessors=True")
+        parent = self.pred.get(v) if hasattr(self.pred, 'get') else self.pred[v]
+        return None if parent is None or parent == -1 else parent
+
+    def path_to(self, target) -> List:
+        """Rota (fonte ... target) seguindo os predecessores: O(comprimento do caminho)."""
+        if self.dist[target] == float('inf'):
+            return []
+        path = [target]
+        parent = self.predecessor(target)
+        while parent is not None:
+            path.append(parent)
+            if len(path) > len(self.dist):
+                raise RuntimeError("ciclo na árvore de predecessores")
+            parent = self.predecessor(parent)
+        path.reverse()
+        return path
+
+    def shortest_path_tree(self) -> Dict:
+        """Árvore de caminhos mínimos como {filho: pai} (as fontes não aparecem)."""
+        if self.pred is None:
+            raise RuntimeError("o solver foi criado sem track_predecessors=True")
+        if hasattr(self.pred, 'touched_items'):
+            return dict(self.pred.touched_items())
+        if isinstance(self.pred, dict):
+            return dict(self.pred)
+        return {v: parent for v, parent in enumerate(self.pred) if parent != -1}
 
     def bmssp(self, level: int, bound: float, sources: Set) -> Tuple[float, Set]:
+        """
+        BMSSP(l, B, S) do artigo, executado com uma pilha explícita de frames em vez de
+        recursão: a profundidade não depende da pilha do Python e cada nível reutiliza a
+        sua BatchQueue do pool. Devolve (B', U) como a versão recursiva.
+        """
+        stack: List[_LevelFrame] = []
+        result = self._descend(level, bound, sources, stack)
+        while stack:
+            frame = stack[-1]
+            if result is not None:
+                # O nível abaixo terminou: junta U, relaxa as arestas e volta a puxar
+                self._absorb(frame, *result)
+            batch = self._next_batch(frame)
+            if batch is None:
+                stack.pop()
+                result = self._close_frame(frame)
+            else:
+                result = self._descend(frame.level - 1, batch[0], batch[1], stack)
+        return result
+
+    def _descend(self, level: int, bound: float, sources: Set, stack: List["_LevelFrame"]) -> Optional[Tuple[float, Set]]:
+        """Entra numa chamada: o caso base devolve logo (B', U); os outros níveis empilham um frame."""
         # --- Passo 1: Caso Base ---
+        bound = self._cap(bound)
         if level == 0:
             return self._handle_base_case(bound, sources)
+        stack.append(self._open_frame(level, bound, sources))
+        return None
 
-        # --- Passo 2: Inicialização ---
-        pivots = set(sources)
-        batch_queue = BatchQueue()
-        # Inicializa com bound total (lógica definida no BatchQueue)
-        batch_queue.initialize(bound, bound)
-        
+    def _open_frame(self, level: int, bound: float, sources: Set) -> "_LevelFrame":
+        # --- Passo 2: Pivôs e Inicialização ---
+        pivots, reached_w = self._find_pivots(bound, sources)
+        frame = self._frames.get(level)
+        if frame is None:
+            frame = self._frames[level] = _LevelFrame(level)
+        # M = 2^((l-1)t): cada Pull devolve no máximo M vértices para o nível abaixo
+        frame.queue.initialize(2 ** ((level - 1) * self.t), bound)
         for x in pivots:
-            batch_queue.insert(x, self.dist[x])
-        
-        processed_vertices_u = set()
-        current_bound_b_prime = bound if not pivots else min(self.dist[x] for x in pivots)
-        
-        # --- Passo 3: Loop Principal ---
-        iteration = 0
-        while not batch_queue.is_empty():
-            iteration += 1
-            # Travão de segurança para grafos pequenos: 500 é mais que suficiente
-            if iteration > 500: 
-                break 
-
-            batch_bound, batch_sources = batch_queue.pull()
-            if not batch_sources: break
-
-            rec_bound, rec_vertices = self.bmssp(level - 1, batch_bound, batch_sources)
-            processed_vertices_u.update(rec_vertices)
-            
-            self._process_edges_and_update_queue(
-                rec_vertices, batch_sources, batch_bound, rec_bound, bound, batch_queue
-            )
-            current_bound_b_prime = min(current_bound_b_prime, rec_bound)
+            frame.queue.insert(x, self.dist[x])
+
+        frame.bound = bound
+        frame.reached_w = reached_w
+        frame.settled = set()
+        frame.b_prime = min((self.dist[x] for x in pivots), default=bound)
+        # Orçamento de trabalho do artigo: cada nível completa no máximo k * 2^(l*t) vértices
+        frame.budget = self.k * 2 ** (level * self.t)
+        frame.batch_bound, frame.batch_sources = bound, None
+        return frame
 
-        return min(current_bound_b_prime, bound), processed_vertices_u
+    def _next_batch(self, frame: "_LevelFrame") -> Optional[Tuple[float, Set]]:
+        # --- Passo 3: Loop Principal (uma iteração por lote) ---
+        if frame.queue.is_empty() or self._target_settled:
+            return None
+        if len(frame.settled) >= frame.budget:
+            self.budget_hits += 1
+            return None
+
+        batch_bound, batch_sources = frame.queue.pull()
+        if not batch_sources:
+            return None
+        frame.batch_bound, frame.batch_sources = self._cap(batch_bound), batch_sources
+        return frame.batch_bound, batch_sources
+
+    def _absorb(self, frame: "_LevelFrame", rec_bound: float, rec_vertices: Set):
+        frame.settled.update(rec_vertices)
+        self._note_settled(rec_vertices)
+        # B' é o limite devolvido pela última chamada ao nível abaixo
+        frame.b_prime = rec_bound
+        if self._target_settled:
+            return
+        self._process_edges_and_update_queue(
+            rec_vertices, frame.batch_sources, frame.batch_bound, rec_bound, self._cap(frame.bound), frame.queue
+        )
+
+    def _close_frame(self, frame: "_LevelFrame") -> Tuple[float, Set]:
+        final_bound = min(frame.b_prime, frame.bound)
+        settled = frame.settled
+        # Vértices de W abaixo do limite final também estão completos
+        settled.update(x for x in frame.reached_w if self.dist[x] < final_bound)
+        self._note_settled(settled)
+        # U pertence agora a quem chamou; o frame só guarda a fila para a próxima vez
+        frame.settled = frame.reached_w = frame.batch_sources = None
+        return final_bound, settled
 
     def _process_edges_and_update_queue(self, new_vertices_u, batch_sources, batch_bound, rec_bound, global_bound, batch_queue):
-        prepend_candidates_k = set()
-        for u in new_vertices_u:
-            for v, weight in self.graph.get_outgoing_edges(u):
-                self._relax_edge(u, v, weight, batch_bound, rec_bound, global_bound, prepend_candidates_k, batch_queue)
+        if self._relaxer is not None:
+            prepend_candidates_k = self._relax_frontier_vectorized(new_vertices_u, batch_bound, rec_bound, global_bound, batch_queue)
+        else:
+            prepend_candidates_k = set()
+            for u in new_vertices_u:
+                for v, weight in self.graph.get_outgoing_edges(u):
+                    self._relax_edge(u, v, weight, batch_bound, rec_bound, global_bound, prepend_candidates_k, batch_queue)
 
         if rec_bound < batch_bound:
             valid_sources = {x for x in batch_sources if rec_bound <= self.dist[x] < batch_bound}
-            for item in prepend_candidates_k.union(valid_sources):
-                batch_queue.insert(item, self.dist[item])
+            batch_queue.batch_prepend(
+                (item, self.dist[item]) for item in prepend_candidates_k.union(valid_sources)
+            )
 
     def _relax_edge(self, u, v, weight, batch_bound, rec_bound, global_bound, prepend_candidates_k, batch_queue):
         new_dist = self.dist[u] + weight
-        # Tolerância relaxada para garantir update (corrige problemas de precisão float)
-        if new_dist < self.dist[v] - 1e-7:
+        # '<=' como no artigo: empates também reenviam v para a fila (sem tolerância float)
+        if new_dist <= self.dist[v]:
+            # O pai só muda com melhoria estrita: empates não criam ciclos com arestas de peso 0
+            if self._tracking and new_dist < self.dist[v]:
+                self._set_parent(u, v)
             self.dist[v] = new_dist
             if batch_bound <= new_dist < global_bound:
                 batch_queue.insert(v, new_dist)
             elif rec_bound <= new_dist < batch_bound:
                 prepend_candidates_k.add(v)
 
+    def _relax_frontier_vectorized(self, new_vertices_u, batch_bound, rec_bound, global_bound, batch_queue) -> Set:
+        # Mesmo resultado que _relax_edge aresta a aresta: cada vértice fica com a menor candidata
+        import numpy as np
+        frontier = np.fromiter(new_vertices_u, dtype=np.int64, count=len(new_vertices_u))
+        pred = None if self.pred is None else np.frombuffer(self.pred, dtype=np.int64)
+        owner = None if self.owner is None else np.frombuffer(self.owner, dtype=np.int64)
+        insert_ids, insert_dists, prepend_ids = self._relaxer.relax(
+            self.dist, frontier, batch_bound, rec_bound, global_bound, pred, owner)
+        for v, new_dist in zip(insert_ids.tolist(), insert_dists.tolist()):
+            batch_queue.insert(v, new_dist)
+        return set(prepend_ids.tolist())
+
+    def _find_pivots(self, bound: float, sources: Set) -> Tuple[Set, Set]:
+        """
+        FindPivots (Algoritmo 1 do artigo): k passos de Bellman-Ford a partir de 'sources'.
+        Devolve (P, W): os pivôs P ⊆ sources e os vértices W alcançados abaixo de 'bound'.
+        """
+        reached_w = set(sources)
+        layer = set(sources)
+        for _ in range(self.k):
+            next_layer = set()
+            for u in layer:
+                dist_u = self.dist[u]
+                for v, weight in self.graph.get_outgoing_edges(u):
+                    new_dist = dist_u + weight
+                    if new_dist <= self.dist[v]:
+                        if self._tracking and new_dist < self.dist[v]:
+                            self._set_parent(u, v)
+                        self.dist[v] = new_dist
+                        if new_dist < bound:
+                            next_layer.add(v)
+            reached_w.update(next_layer)
+            # W cresceu demais: todas as fontes ficam como pivôs
+            if len(reached_w) > self.k * len(sources):
+                return set(sources), reached_w
+            if not next_layer:
+                break
+            layer = next_layer
+
+        pivots = {root for root in sources if self._tight_tree_size(root, reached_w) >= self.k}
+        return pivots, reached_w
+
+    def _tight_tree_size(self, root, reached_w: Set) -> int:
+        """Conta (até k) os vértices de W alcançáveis de 'root' por arestas com d[u] + w == d[v]."""
+        seen = {root}
+        stack = [root]
+        while stack and len(seen) < self.k:
+            u = stack.pop()
+            dist_u = self.dist[u]
+            for v, weight in self.graph.get_outgoing_edges(u):
+                if v not in seen and v in reached_w and dist_u + weight == self.dist[v]:
+                    seen.add(v)
+                    stack.append(v)
+        return len(seen)
+
     def _handle_base_case(self, bound: float, sources: Set) -> Tuple[float, Set]:
-        pq = []
+        # Dijkstra limitado: para ao completar k + 1 vértices. O heap indexado guarda cada
+        # vértice uma só vez (decrease-key), logo nunca tem mais de |V| entradas
+        heap = self._new_heap()
         for source in sources:
             if self.dist[source] < bound:
-                heapq.heappush(pq, (self.dist[source], source))
-        
+                heap.push(source, self.dist[source])
+
         visited_u = set()
-        while pq:
-            d_curr, u = heapq.heappop(pq)
-            if d_curr >= bound: continue
-            if d_curr > self.dist[u]: continue
-            
-            visited_u.add(u)
-            for v, weight in self.graph.get_outgoing_edges(u):
-                new_dist = self.dist[u] + weight
-                if new_dist < self.dist[v]:
-                    self.dist[v] = new_dist
-                    if new_dist < bound:
-                        heapq.heappush(pq, (new_dist, v))
-        return bound, visited_u
\ No newline at end of file
+        while heap and len(visited_u) <= self.k:
+            self._settle_next(heap, bound, visited_u)
+
+        if len(visited_u) <= self.k:
+            return bound, visited_u
+        # Mais de k vértices: devolve B' = maior distância e só o que fica estritamente abaixo
+        b_prime = max(self.dist[u] for u in visited_u)
+        settled = {u for u in visited_u if self.dist[u] < b_prime}
+        if settled:
+            return b_prime, settled
+
+        # Todos empatados em B' (arestas de peso 0): fecha o grupo do empate para garantir progresso
+        while heap and heap.peek_key() <= b_prime:
+            self._settle_next(heap, bound, visited_u)
+        return (heap.peek_key() if heap else bound), visited_u
+
+    def _settle_next(self, heap, bound: float, visited_u: Set):
+        d_curr, u = heap.pop()
+        visited_u.add(u)
+        for v, weight in self.graph.get_outgoing_edges(u):
+            new_dist = d_curr + weight
+            if new_dist <= self.dist[v] and new_dist < bound and v not in visited_u:
+                if self._tracking and new_dist < self.dist[v]:
+                    self._set_parent(u, v)
+                self.dist[v] = new_dist
+                heap.push(v, new_dist)
@@ -1,60 +1,707 @@
 import heapq
-from typing import List, Tuple, Dict, Set, Any
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from operator import itemgetter
+from typing import List, Tuple, Dict, Set, Any, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+# Ids de nós e de arestas do SimpleGraph: 4 bytes chegam para 2^31 - 1 arestas
+_ID = 'i'
+
+class EdgeChange(NamedTuple):
+    """Alteração aplicada a uma aresta: old=None é uma inserção, new=None uma remoção."""
+    u: Any
+    v: Any
+    old: Optional[float]
+    new: Optional[float]
+
+class _AdjacencyView(Mapping):
+    """Vista só de leitura {nó: [(vizinho, peso), ...]} sobre um grafo com `_labels`/`_index`."""
+
+    def __init__(self, graph, reverse: bool = False):
+        self._graph = graph
+        self._reverse = reverse
+
+    def __getitem__(self, label) -> List[Tuple[Any, float]]:
+        if label not in self._graph._index:
+            raise KeyError(label)
+        if self._reverse:
+            return self._graph.get_incoming_edges(label)
+        return self._graph.get_outgoing_edges(label)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._graph._labels)
+
+    def __len__(self) -> int:
+        return len(self._graph._labels)
 
 class SimpleGraph:
-    def __init__(self):
-        self.edges: Dict[Any, List[Tuple[Any, float]]] = {} 
-        # Adicionado para suportar o Backtracking (GPS)
-        self.reverse_edges: Dict[Any, List[Tuple[Any, float]]] = {}
+    """
+    Grafo dirigido mutável guardado em "forward star": cada aresta é uma posição em
+    arrays tipados (destino, peso, próxima aresta do mesmo nó) e cada nó só guarda a
+    primeira e a última aresta da sua lista. Não há um tuplo nem um float por aresta;
+    `edges`/`reverse_edges` continuam a ler-se como dicionários {nó: [(vizinho, peso)]}.
+
+    Na primeira leitura depois de alterações estruturais as arestas são compactadas
+    (compact): as de cada nó passam a ocupar posições contíguas, e ler as arestas de
+    saída é uma fatia dos arrays, como no CSR. Arestas acrescentadas depois disso ficam
+    encadeadas a seguir ao bloco do nó até haver uma nova compactação.
+
+    Com cache_adjacency=True as listas devolvidas por get_outgoing_edges ficam em cache
+    por nó até à próxima alteração das arestas desse nó: leituras repetidas custam o mesmo
+    que num dicionário de listas, mas com a cache cheia a memória também volta à dele.
+    Por omissão só ficam os arrays (cerca de 1/3 da memória do dicionário de listas) e
+    cada leitura monta a lista a partir de uma fatia; clear_cache() liberta a cache.
+
+    Com track_reverse=False o índice inverso (arestas de entrada) não é mantido:
+    poupa memória quando não é preciso percorrer o grafo ao contrário.
+    """
+    def __init__(self, track_reverse: bool = True, cache_adjacency: bool = False):
+        self.track_reverse = track_reverse
+        self.cache_adjacency = cache_adjacency
+        # Listas [(vizinho, peso)] já montadas por nó (rótulos e ids); None = por montar
+        self._out_cache: List[Optional[list]] = []
+        self._out_id_cache: List[Optional[list]] = []
+        # Incrementado a cada alteração: permite a caches saberem que ficaram desatualizadas
+        self.version = 0
+        self._removed = 0
+        self._labels: List = []
+        self._index: Dict[Any, int] = {}
+        # Por nó: primeira/última aresta de saída (-1 = nenhuma)
+        self._first = array(_ID)
+        self._last = array(_ID)
+        # Por nó: fim do bloco contíguo de arestas vivas que começa em _first (vazio se
+        # _first >= _run_end); o que vem depois do bloco lê-se pelo encadeamento
+        self._run_end = array(_ID)
+        self._compact_end = 0
+        # Arestas fora dos blocos desde a última compactação
+        self._appended = 0
+        self._needs_compaction = False
+        # Por aresta: destino, peso e próxima aresta de saída da mesma origem
+        self._heads = array(_ID)
+        self._weights = array('d')
+        self._next = array(_ID)
+        # Índice inverso sobre os mesmos ids de aresta: origem e encadeamento por destino
+        if track_reverse:
+            self._tails = array(_ID)
+            self._in_first = array(_ID)
+            self._in_last = array(_ID)
+            self._in_next = array(_ID)
+
+    @classmethod
+    def from_arrays(cls, labels: Sequence, sources: Sequence[int], targets: Sequence[int],
+                    weights: Sequence[float], track_reverse: bool = True) -> "SimpleGraph":
+        """Construtor em massa: arestas em colunas de ids (posições em 'labels')."""
+        if not len(sources) == len(targets) == len(weights):
+            raise ValueError("sources/targets/weights com tamanhos diferentes")
+        graph = cls(track_reverse)
+        for label in labels:
+            graph.add_node(label)
+        if len(graph._labels) != len(labels):
+            raise ValueError("rótulos de nós duplicados")
+        graph._extend_from_ids(sources, targets, weights)
+        return graph
+
+    def add_node(self, u) -> int:
+        node_id = self._index.get(u)
+        if node_id is None:
+            self.version += 1
+            node_id = self._index[u] = len(self._labels)
+            self._labels.append(u)
+            self._first.append(-1)
+            self._last.append(-1)
+            self._run_end.append(0)
+            self._out_cache.append(None)
+            self._out_id_cache.append(None)
+            if self.track_reverse:
+                self._in_first.append(-1)
+                self._in_last.append(-1)
+        return node_id
 
     def add_edge(self, u, v, weight: float):
-        # Aresta normal (Ida)
-        if u not in self.edges: self.edges[u] = []
-        self.edges[u].append((v, weight))
-        
-        # Garante que o nó de destino existe no dicionário
-        if v not in self.edges: self.edges[v] = []
-        
-        # Aresta inversa (Volta) - Vital para o visualizador GPS
-        if v not in self.reverse_edges: self.reverse_edges[v] = []
-        self.reverse_edges[v].append((u, weight))
+        source, target = self.add_node(u), self.add_node(v)
+        self.version += 1
+        edge = len(self._heads)
+        self._heads.append(target)
+        self._weights.append(weight)
+        self._next.append(-1)
+        _link_one(self._first, self._last, self._next, source, edge)
+        self._mark_appended(1)
+        self._invalidate(source)
+        # Aresta inversa (Volta): usada para percorrer o grafo ao contrário
+        if self.track_reverse:
+            self._tails.append(source)
+            self._in_next.append(-1)
+            _link_one(self._in_first, self._in_last, self._in_next, target, edge)
+
+    def add_edges(self, edges: Iterable[Tuple[Any, Any, float]]):
+        """Adiciona muitas arestas (u, v, w) de uma vez, sem passar por add_edge aresta a aresta."""
+        add_node = self.add_node
+        sources, targets, weights = array(_ID), array(_ID), array('d')
+        for u, v, w in edges:
+            sources.append(add_node(u))
+            targets.append(add_node(v))
+            weights.append(w)
+        self._extend_from_ids(sources, targets, weights)
+
+    def _extend_from_ids(self, sources: Sequence[int], targets: Sequence[int], weights: Sequence[float]):
+        self.version += 1
+        base = len(self._heads)
+        self._heads.extend(array(_ID, targets))
+        self._weights.extend(weights)
+        self._next.extend(array(_ID, [-1]) * len(targets))
+        _link(self._first, self._last, self._next, sources, base)
+        self._mark_appended(len(sources))
+        self.clear_cache()
+        if self.track_reverse:
+            self._tails.extend(array(_ID, sources))
+            self._in_next.extend(array(_ID, [-1]) * len(sources))
+            _link(self._in_first, self._in_last, self._in_next, targets, base)
+
+    # --- Atualizações (pesos dinâmicos) ---
+
+    def set_weight(self, u, v, weight: float) -> float:
+        """Muda o peso da (primeira) aresta u -> v e devolve o peso antigo."""
+        edge = self._find_edge(u, v)
+        old = self._weights[edge]
+        self._weights[edge] = weight
+        self._invalidate(self._index[u])
+        self.version += 1
+        return old
+
+    def remove_edge(self, u, v) -> float:
+        """Remove a (primeira) aresta u -> v e devolve o seu peso."""
+        edge = self._find_edge(u, v)
+        source = self._index[u]
+        if self._first[source] < edge < self._run_end[source]:
+            # Corta o bloco antes da aresta: o resto dele continua pelo encadeamento
+            self._run_end[source] = edge
+        _unlink(self._first, self._last, self._next, source, edge)
+        if self.track_reverse:
+            _unlink(self._in_first, self._in_last, self._in_next, self._index[v], edge)
+        self._removed += 1
+        # Como nas inserções: só compacta quando os slots mortos pesam nos arrays
+        if self._removed > self._compact_end // 4:
+            self._needs_compaction = True
+        self._invalidate(source)
+        self.version += 1
+        return self._weights[edge]
+
+    def apply_updates(self, updates: Iterable[Tuple[Any, Any, Optional[float]]]) -> List[EdgeChange]:
+        """
+        Aplica um lote de (u, v, peso): muda o peso se a aresta existir, insere-a se não
+        existir, e remove-a quando o peso é None. Devolve as alterações efetivas.
+        """
+        changes = []
+        for u, v, weight in updates:
+            try:
+                old = self.remove_edge(u, v) if weight is None else self.set_weight(u, v, weight)
+            except KeyError:
+                # Aresta inexistente: remover não faz nada, um peso novo insere-a
+                if weight is not None:
+                    self.add_edge(u, v, weight)
+                    changes.append(EdgeChange(u, v, None, weight))
+                continue
+            if old != weight:
+                changes.append(EdgeChange(u, v, old, weight))
+        return changes
+
+    def has_edge(self, u, v) -> bool:
+        try:
+            self._find_edge(u, v)
+        except KeyError:
+            return False
+        return True
+
+    def _find_edge(self, u, v) -> int:
+        source, target = self._index.get(u), self._index.get(v)
+        if source is not None and target is not None:
+            edge = self._first[source]
+            while edge != -1:
+                if self._heads[edge] == target:
+                    return edge
+                edge = self._next[edge]
+        raise KeyError((u, v))
+
+    # --- Compactação ---
+
+    def _mark_appended(self, count: int):
+        self._appended += count
+        # Poucas arestas fora dos blocos: a leitura percorre-as pelo encadeamento
+        if self._appended > self._compact_end // 4:
+            self._needs_compaction = True
+
+    def compact(self):
+        """
+        Renumera as arestas vivas por nó de origem (mantendo a ordem de cada nó), para que
+        as de cada nó fiquem contíguas; as removidas são descartadas. O(V + E).
+        """
+        n = len(self._labels)
+        first, nxt = self._first, self._next
+        order = array(_ID)
+        run_end = array(_ID, [0]) * n
+        new_first = array(_ID, [-1]) * n
+        new_last = array(_ID, [-1]) * n
+        for i in range(n):
+            edge = first[i]
+            if edge == -1:
+                continue
+            new_first[i] = len(order)
+            while edge != -1:
+                order.append(edge)
+                edge = nxt[edge]
+            run_end[i] = len(order)
+            new_last[i] = len(order) - 1
+
+        m = len(order)
+        old_count = len(self._heads)
+        self._heads = array(_ID, map(self._heads.__getitem__, order))
+        self._weights = array('d', map(self._weights.__getitem__, order))
+        self._next = array(_ID, range(1, m + 1))
+        for last in new_last:
+            if last != -1:
+                self._next[last] = -1
+        self._first, self._last, self._run_end = new_first, new_last, run_end
+
+        if self.track_reverse:
+            # Mesmas cadeias de entrada, com os ids de aresta novos
+            new_id = array(_ID, [-1]) * old_count
+            for position, edge in enumerate(order):
+                new_id[edge] = position
+            self._tails = array(_ID, map(self._tails.__getitem__, order))
+            in_first, in_last, in_next = self._in_first, self._in_last, self._in_next
+            new_in_next = array(_ID, [-1]) * m
+            for v in range(n):
+                edge, previous = in_first[v], -1
+                while edge != -1:
+                    current = new_id[edge]
+                    if previous == -1:
+                        in_first[v] = current
+                    else:
+                        new_in_next[previous] = current
+                    previous = current
+                    edge = in_next[edge]
+                in_last[v] = previous
+            self._in_next = new_in_next
+
+        self._removed = 0
+        self._compact_end = m
+        self._appended = 0
+        self._needs_compaction = False
+
+    def _out_ids(self, i: int) -> Tuple[Sequence[int], Sequence[float]]:
+        """Destinos e pesos das arestas de saída do id i: fatias do bloco mais o resto encadeado."""
+        if self._needs_compaction:
+            self.compact()
+        start = self._first[i]
+        if start == -1:
+            return (), ()
+        end = self._run_end[i]
+        if start < end:
+            heads, weights = self._heads[start:end], self._weights[start:end]
+            edge = self._next[end - 1]
+            if edge == -1:
+                return heads, weights
+        else:
+            heads, weights = array(_ID), array('d')
+            edge = start
+        nxt = self._next
+        while edge != -1:
+            heads.append(self._heads[edge])
+            weights.append(self._weights[edge])
+            edge = nxt[edge]
+        return heads, weights
+
+    @property
+    def labels(self) -> Tuple:
+        return tuple(self._labels)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self._labels)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self._heads) - self._removed
+
+    def id_of(self, label) -> int:
+        return self._index[label]
+
+    def label_of(self, node_id: int):
+        return self._labels[node_id]
+
+    def __contains__(self, label) -> bool:
+        return label in self._index
+
+    def index_view(self) -> "SimpleIndexView":
+        """Mesma interface, mas com os ids inteiros no lugar dos rótulos."""
+        return SimpleIndexView(self)
+
+    @property
+    def edges(self) -> Mapping:
+        return _AdjacencyView(self)
+
+    @property
+    def reverse_edges(self) -> Mapping:
+        self._require_reverse()
+        return _AdjacencyView(self, reverse=True)
 
     def get_outgoing_edges(self, u) -> List[Tuple[Any, float]]:
-        return self.edges.get(u, [])
+        i = self._index.get(u)
+        if i is None:
+            return []
+        out = self._out_cache[i]
+        if out is None:
+            heads, weights = self._out_ids(i)
+            out = list(zip(map(self._labels.__getitem__, heads), weights))
+            if self.cache_adjacency:
+                self._out_cache[i] = out
+        return out
+
+    def _invalidate(self, node_id: int):
+        """A lista de saída de node_id mudou: volta a ser montada na próxima leitura."""
+        self._out_cache[node_id] = None
+        self._out_id_cache[node_id] = None
+
+    def clear_cache(self):
+        """Liberta as listas de adjacência em cache (ficam só os arrays compactos)."""
+        n = len(self._labels)
+        self._out_cache = [None] * n
+        self._out_id_cache = [None] * n
 
     def get_incoming_edges(self, v) -> List[Tuple[Any, float]]:
-        return self.reverse_edges.get(v, [])
+        self._require_reverse()
+        i = self._index.get(v)
+        if i is None:
+            return []
+        labels, tails, weights, nxt = self._labels, self._tails, self._weights, self._in_next
+        out = []
+        edge = self._in_first[i]
+        while edge != -1:
+            out.append((labels[tails[edge]], weights[edge]))
+            edge = nxt[edge]
+        return out
+
+    def _require_reverse(self):
+        if not self.track_reverse:
+            raise RuntimeError("o grafo foi criado com track_reverse=False")
+
+class SimpleIndexView:
+    """
+    Vista de um SimpleGraph onde os vértices são os ids inteiros (0..n-1): percorre as
+    mesmas listas encadeadas sem traduzir para rótulos. Acompanha as alterações do grafo.
+    """
+
+    def __init__(self, graph: SimpleGraph):
+        self.graph = graph
+
+    @property
+    def num_nodes(self) -> int:
+        return self.graph.num_nodes
+
+    def get_outgoing_edges(self, u: int) -> List[Tuple[int, float]]:
+        graph = self.graph
+        out = graph._out_id_cache[u]
+        if out is None:
+            out = list(zip(*graph._out_ids(u)))
+            if graph.cache_adjacency:
+                graph._out_id_cache[u] = out
+        return out
+
+    def get_incoming_edges(self, v: int) -> List[Tuple[int, float]]:
+        graph = self.graph
+        graph._require_reverse()
+        tails, weights, nxt = graph._tails, graph._weights, graph._in_next
+        out = []
+        edge = graph._in_first[v]
+        while edge != -1:
+            out.append((tails[edge], weights[edge]))
+            edge = nxt[edge]
+        return out
+
+def _link_one(first: array, last: array, nxt: array, node: int, edge: int):
+    tail = last[node]
+    if tail == -1:
+        first[node] = edge
+    else:
+        nxt[tail] = edge
+    last[node] = edge
+
+def _unlink(first: array, last: array, nxt: array, node: int, edge: int):
+    previous, current = -1, first[node]
+    while current != edge:
+        previous, current = current, nxt[current]
+    if previous == -1:
+        first[node] = nxt[edge]
+    else:
+        nxt[previous] = nxt[edge]
+    if last[node] == edge:
+        last[node] = previous
+    nxt[edge] = -1
+
+def _link(first: array, last: array, nxt: array, owners: Sequence[int], base: int):
+    """Acrescenta as arestas base, base + 1, ... ao fim da lista do respetivo nó (ordem de inserção)."""
+    for edge, node in enumerate(owners, base):
+        tail = last[node]
+        if tail == -1:
+            first[node] = edge
+        else:
+            nxt[tail] = edge
+        last[node] = edge
+
+class IndexedHeap:
+    """
+    Heap binário mínimo com mapa de posições: cada item aparece no máximo uma vez,
+    `push` de um item já presente é um decrease-key verdadeiro (ou nada, se a chave
+    não melhorar). O tamanho fica limitado ao número de itens distintos, sem entradas
+    obsoletas para descartar no `pop`.
+    """
+    __slots__ = ('_keys', '_items', '_pos')
+
+    def __init__(self):
+        self._keys: List[float] = []
+        self._items: List[Any] = []
+        self._pos: Dict[Any, int] = {}
+
+    def push(self, item, key: float) -> bool:
+        """Insere 'item' ou baixa a sua chave; False se já lá estava com chave <= key."""
+        index = self._pos.get(item)
+        if index is None:
+            index = len(self._keys)
+            self._keys.append(key)
+            self._items.append(item)
+        elif key < self._keys[index]:
+            self._keys[index] = key
+        else:
+            return False
+        self._sift_up(index, item, key)
+        return True
+
+    def pop(self) -> Tuple[float, Any]:
+        keys, items, pos = self._keys, self._items, self._pos
+        top_key, top_item = keys[0], items[0]
+        del pos[top_item]
+        last_key, last_item = keys.pop(), items.pop()
+        if keys:
+            self._sift_down(0, last_item, last_key)
+        return top_key, top_item
+
+    def peek_key(self) -> float:
+        return self._keys[0]
+
+    def key(self, item) -> float:
+        return self._keys[self._pos[item]]
+
+    def __contains__(self, item) -> bool:
+        return item in self._pos
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _sift_up(self, index: int, item, key: float):
+        keys, items, pos = self._keys, self._items, self._pos
+        while index > 0:
+            parent = (index - 1) >> 1
+            if keys[parent] <= key:
+                break
+            keys[index] = keys[parent]
+            items[index] = items[parent]
+            pos[items[index]] = index
+            index = parent
+        keys[index] = key
+        items[index] = item
+        pos[item] = index
+
+    def _sift_down(self, index: int, item, key: float):
+        keys, items, pos = self._keys, self._items, self._pos
+        size = len(keys)
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[child + 1] < keys[child]:
+                child += 1
+            if keys[child] >= key:
+                break
+            keys[index] = keys[child]
+            items[index] = items[child]
+            pos[items[index]] = index
+            index = child
+        keys[index] = key
+        items[index] = item
+        pos[item] = index
+
+class _Block:
+    __slots__ = ('items', 'upper')
+
+    def __init__(self, upper: float, items: Optional[Dict[Any, float]] = None):
+        self.items: Dict[Any, float] = items if items is not None else {}
+        self.upper = upper
 
 class BatchQueue:
+    """
+    Estrutura D do Lemma 3.3 do artigo: duas sequências de blocos com até M itens.
+
+    * D0 recebe os blocos de `batch_prepend` (valores menores que tudo o que já está em D).
+    * D1 recebe os `insert`, com blocos ordenados pelo seu limite superior.
+
+    `pull` devolve no máximo M vértices de menor distância e um limite que os separa
+    do resto, sem nunca ordenar a fila inteira.
+    """
     def __init__(self):
-        self.priority_queue = []
         self.bound = float('inf')
-        self.m_parameter = float('inf')
+        self.m_parameter = 1
+        self._prepended: List[_Block] = []  # D0: o fim da lista é a frente da fila
+        self._blocks: List[_Block] = []     # D1: ordenado por 'upper'
+        self._uppers: List[float] = []
+        self._location: Dict[Any, _Block] = {}
 
     def initialize(self, m: float, bound: float):
-        # MODO POWER: Ignoramos o 'm' calculado e usamos o bound total.
-        # Isto garante robustez máxima em grafos complexos ou pequenos.
-        self.m_parameter = bound 
+        self.m_parameter = max(1, m)
         self.bound = bound
-        self.priority_queue = [] 
+        # Esvazia em vez de realocar: a fila pode vir do pool de um nível e ser reutilizada
+        self._prepended.clear()
+        # O último bloco de D1 tem sempre limite 'bound' e nunca é removido
+        self._blocks.clear()
+        self._blocks.append(_Block(bound))
+        self._uppers.clear()
+        self._uppers.append(bound)
+        self._location.clear()
 
     def insert(self, vertex, dist: float):
-        if dist < self.bound:
-            heapq.heappush(self.priority_queue, (dist, vertex))
+        if dist >= self.bound or not self._discard_if_worse(vertex, dist):
+            return
+
+        index = bisect_left(self._uppers, dist)
+        block = self._blocks[index]
+        block.items[vertex] = dist
+        self._location[vertex] = block
+        if len(block.items) > self.m_parameter:
+            self._split_block(index)
+
+    def batch_prepend(self, items: Iterable[Tuple[Any, float]]):
+        best: Dict[Any, float] = {}
+        for vertex, dist in items:
+            if dist < best.get(vertex, self.bound):
+                best[vertex] = dist
+        fresh = sorted(
+            ((v, d) for v, d in best.items() if self._discard_if_worse(v, d)),
+            key=itemgetter(1),
+        )
+        if not fresh:
+            return
+
+        # Até M itens cabem num bloco; acima disso, blocos de M/2 já ordenados entre si
+        chunk = len(fresh) if len(fresh) <= self.m_parameter else max(1, self.m_parameter // 2)
+        chunks = [fresh[i:i + chunk] for i in range(0, len(fresh), chunk)]
+        for part in reversed(chunks):
+            block = _Block(part[-1][1], dict(part))
+            self._prepended.append(block)
+            for vertex in block.items:
+                self._location[vertex] = block
 
     def pull(self) -> Tuple[float, Set]:
         if self.is_empty():
             return self.bound, set()
 
-        # Puxa tudo até ao limite global (comportamento atómico)
-        batch_limit = self.bound
-        
-        batch_sources = set()
-        while self.priority_queue and self.priority_queue[0][0] < batch_limit:
-            dist, vertex = heapq.heappop(self.priority_queue)
-            batch_sources.add(vertex)
-        
-        return batch_limit, batch_sources
+        limit = self.m_parameter
+        if len(self._location) <= limit:
+            batch_sources = set(self._location)
+            self.initialize(self.m_parameter, self.bound)
+            return self.bound, batch_sources
+
+        # Só os primeiros blocos de cada sequência podem conter os M menores
+        candidates = self._prefix_values(reversed(self._prepended), limit)
+        candidates += self._prefix_values(self._blocks, limit)
+        edge_value = heapq.nsmallest(limit, candidates)[-1]
+
+        below, ties = [], []
+        for block in self._blocks_up_to(edge_value):
+            for vertex, dist in block.items.items():
+                if dist < edge_value:
+                    below.append(vertex)
+                elif dist == edge_value:
+                    ties.append(vertex)
+
+        # Empates no valor de corte não podem ficar dos dois lados do limite devolvido
+        if len(below) + len(ties) <= limit:
+            chosen = below + ties
+        else:
+            chosen = below or ties
+
+        for vertex in chosen:
+            self._remove(vertex)
+        return self._min_value(), set(chosen)
 
     def is_empty(self) -> bool:
-        return len(self.priority_queue) == 0
\ No newline at end of file
+        return len(self._location) == 0
+
+    def __len__(self) -> int:
+        return len(self._location)
+
+    # --- Auxiliares ---
+
+    def _discard_if_worse(self, vertex, dist: float) -> bool:
+        """Remove a entrada antiga de 'vertex' se 'dist' for melhor; False se não for."""
+        block = self._location.get(vertex)
+        if block is None:
+            return True
+        if block.items[vertex] <= dist:
+            return False
+        self._remove(vertex)
+        return True
+
+    def _remove(self, vertex):
+        block = self._location.pop(vertex)
+        del block.items[vertex]
+        if block.items:
+            return
+        if block is self._blocks[-1]:
+            return
+        if self._prepended and block is self._prepended[-1]:
+            self._prepended.pop()
+            return
+        for sequence in (self._prepended, self._blocks):
+            for index, candidate in enumerate(sequence):
+                if candidate is block:
+                    del sequence[index]
+                    if sequence is self._blocks:
+                        del self._uppers[index]
+                    return
+
+    def _split_block(self, index: int):
+        block = self._blocks[index]
+        ordered = sorted(block.items.items(), key=itemgetter(1))
+        half = len(ordered) // 2
+        lower = _Block(ordered[half - 1][1], dict(ordered[:half]))
+        block.items = dict(ordered[half:])
+        for vertex in lower.items:
+            self._location[vertex] = lower
+        self._blocks.insert(index, lower)
+        self._uppers.insert(index, lower.upper)
+
+    @staticmethod
+    def _prefix_values(blocks: Iterable[_Block], limit: float) -> List[float]:
+        values: List[float] = []
+        for block in blocks:
+            if len(values) >= limit:
+                break
+            values.extend(block.items.values())
+        return values
+
+    def _blocks_up_to(self, value: float) -> Iterable[_Block]:
+        """Blocos (de D0 e D1) que podem conter itens <= value."""
+        for sequence in (reversed(self._prepended), self._blocks):
+            for block in sequence:
+                if not block.items or min(block.items.values()) > value:
+                    break
+                yield block
+
+    def _min_value(self) -> float:
+        best = self.bound
+        for sequence in (reversed(self._prepended), self._blocks):
+            for block in sequence:
+                if block.items:
+                    best = min(best, min(block.items.values()))
+                    break
+        return best
@@ -0,0 +1,64 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .csr import CSRGraph
+
+
+class FrontierRelaxer:
+    """
+    Relaxamento vetorizado (NumPy) das arestas de saída de um conjunto inteiro de vértices.
+
+    Em vez de uma chamada Python por aresta, junta todas as arestas da fronteira num
+    só array, calcula as distâncias candidatas, faz o scatter-min em `dist` (float64,
+    indexado pelo id do CSRGraph) e separa os vértices melhorados com máscaras.
+    """
+
+    def __init__(self, graph: CSRGraph):
+        self.offsets = np.frombuffer(graph.offsets, dtype=np.int64)
+        self.targets = np.frombuffer(graph.targets, dtype=np.int64)
+        self.weights = np.frombuffer(graph.weights, dtype=np.float64)
+
+    def gather(self, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Devolve (origem, destino, peso) de todas as arestas que saem de 'frontier'."""
+        starts = self.offsets[frontier]
+        counts = self.offsets[frontier + 1] - starts
+        total = int(counts.sum())
+        # Posição de cada aresta no CSR: início do seu bloco + deslocamento dentro dele
+        shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        edge_index = np.arange(total, dtype=np.int64) + shift
+        return np.repeat(frontier, counts), self.targets[edge_index], self.weights[edge_index]
+
+    def relax(self, dist: np.ndarray, frontier: np.ndarray, batch_bound: float, rec_bound: float,
+              global_bound: float, pred: Optional[np.ndarray] = None,
+              owner: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Relaxa as arestas da fronteira com a regra '<=' do artigo e devolve
+        (ids para insert, distâncias desses ids, ids para o batch_prepend).
+        Com 'pred', grava o pai dos vértices com melhoria estrita; com 'owner', esses
+        vértices herdam a fonte dona do pai.
+        """
+        tails, heads, weights = self.gather(frontier)
+        candidates = dist[tails] + weights
+
+        # Scatter-min: ordena por (destino, candidata); a ordenação estável mantém a primeira
+        # aresta entre empates, tal como o caminho escalar
+        order = np.lexsort((candidates, heads))
+        heads, tails, candidates = heads[order], tails[order], candidates[order]
+        first = np.ones(len(heads), dtype=bool)
+        first[1:] = heads[1:] != heads[:-1]
+        unique_heads, parents, best = heads[first], tails[first], candidates[first]
+
+        current = dist[unique_heads]
+        improved = best <= current
+        strict = best < current
+        if pred is not None:
+            pred[unique_heads[strict]] = parents[strict]
+        if owner is not None:
+            owner[unique_heads[strict]] = owner[parents[strict]]
+        unique_heads, best = unique_heads[improved], best[improved]
+        dist[unique_heads] = best
+
+        insert_mask = (batch_bound <= best) & (best < global_bound)
+        prepend_mask = (rec_bound <= best) & (best < batch_bound)
+        return unique_heads[insert_mask], best[insert_mask], unique_heads[prepend_mask]
@@ -0,0 +1,59 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from benchmarks.generators import GENERATORS
+from benchmarks.run import main, run_benchmarks
+from benchmarks.adjacency import run_adjacency
+
+class TestBenchmarks(unittest.TestCase):
+    def test_geradores_reprodutiveis(self):
+        for family, generate in GENERATORS.items():
+            a, b = generate(500, 7), generate(500, 7)
+            self.assertEqual(list(a.targets), list(b.targets), msg=family)
+            self.assertEqual(list(a.weights), list(b.weights), msg=family)
+            self.assertGreater(a.num_edges, 0)
+
+    def test_bmssp_coincide_com_dijkstra(self):
+        configs = [{'k': 2, 't': 1, 'level': None}, {'k': 8, 't': 2, 'level': 1}]
+        report = run_benchmarks(list(GENERATORS), [400], configs, seed=3, isolate=False)
+        runs = [r for r in report['results'] if r['algorithm'] == 'bmssp']
+        self.assertEqual(len(runs), len(GENERATORS) * len(configs))
+        for record in runs:
+            self.assertTrue(record['matches_dijkstra'], msg=record)
+            self.assertGreater(record['wall_s'], 0)
+
+    def test_relatorio_json_via_linha_de_comando(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'bench.json')
+            code = main(['--families', 'chain', '--sizes', '2e2', '--config', 'k=3,t=1', '--no-isolate', '--output', output])
+            with open(output, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        self.assertEqual(code, 0)
+        self.assertEqual([r['algorithm'] for r in report['results']], ['dijkstra', 'bmssp'])
+        self.assertEqual(report['results'][1]['edges'], 200)
+        self.assertIn('peak_rss_kb', report['results'][1])
+        # Na cadeia o Dijkstra lê cada aresta uma vez; o BMSSP com k pequeno volta a relaxar arestas
+        dijkstra, bmssp = report['results']
+        self.assertEqual(dijkstra['relaxations'], 200)
+        self.assertGreater(bmssp['relaxations'], dijkstra['relaxations'])
+        self.assertAlmostEqual(bmssp['relaxations_per_s'], bmssp['relaxations'] / bmssp['wall_s'])
+
+    def test_adjacencias_contra_dicionario_de_listas(self):
+        report = run_adjacency(2000, repeat=1)
+        self.assertEqual([r['graph'] for r in report['results']], ['dict_of_lists', 'simple_graph', 'simple_graph_cached'])
+        for record in report['results']:
+            self.assertGreater(record['solve_s'], 0)
+        # Por omissão (sem cache) os arrays compactos ocupam menos do que o dicionário de listas,
+        # mesmo depois de ler todas as adjacências
+        self.assertLess(report['results'][1]['warm_memory_vs_dict'], 1.0)
+        self.assertGreater(report['results'][2]['warm_bytes'], report['results'][2]['rest_bytes'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import json
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.structures import SimpleGraph
+from src.session import SolverSession
+from src.cache import TreeCache
+
+class TestTreeCache(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join(BASE_DIR, 'data', 'cenario_complexo.json'), 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+        self.graph = SimpleGraph()
+        for e in self.data['edges']:
+            self.graph.add_edge(e['u'], e['v'], e['w'])
+        self.nodes = self.data['nodes']
+
+    def test_respostas_iguais_a_uma_consulta_nova(self):
+        cache = TreeCache(self.graph, {'k': 3, 't': 1})
+        session = SolverSession(self.graph, {'k': 3, 't': 1})
+        for source in self.nodes[:5]:
+            session.solve({source})
+            for target in self.nodes:
+                self.assertEqual(cache.distance(source, target), session.distance(target))
+                expected = session.path_to(target)
+                self.assertEqual(cache.path(source, target), expected)
+        self.assertEqual(cache.misses, 5)
+        self.assertEqual(cache.hits, 5 * (2 * len(self.nodes)) - 5)
+        self.assertEqual(cache.path("A", "F"), ['A', 'B', 'C', 'D', 'F'])
+
+    def test_lru_respeita_o_orcamento(self):
+        tree_bytes = len(self.nodes) * 16
+        cache = TreeCache(self.graph, max_bytes=2 * tree_bytes)
+        cache.distance("A", "F")
+        cache.distance("B", "F")
+        cache.distance("A", "F")   # A passa a ser a mais recente
+        cache.distance("C", "F")   # expulsa B
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (1, 3, 1))
+        self.assertIn("A", cache)
+        self.assertNotIn("B", cache)
+        self.assertLessEqual(cache.bytes_used, cache.max_bytes)
+
+        tiny = TreeCache(self.graph, max_bytes=tree_bytes - 1)
+        self.assertEqual(tiny.distance("A", "F"), 20.0)
+        self.assertEqual(len(tiny), 0)
+
+    def test_alteracao_do_grafo_invalida(self):
+        cache = TreeCache(self.graph)
+        self.assertEqual(cache.distance("A", "F"), 20.0)
+        self.graph.set_weight("A", "B", 100.0)
+        self.assertNotIn("A", cache)
+        self.assertGreater(cache.distance("A", "F"), 20.0)
+        self.assertEqual(cache.stats()['invalidations'], 1)
+
+        # Nó novo ligado ao grafo: a sessão ganha um slot a mais
+        self.graph.add_edge("F", "NOVO", 1.0)
+        self.assertEqual(cache.distance("A", "NOVO"), cache.distance("A", "F") + 1.0)
+        self.assertEqual(cache.path("A", "NOVO")[-2:], ["F", "NOVO"])
+
+    def test_no_novo_com_nos_isolados_da_criacao(self):
+        cache = TreeCache(self.graph, {'k': 3, 't': 1}, nodes=self.nodes + ["ILHA"])
+        self.assertEqual(cache.distance("A", "ILHA"), float('inf'))
+        session = cache.session
+        self.graph.add_node("SOLTO")
+        self.assertNotIn("A", cache)
+        self.assertEqual(cache.distance("A", "SOLTO"), float('inf'))
+        self.assertEqual(cache.distance("ILHA", "ILHA"), 0.0)
+        self.assertEqual(cache.distance("A", "F"), 20.0)
+        self.assertIs(cache.session, session)
+        self.assertEqual(len(cache.tree("A").dist), self.graph.num_nodes)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import json
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.structures import SimpleGraph
+from src.csr import CSRGraph
+from src.solver import BoundedMultiSourceShortestPath
+
+class TestCSRGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = SimpleGraph()
+        for u, v, w in [("A", "B", 4), ("B", "D", 2), ("A", "C", 20), ("B", "C", 8), ("C", "D", 7)]:
+            self.graph.add_edge(u, v, w)
+
+    def test_mesma_adjacencia_que_simple_graph(self):
+        csr = CSRGraph.from_simple_graph(self.graph)
+        self.assertEqual(csr.num_nodes, 4)
+        self.assertEqual(csr.num_edges, 5)
+        for node in self.graph.edges:
+            self.assertEqual(csr.get_outgoing_edges(node), self.graph.get_outgoing_edges(node))
+            self.assertCountEqual(csr.get_incoming_edges(node), self.graph.get_incoming_edges(node))
+        self.assertEqual(dict(csr.edges), self.graph.edges)
+
+    def test_from_edges_com_nos_isolados(self):
+        csr = CSRGraph.from_edges([("A", "B", 1.5)], nodes=["Z", "A"])
+        self.assertEqual(csr.labels, ("Z", "A", "B"))
+        self.assertEqual(csr.get_outgoing_edges("Z"), [])
+        self.assertEqual(csr.get_outgoing_edges("inexistente"), [])
+        self.assertEqual(list(csr.offsets), [0, 0, 1, 1])
+        self.assertEqual(csr.label_of(csr.id_of("B")), "B")
+
+    def test_imutavel(self):
+        csr = CSRGraph.from_simple_graph(self.graph)
+        with self.assertRaises(AttributeError):
+            csr.add_edge("A", "D", 1)
+        with self.assertRaises(AttributeError):
+            csr._labels = []
+        with self.assertRaises(TypeError):
+            csr.weights[0] = 0.0
+
+    def test_solver_roda_sobre_csr(self):
+        for json_file in ('cenario_simples.json', 'cenario_complexo.json'):
+            with open(os.path.join(BASE_DIR, 'data', json_file), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            tp = data['test_params']
+            csr = CSRGraph.from_edges(((e['u'], e['v'], e['w']) for e in data['edges']), nodes=data['nodes'])
+
+            dist_map = {node: float('inf') for node in data['nodes']}
+            dist_map[tp['start_node']] = 0.0
+            solver = BoundedMultiSourceShortestPath(csr, dist_map, tp['constants'])
+            solver.bmssp(level=tp['level'], bound=tp['bound'], sources={tp['start_node']})
+            self.assertAlmostEqual(dist_map[tp['target_node']], tp['expected_cost'], places=4)
+
+if __name__ == "__main__":
+    unittest.main()
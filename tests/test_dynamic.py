@@ -0,0 +1,97 @@
+import unittest
+import heapq
+import os
+import random
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.dynamic import DynamicShortestPaths
+from src.structures import EdgeChange, SimpleGraph
+
+def reference_dijkstra(graph, nodes, sources):
+    dist = {node: float('inf') for node in nodes}
+    pq = []
+    for source in sources:
+        dist[source] = 0.0
+        pq.append((0.0, source))
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]: continue
+        for v, w in graph.get_outgoing_edges(u):
+            if d + w < dist[v]:
+                dist[v] = d + w
+                heapq.heappush(pq, (d + w, v))
+    return dist
+
+class TestSimpleGraphUpdates(unittest.TestCase):
+    def test_apply_updates(self):
+        graph = SimpleGraph()
+        graph.add_edges([("A", "B", 1.0), ("B", "C", 2.0), ("A", "C", 9.0)])
+        version = graph.version
+        changes = graph.apply_updates([("A", "B", 5.0), ("B", "C", None), ("C", "A", 1.0), ("X", "Y", None), ("A", "C", 9.0)])
+
+        self.assertEqual(changes, [EdgeChange("A", "B", 1.0, 5.0), EdgeChange("B", "C", 2.0, None), EdgeChange("C", "A", None, 1.0)])
+        self.assertGreater(graph.version, version)
+        self.assertEqual(graph.get_outgoing_edges("A"), [("B", 5.0), ("C", 9.0)])
+        self.assertEqual(graph.get_outgoing_edges("B"), [])
+        self.assertEqual(graph.get_incoming_edges("C"), [("A", 9.0)])
+        self.assertEqual(graph.num_edges, 3)
+        with self.assertRaises(KeyError):
+            graph.remove_edge("B", "C")
+
+        # A lista de B ficou vazia e a de A continua a crescer pelo fim
+        graph.add_edge("A", "D", 1.0)
+        self.assertEqual(graph.get_outgoing_edges("A"), [("B", 5.0), ("C", 9.0), ("D", 1.0)])
+
+class TestDynamicShortestPaths(unittest.TestCase):
+    def test_reparacao_igual_a_recalculo_completo(self):
+        for seed in range(150):
+            rng = random.Random(seed)
+            n = rng.randint(2, 30)
+            graph = SimpleGraph()
+            for node in range(n):
+                graph.add_node(node)
+            for _ in range(rng.randint(0, 4 * n)):
+                graph.add_edge(rng.randrange(n), rng.randrange(n), float(rng.randint(0, 5)))
+            sources = {0} if rng.random() < 0.7 else {0, n - 1}
+
+            dynamic = DynamicShortestPaths(graph, sources, {'k': rng.randint(1, 4), 't': rng.randint(1, 3)})
+            dynamic.solve()
+            for _ in range(5):
+                batch = [(rng.randrange(n), rng.randrange(n), rng.choice([None, float(rng.randint(0, 8))]))
+                         for _ in range(rng.randint(1, 6))]
+                dynamic.apply(batch)
+
+                expected = reference_dijkstra(graph, range(n), sources)
+                self.assertEqual(dynamic.dist, expected, msg=f"seed={seed}")
+                for child, parent in dynamic.pred.items():
+                    self.assertIn(dynamic.dist[child], [dynamic.dist[parent] + w for v, w in graph.get_outgoing_edges(parent) if v == child])
+                    self.assertIn(dynamic.path_to(child)[0], sources)
+
+    def test_custo_proporcional_a_regiao_afetada(self):
+        # Estrela de cadeias: mudar a ponta de uma cadeia não toca nas outras
+        graph = SimpleGraph()
+        for chain in range(20):
+            previous = "S"
+            for i in range(50):
+                node = (chain, i)
+                graph.add_edge(previous, node, 1.0)
+                previous = node
+        dynamic = DynamicShortestPaths(graph, {"S"})
+        dynamic.solve()
+
+        result = dynamic.apply([((3, 44), (3, 45), 10.0)])
+        self.assertEqual(result.invalidated, 5)
+        self.assertEqual(result.settled, 5)
+        self.assertEqual(dynamic.distance((3, 49)), 59.0)
+
+        result = dynamic.apply([("S", (7, 40), 2.0)])
+        self.assertEqual(result.settled, 10)
+        self.assertEqual(dynamic.distance((7, 49)), 11.0)
+        self.assertEqual(dynamic.path_to((7, 41)), ["S", (7, 40), (7, 41)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.structures import SimpleGraph
+from src.csr import CSRGraph
+from src.session import SolverSession
+from src.export import compute_layout, export_route, extract_subgraph
+
+def grid(width, height):
+    graph = SimpleGraph()
+    for y in range(height):
+        for x in range(width):
+            if x + 1 < width:
+                graph.add_edge((x, y), (x + 1, y), 1.0)
+            if y + 1 < height:
+                graph.add_edge((x, y), (x, y + 1), 2.0)
+    return graph
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.graph = grid(60, 60)
+        self.session = SolverSession(self.graph)
+        self.result = self.session.query((0, 0), (5, 0))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_vizinhanca_por_saltos_e_por_raio(self):
+        path = self.result.path
+        self.assertEqual(len(path), 6)
+        one_hop = extract_subgraph(self.graph, self.session.distances, path, hops=1)
+        # Rota (6) + os vizinhos de baixo (6) + (6, 0) à direita
+        self.assertEqual(len(one_hop.nodes), 13)
+        self.assertEqual(one_hop.path_edges, set(zip(path, path[1:])))
+        self.assertTrue(all(u in one_hop.dist and v in one_hop.dist for u, v, _ in one_hop.edges))
+
+        by_radius = extract_subgraph(self.graph, self.session.distances, path, hops=0, radius=2.0)
+        self.assertEqual(set(by_radius.nodes), set(path) | {(6, 0), (7, 0)} | {(x, 1) for x in range(6)})
+
+        capped = extract_subgraph(self.graph, self.session.distances, path, hops=50, max_nodes=20)
+        self.assertEqual(len(capped.nodes), 20)
+        self.assertTrue(set(path) <= set(capped.nodes))
+
+    def test_csr_so_monta_o_inverso_com_undirected(self):
+        graph = CSRGraph.from_simple_graph(self.graph)
+        path = [(3, 3), (4, 3)]
+        out_only = extract_subgraph(graph, {}, path, hops=1)
+        self.assertIsNone(graph._reverse)
+        self.assertEqual(set(out_only.nodes), set(path) | {(5, 3), (3, 4), (4, 4)})
+
+        both = extract_subgraph(graph, {}, path, hops=1, undirected=True)
+        self.assertIsNotNone(graph._reverse)
+        self.assertEqual(set(both.nodes) - set(out_only.nodes), {(2, 3), (3, 2), (4, 2)})
+
+    def test_layout_poe_a_rota_numa_linha(self):
+        subgraph = extract_subgraph(self.graph, self.session.distances, self.result.path, hops=2)
+        layout = compute_layout(subgraph)
+        self.assertEqual(set(layout), set(subgraph.nodes))
+        self.assertEqual({layout[node][1] for node in self.result.path}, {0.0})
+        self.assertEqual(len(set(layout.values())), len(layout))
+
+    def test_formatos(self):
+        path = self.result.path
+        geo = os.path.join(self.tmp.name, 'rota.geojson')
+        subgraph = export_route(self.graph, self.session.distances, path, geo)
+        with open(geo, encoding='utf-8') as f:
+            features = json.load(f)['features']
+        self.assertEqual(len(features), len(subgraph.nodes) + len(subgraph.edges))
+        self.assertEqual(sum(1 for ft in features if ft['geometry']['type'] == 'LineString' and ft['properties']['route']),
+                         len(path) - 1)
+
+        lines = os.path.join(self.tmp.name, 'sub', 'rota.jsonl')
+        export_route(self.graph, self.session.distances, path, lines, hops=0)
+        with open(lines, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r['type'] for r in records], ['node'] * 6 + ['edge'] * 5)
+
+        html = os.path.join(self.tmp.name, 'rota.html')
+        export_route(self.graph, self.session.distances, path, html, title="Rota")
+        with open(html, encoding='utf-8') as f:
+            content = f.read()
+        self.assertIn('"physics": false', content)
+        self.assertIn('Rota', content)
+
+        with self.assertRaises(ValueError):
+            export_route(self.graph, self.session.distances, path, os.path.join(self.tmp.name, 'rota.png'))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.csr import CSRGraph
+from src.instrumentation import Tracer
+from src.loaders import read_json_graph
+from src.solver import BoundedMultiSourceShortestPath
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        edges, data = read_json_graph(os.path.join(BASE_DIR, 'data', 'cenario_complexo.json'))
+        self.graph = edges.to_simple_graph()
+        self.nodes = data['nodes']
+
+    def solve(self, **options):
+        dist_map = {node: float('inf') for node in self.nodes}
+        dist_map['A'] = 0.0
+        solver = BoundedMultiSourceShortestPath(self.graph, dist_map, {'k': 2, 't': 1}, **options)
+        solver.solve({'A'}, level=3)
+        return solver, dist_map
+
+    def test_desligada_por_omissao(self):
+        solver, _ = self.solve()
+        self.assertIsNone(solver.stats)
+        # Sem instrumentação os métodos do motor de frames ficam os da classe
+        for name in ('_open_frame', '_close_frame', '_handle_base_case'):
+            self.assertNotIn(name, vars(solver))
+
+        instrumented, _ = self.solve(instrument=True)
+        self.assertIn('_open_frame', vars(instrumented))
+
+    def test_contadores_nao_mudam_o_resultado(self):
+        _, expected = self.solve()
+        solver, dist_map = self.solve(instrument=True)
+        self.assertEqual(dist_map, expected)
+
+        stats = solver.stats
+        self.assertEqual(sorted(stats.levels), [0, 1, 2, 3])
+        self.assertEqual(stats.levels[3].calls, 1)
+        self.assertGreater(stats.levels[1].pulls, 0)
+        self.assertGreater(stats.levels[1].max_batch, 0)
+        self.assertGreater(stats.relax_attempts, 0)
+        self.assertLessEqual(stats.relax_successes, stats.relax_attempts)
+        self.assertLessEqual(stats.max_heap_size, len(self.nodes))
+        self.assertGreater(stats.pivot_calls, 0)
+        json.dumps(stats.to_dict())
+
+    def test_modo_vetorizado(self):
+        csr = CSRGraph.from_simple_graph(self.graph, nodes=self.nodes)
+        dist = np.full(csr.num_nodes, np.inf)
+        dist[csr.id_of('A')] = 0.0
+        solver = BoundedMultiSourceShortestPath(csr, dist, {'k': 2, 't': 1}, vectorized=True, instrument=True)
+        solver.solve({csr.id_of('A')}, level=2)
+        self.assertGreater(solver.stats.relax_attempts, 0)
+
+    def test_exporta_chrome_trace(self):
+        tracer = Tracer()
+        solver, _ = self.solve(tracer=tracer)
+        self.assertIsNotNone(solver.stats)
+        names = {event['name'] for event in tracer.events}
+        self.assertTrue({'bmssp L3', 'bmssp L0', 'find_pivots'} <= names)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.json')
+            tracer.write_chrome_trace(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                trace = json.load(f)
+        top = [e for e in trace['traceEvents'] if e['name'] == 'bmssp L3']
+        self.assertEqual(len(top), 1)
+        self.assertTrue(all(e['ph'] == 'X' and e['dur'] >= 0 for e in trace['traceEvents']))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import os
+import random
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.structures import SimpleGraph
+from src.csr import CSRGraph
+from src.session import SolverSession
+from src.landmarks import LandmarkIndex
+
+def road_grid(width, height, seed):
+    """Malha com ruas nos dois sentidos e pesos inteiros aleatórios, como uma rede viária."""
+    rng = random.Random(seed)
+    graph = SimpleGraph()
+    for y in range(height):
+        for x in range(width):
+            for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+                if 0 <= x + dx < width and 0 <= y + dy < height:
+                    graph.add_edge((x, y), (x + dx, y + dy), float(rng.randint(1, 10)))
+    return graph
+
+class TestLandmarkIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_limites_inferiores_validos(self):
+        rng = random.Random(7)
+        graph = SimpleGraph()
+        for node in range(30):
+            graph.add_node(node)
+        for _ in range(80):
+            graph.add_edge(rng.randrange(30), rng.randrange(30), float(rng.randint(0, 9)))
+        index = LandmarkIndex.build(graph, count=4, method='farthest')
+        session = SolverSession(graph)
+        for source in range(30):
+            session.solve({source})
+            for target in range(30):
+                self.assertLessEqual(index.lower_bound(source, target), session.distance(target))
+
+    def test_consulta_a_estrela_exata_e_mais_focada(self):
+        graph = road_grid(30, 30, seed=1)
+        session = SolverSession(graph)
+        rng = random.Random(2)
+        for method in ('farthest', 'avoid'):
+            index = LandmarkIndex.build(graph, count=6, method=method)
+            self.assertEqual(len(index.landmarks), 6)
+            plain = goal = 0
+            for _ in range(15):
+                source, target = rng.choice(graph.labels), rng.choice(graph.labels)
+                expected = session.query(source, target)
+                result = index.query(source, target)
+                self.assertEqual(result.distance, expected.distance, msg=(method, source, target))
+                self.assertEqual((result.path[0], result.path[-1]), (source, target))
+                plain += expected.settled
+                goal += result.settled
+            self.assertLess(goal * 3, plain, msg=method)
+
+    def test_alvo_inalcancavel(self):
+        graph = CSRGraph.from_edges([("A", "B", 1.0), ("C", "A", 2.0)])
+        index = LandmarkIndex.build(graph, count=2)
+        result = index.query("A", "C")
+        self.assertEqual((result.distance, result.path), (float('inf'), None))
+        self.assertEqual(index.query("C", "B").distance, 3.0)
+
+    def test_persistencia(self):
+        graph = road_grid(8, 8, seed=3)
+        index = LandmarkIndex.build(graph, count=3)
+        path = os.path.join(self.tmp.name, 'alt.bin')
+        index.save(path)
+
+        loaded = LandmarkIndex.load(path, graph)
+        self.assertEqual(loaded.landmarks, index.landmarks)
+        self.assertEqual(loaded.forward, index.forward)
+        self.assertEqual(loaded.backward, index.backward)
+        self.assertEqual(loaded.query((0, 0), (7, 7)).distance, index.query((0, 0), (7, 7)).distance)
+
+        with self.assertRaises(ValueError):
+            LandmarkIndex.load(path, road_grid(4, 4, seed=3))
+        # Mesma forma (n e m iguais), outros pesos: os limites gravados já não são válidos
+        with self.assertRaises(ValueError):
+            LandmarkIndex.load(path, road_grid(8, 8, seed=4))
+        graph.set_weight((0, 0), (1, 0), graph.get_outgoing_edges((0, 0))[0][1] + 1.0)
+        with self.assertRaises(ValueError):
+            LandmarkIndex.load(path, graph)
+        self.assertEqual(len(LandmarkIndex.load(path, road_grid(8, 8, seed=3)).landmarks), 3)
+
+if __name__ == "__main__":
+    unittest.main()
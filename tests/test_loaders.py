@@ -0,0 +1,104 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src import loaders
+from src.loaders import iter_json_graph, read_json_graph, read_edge_list
+from src.csr import CSRGraph
+from main import load_graph_data
+
+class TestLoaders(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_streaming_igual_ao_json_load(self):
+        for json_file in ('cenario_simples.json', 'cenario_complexo.json'):
+            path = os.path.join(BASE_DIR, 'data', json_file)
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # Blocos minúsculos forçam valores (e números) cortados na fronteira do bloco
+            for chunk_size in (1, 7, 1 << 20):
+                edges = [value for key, value in iter_json_graph(path, chunk_size) if key == 'edges']
+                self.assertEqual(edges, data['edges'])
+
+            arrays, extra = read_json_graph(path)
+            self.assertEqual(extra['nodes'], data['nodes'])
+            self.assertEqual(extra['test_params'], data['test_params'])
+            self.assertEqual(len(arrays), len(data['edges']))
+            self.assertEqual(arrays.labels[:len(data['nodes'])], data['nodes'])
+
+    def test_valor_grande_lido_em_blocos_crescentes(self):
+        nodes = [f"N{i}" for i in range(20000)]
+        path = self.write('big.json', json.dumps({'nodes': nodes, 'edges': [{'u': 'N0', 'v': 'N1', 'w': 1}]}))
+        _JsonStream = loaders._JsonStream
+        fills = []
+        original = _JsonStream._fill
+
+        def counting_fill(stream, size=None):
+            fills.append(size)
+            return original(stream, size)
+
+        _JsonStream._fill = counting_fill
+        try:
+            pairs = list(iter_json_graph(path, chunk_size=64))
+        finally:
+            _JsonStream._fill = original
+        self.assertEqual(pairs[0], ('nodes', nodes))
+        # Sem crescimento geométrico seriam milhares de releituras do valor desde o início
+        self.assertLess(len(fills), 40)
+
+    def test_main_escala_pesos_decimais(self):
+        path = self.write('decimais.json', json.dumps({
+            "nodes": ["A", "B", "C", "D"],
+            "edges": [{"u": "A", "v": "B", "w": 0.1}, {"u": "B", "v": "C", "w": 0.2}, {"u": "C", "v": "D", "w": 0.3}]}))
+        graph, nodes, solver_graph, scale = load_graph_data(path)
+        self.assertEqual((nodes, scale), (["A", "B", "C", "D"], 10))
+        self.assertEqual(graph.get_outgoing_edges("A"), [("B", 0.1)])
+        self.assertEqual(solver_graph.get_outgoing_edges("C"), [("D", 3.0)])
+        self.assertEqual(load_graph_data(os.path.join(BASE_DIR, 'data', 'cenario_complexo.json'))[3], 1)
+
+    def test_json_com_chaves_em_qualquer_ordem(self):
+        path = self.write('g.json', '{"meta": {"x": [1, 2]}, "edges": [{"u": "A", "v": "B", "w": 12.5}], "nodes": []}')
+        arrays, extra = read_json_graph(path)
+        self.assertEqual(extra, {'meta': {'x': [1, 2]}, 'nodes': []})
+        self.assertEqual(list(arrays.weights), [12.5])
+
+        with self.assertRaises(ValueError):
+            read_json_graph(self.write('bad.json', '{"edges": [{"u": "A", "v": "B", "w": 1} {"u": "B", "v": "A", "w": 1}]}'))
+
+    def test_lista_de_arestas_csv_e_tsv(self):
+        csv_path = self.write('g.csv', 'u,v,w\nA,B,4\nB,C,2.5\n\n# comentário\nA,C,9\n')
+        tsv_path = self.write('g.tsv', 'A\tB\t4\nB\tC\t2.5\nA\tC\t9\n')
+        for path in (csv_path, tsv_path):
+            csr = read_edge_list(path).to_csr()
+            self.assertEqual(csr.labels, ('A', 'B', 'C'))
+            self.assertEqual(csr.get_outgoing_edges('A'), [('B', 4.0), ('C', 9.0)])
+
+        with self.assertRaises(ValueError):
+            read_edge_list(self.write('bad.csv', 'A,B,1\nA,B\n'))
+
+    def test_from_arrays_igual_a_from_edges(self):
+        triples = [("A", "B", 1.0), ("C", "A", 2.0), ("A", "C", 3.0)]
+        expected = CSRGraph.from_edges(triples)
+        csr = CSRGraph.from_arrays(["A", "B", "C"], [0, 2, 0], [1, 0, 2], [1.0, 2.0, 3.0])
+        self.assertEqual(dict(csr.edges), dict(expected.edges))
+        with self.assertRaises(ValueError):
+            CSRGraph.from_arrays(["A"], [0], [], [])
+
+if __name__ == "__main__":
+    unittest.main()
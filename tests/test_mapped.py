@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.csr import CSRGraph
+from src.loaders import read_json_graph
+from src.mapped import MappedGraph, convert_json, write_mapped_graph
+from src.session import SolverSession
+
+class TestMappedGraph(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_conversao_preserva_o_grafo_e_as_distancias(self):
+        for json_file in ('cenario_simples.json', 'cenario_complexo.json'):
+            json_path = os.path.join(BASE_DIR, 'data', json_file)
+            edges, data = read_json_graph(json_path)
+            expected = edges.to_csr()
+            tp = data['test_params']
+
+            with convert_json(json_path, os.path.join(self.tmp.name, 'g.bin')) as graph:
+                self.assertEqual(graph.labels, expected.labels)
+                self.assertEqual(dict(graph.edges), dict(expected.edges))
+                self.assertEqual(dict(graph.reverse_edges), dict(expected.reverse_edges))
+                result = SolverSession(graph, tp['constants']).query(tp['start_node'], tp['target_node'])
+                self.assertAlmostEqual(result.distance, tp['expected_cost'], places=4)
+
+    def test_rotulos_inteiros_e_arrays_so_de_leitura(self):
+        path = os.path.join(self.tmp.name, 'int.bin')
+        write_mapped_graph(CSRGraph.from_edges([(10, 20, 1.5), (20, 30, 2.0)], nodes=[5]), path)
+        graph = MappedGraph(path)
+        self.assertEqual(graph.labels, (5, 10, 20, 30))
+        self.assertEqual(graph.get_outgoing_edges(10), [(20, 1.5)])
+        self.assertEqual(graph.index_view().get_outgoing_edges(2), [(3, 2.0)])
+        with self.assertRaises(TypeError):
+            graph.weights[0] = 0.0
+        graph.close()
+        self.assertTrue(graph._mmap.closed)
+
+    def test_ficheiro_invalido(self):
+        path = os.path.join(self.tmp.name, 'bad.bin')
+        with open(path, 'wb') as f:
+            f.write(b'x' * 64)
+        with self.assertRaises(ValueError):
+            MappedGraph(path)
+        with self.assertRaises(TypeError):
+            write_mapped_graph(CSRGraph.from_edges([(1, "B", 1.0)]), path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import heapq
+import json
+import os
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.structures import SimpleGraph
+from src.matrix import distance_matrix
+
+def reference_dijkstra(graph, source):
+    """Dijkstra com heapq, independente do solver: referência para as linhas da matriz."""
+    dist = {source: 0.0}
+    pq = [(0.0, source)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        for v, w in graph.get_outgoing_edges(u):
+            if d + w < dist.get(v, float('inf')):
+                dist[v] = d + w
+                heapq.heappush(pq, (d + w, v))
+    return dist
+
+class TestDistanceMatrix(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join(BASE_DIR, 'data', 'cenario_complexo.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.graph = SimpleGraph()
+        for e in data['edges']:
+            self.graph.add_edge(e['u'], e['v'], e['w'])
+        self.origins = ["A", "B", "N1", "K", "F"]
+        self.destinations = ["F", "D", "A", "Z"]
+
+    def expected(self):
+        rows = []
+        for origin in self.origins:
+            dist = reference_dijkstra(self.graph, origin)
+            rows.append([dist.get(v, float('inf')) for v in self.destinations])
+        return np.array(rows)
+
+    def test_matriz_no_processo_atual(self):
+        matrix = distance_matrix(self.graph, self.origins, self.destinations, {'k': 3, 't': 1}, processes=1)
+        np.testing.assert_array_equal(matrix, self.expected())
+        self.assertEqual(matrix[0, 0], 20.0)
+
+    def test_matriz_com_pool_de_processos(self):
+        matrix = distance_matrix(self.graph, self.origins, self.destinations, {'k': 3, 't': 1}, processes=2, chunk_size=1)
+        np.testing.assert_array_equal(matrix, self.expected())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import os
+import random
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.csr import CSRGraph
+from src.session import SolverSession
+from src.parallel import ParallelSolver, bfs_partition
+from benchmarks.generators import GENERATORS
+from benchmarks.parallel import run_parallel
+
+def random_graph(n, m, seed):
+    """Pesos não inteiros: as distâncias têm de coincidir bit a bit mesmo com arredondamento."""
+    rng = random.Random(seed)
+    edges = [(rng.randrange(n), rng.randrange(n), rng.uniform(0.1, 10.0)) for _ in range(m)]
+    return CSRGraph.from_edges(edges, nodes=range(n))
+
+class TestParallelSolver(unittest.TestCase):
+    def test_particao_bfs_equilibrada(self):
+        graph = GENERATORS['grid'](2000, 1)
+        owner = bfs_partition(graph, 4)
+        sizes = [list(owner).count(part) for part in range(4)]
+        self.assertEqual(sum(sizes), graph.num_nodes)
+        self.assertLessEqual(max(sizes) - min(sizes), 1)
+
+    def test_distancias_iguais_ao_solver_sequencial(self):
+        for seed in range(4):
+            graph = random_graph(300, 900, seed)
+            session = SolverSession(graph, {'k': 4, 't': 2})
+            for processes, parts, delta in ((1, 4, None), (1, 3, 0.5), (2, 3, None)):
+                with ParallelSolver(graph, processes=processes, parts=parts, delta=delta) as solver:
+                    for source in (0, 17):
+                        result = solver.solve(source)
+                        session.solve({source})
+                        expected = [session.distance(v) for v in range(graph.num_nodes)]
+                        self.assertEqual(list(result.dist), expected, msg=(seed, processes, parts, delta))
+                        # Os pais formam caminhos com exatamente essas distâncias
+                        for v, u in enumerate(result.pred):
+                            if u != -1:
+                                weight = min(w for x, w in graph.get_outgoing_edges(u) if x == v)
+                                self.assertEqual(result.dist[u] + weight, result.dist[v])
+                        if parts > 1:
+                            self.assertGreater(result.rounds, 1)
+
+    def test_dois_solvers_no_processo_atual(self):
+        first, second = random_graph(3, 4, 1), random_graph(2, 2, 2)
+        with ParallelSolver(first, processes=1, parts=2) as a, ParallelSolver(second, processes=1, parts=2) as b:
+            expected = SolverSession(first, {'k': 2, 't': 1})
+            expected.solve({0})
+            self.assertEqual(list(a.solve(0).dist), [expected.distance(v) for v in range(3)])
+            self.assertEqual(b.solve(1).dist[1], 0.0)
+            b.close()
+            self.assertEqual(a.solve(0).dist[0], 0.0)
+
+    def test_pesos_nulos_e_delta_invalido(self):
+        graph = CSRGraph.from_edges([(0, 1, 0.0), (1, 2, 0.0), (2, 0, 0.0)])
+        for processes in (1, 2):
+            with ParallelSolver(graph, processes=processes, parts=2) as solver:
+                self.assertEqual(solver.delta, float('inf'))
+                self.assertEqual(list(solver.solve(0).dist), [0.0, 0.0, 0.0])
+        for delta in (0, -1.0, float('nan')):
+            with self.assertRaises(ValueError):
+                ParallelSolver(graph, processes=1, delta=delta)
+
+    def test_relatorio_de_speedup(self):
+        report = run_parallel('grid', 800, [1, 2], repeat=1)
+        self.assertEqual([r['processes'] for r in report['results']], [1, 2])
+        for record in report['results']:
+            self.assertTrue(record['matches_sequential'], msg=record)
+            self.assertGreater(record['speedup_vs_sequential'], 0)
+        self.assertEqual(report['results'][0]['speedup_vs_first'], 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
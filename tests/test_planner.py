@@ -0,0 +1,85 @@
+import unittest
+import heapq
+import os
+import random
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.structures import SimpleGraph
+from src.session import SolverSession
+from src.solver import BoundedMultiSourceShortestPath
+from src.planner import autotune, paper_parameters, plan_parameters
+
+def random_graph(seed, n=40, m=120):
+    rng = random.Random(seed)
+    graph = SimpleGraph()
+    for node in range(n):
+        graph.add_node(node)
+    for _ in range(m):
+        graph.add_edge(rng.randrange(n), rng.randrange(n), float(rng.randint(0, 9)))
+    return graph
+
+def dijkstra(graph, source):
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in graph.get_outgoing_edges(u):
+            if d + w < dist.get(v, float('inf')):
+                dist[v] = d + w
+                heapq.heappush(heap, (d + w, v))
+    return dist
+
+class TestPlanner(unittest.TestCase):
+    def test_valores_do_artigo(self):
+        # log2 n = 27: k = 27^(1/3) = 3, t = 27^(2/3) = 9, níveis = 27 / 9 = 3
+        self.assertEqual(paper_parameters(2 ** 27), (3, 3, 9))
+        self.assertEqual(paper_parameters(1), (1, 1, 1))
+
+    def test_limite_majora_todas_as_distancias(self):
+        for seed in range(20):
+            graph = random_graph(seed)
+            plan = plan_parameters(graph)
+            reached = dijkstra(graph, 0)
+            self.assertGreater(plan.bound, max(reached.values()), msg=f"seed={seed}")
+            self.assertEqual((plan.num_nodes, plan.num_edges, plan.origin), (40, 120, 'paper'))
+
+            session = SolverSession(graph, plan.constants)
+            result = session.solve({0}, plan.bound, plan.level)
+            self.assertEqual(set(result.settled), set(reached))
+            for v, d in reached.items():
+                self.assertEqual(session.distance(v), d)
+
+    def test_override(self):
+        graph = random_graph(0)
+        plan = plan_parameters(graph, {'t': 1, 'bound': 10.0})
+        self.assertEqual((plan.t, plan.level, plan.bound, plan.origin), (1, 6, 10.0, 'override'))
+        with self.assertRaises(ValueError):
+            plan_parameters(graph, {'depth': 3})
+
+    def test_peso_negativo_rejeitado(self):
+        graph = SimpleGraph()
+        graph.add_edge("A", "B", -1.0)
+        with self.assertRaises(ValueError):
+            plan_parameters(graph)
+
+    def test_autotune_escolhe_um_candidato_cronometrado(self):
+        graph = random_graph(3, n=200, m=800)
+        plan = autotune(graph, samples=2, candidates=[(1, 1), (4, 2)])
+        self.assertEqual(plan.origin, 'autotune')
+        self.assertEqual(len(plan.timings), 2)
+        self.assertIn((plan.k, plan.t, plan.level), plan.timings)
+
+    def test_solver_sem_constantes_usa_o_artigo(self):
+        graph = random_graph(1)
+        solver = BoundedMultiSourceShortestPath(graph, {v: float('inf') for v in range(40)}, {'k': 7})
+        _, _, t = paper_parameters(40)
+        self.assertEqual((solver.k, solver.t), (7, t))
+
+if __name__ == "__main__":
+    unittest.main()
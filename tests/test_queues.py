@@ -0,0 +1,130 @@
+import unittest
+import os
+import random
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.structures import IndexedHeap, SimpleGraph
+from src.solver import BoundedMultiSourceShortestPath
+from src.session import SolverSession
+from src.loaders import EdgeArrays, read_json_graph
+from src.planner import autotune, plan_parameters
+from src.queues import BucketQueue, RadixHeap, weight_profile
+
+class TestIntegerQueues(unittest.TestCase):
+    def test_mesma_ordem_que_um_modelo(self):
+        # Modelo {item: chave}: cada pop tem de devolver uma chave mínima e a chave do item
+        for queue_type in (RadixHeap, IndexedHeap, lambda: BucketQueue(10)):
+            rng = random.Random(5)
+            for _ in range(50):
+                queue, model = queue_type(), {}
+                last = 0
+                for _ in range(200):
+                    if model and rng.random() < 0.4:
+                        self.assertEqual(queue.peek_key(), min(model.values()))
+                        key, item = queue.pop()
+                        self.assertEqual(key, min(model.values()))
+                        self.assertEqual(model.pop(item), key)
+                        self.assertNotIn(item, queue)
+                        last = int(key)
+                    else:
+                        item, key = rng.randrange(30), float(last + rng.randint(0, 10))
+                        improves = key < model.get(item, float('inf'))
+                        self.assertEqual(queue.push(item, key), improves)
+                        if improves:
+                            model[item] = key
+                    self.assertEqual(len(queue), len(model))
+
+    def test_chaves_invalidas(self):
+        for queue in (RadixHeap(), BucketQueue()):
+            with self.assertRaises(ValueError):
+                queue.push("a", 1.5)
+            queue.push("b", 4.0)
+            queue.pop()
+            with self.assertRaises(ValueError):
+                queue.push("c", 3.0)
+
+    def test_solver_com_cada_fila(self):
+        rng = random.Random(11)
+        graph = SimpleGraph()
+        for node in range(60):
+            graph.add_node(node)
+        for _ in range(240):
+            graph.add_edge(rng.randrange(60), rng.randrange(60), float(rng.randint(0, 50)))
+        results = {}
+        for queue in ('binary', 'radix', 'dial'):
+            dist_map = {node: float('inf') for node in range(60)}
+            dist_map[0] = 0.0
+            BoundedMultiSourceShortestPath(graph, dist_map, {'k': 2, 't': 1, 'queue': queue, 'max_weight': 50}).solve({0})
+            results[queue] = dist_map
+        self.assertEqual(results['radix'], results['binary'])
+        self.assertEqual(results['dial'], results['binary'])
+
+class TestWeightProfile(unittest.TestCase):
+    def test_escala_e_fila(self):
+        self.assertEqual(weight_profile([1.0, 7.0]).queue, 'dial')
+        profile = weight_profile([2.5, 0.25, 3.0])
+        self.assertEqual((profile.integral, profile.scale, profile.max_weight), (True, 100, 300.0))
+        self.assertEqual(weight_profile([1.0, 2.0 ** 20]).queue, 'radix')
+        self.assertFalse(weight_profile([0.1234567]).integral)
+        self.assertEqual(weight_profile([0.1234567]).queue, 'binary')
+
+    def test_planner_escolhe_a_fila_pelos_pesos(self):
+        edges, data = read_json_graph(os.path.join(BASE_DIR, 'data', 'cenario_complexo.json'))
+        self.assertEqual(edges.weight_profile().scale, 1)
+        graph = edges.to_simple_graph()
+        # Pesos inteiros: Dial já com o k do artigo
+        plan = plan_parameters(graph, num_nodes=len(data['nodes']))
+        self.assertLessEqual(plan.k, 3)
+        self.assertEqual(plan.queue, 'dial')
+        self.assertEqual(plan.constants['queue'], 'dial')
+        result = SolverSession(graph, plan.constants, nodes=data['nodes']).query("A", "F", plan.bound, plan.level)
+        self.assertEqual(result.distance, data['test_params']['expected_cost'])
+        self.assertEqual(autotune(graph, samples=1, candidates=[(1, 1)], nodes=data['nodes']).queue, 'dial')
+        self.assertEqual(plan_parameters(graph, {'queue': 'binary'}).constants, {'k': plan.k, 't': plan.t})
+
+        # Peso máximo grande: radix; pesos decimais (por escalar): heap binário
+        wide = SimpleGraph()
+        wide.add_edge("A", "B", 1.0)
+        wide.add_edge("B", "C", 2.0 ** 20)
+        self.assertEqual(plan_parameters(wide).queue, 'radix')
+        wide.set_weight("A", "B", 0.5)
+        self.assertEqual(plan_parameters(wide).queue, 'binary')
+
+    def test_fila_automatica_da_as_distancias_do_heap_binario(self):
+        rng = random.Random(11)
+        for _ in range(20):
+            graph = SimpleGraph()
+            for _ in range(rng.randint(1, 120)):
+                graph.add_edge(rng.randrange(40), rng.randrange(40), float(rng.choice([0, 1, 3, 7, 2000])))
+            plan = plan_parameters(graph)
+            binary = SolverSession(graph, dict(plan.constants, queue='binary'))
+            chosen = SolverSession(graph, plan.constants)
+            source = graph.labels[0]
+            binary.solve({source}, plan.bound, plan.level)
+            chosen.solve({source}, plan.bound, plan.level)
+            self.assertIn(plan.queue, ('dial', 'radix'))
+            self.assertEqual(dict(chosen.distances), dict(binary.distances))
+
+    def test_pesos_decimais_escalados_sao_exatos(self):
+        # Em float, 0.1 + 0.2 > 0.3; em décimos inteiros, 1 + 2 == 3
+        edges = EdgeArrays()
+        edges.add("A", "B", 0.1)
+        edges.add("B", "C", 0.2)
+        edges.add("C", "D", 0.3)
+        self.assertNotEqual(0.1 + 0.2 + 0.3, 0.6)
+        profile = edges.weight_profile()
+        self.assertEqual(profile.scale, 10)
+        session = SolverSession(edges.scaled(profile.scale).to_simple_graph(),
+                                {'queue': profile.queue, 'max_weight': profile.max_weight},
+                                weight_scale=profile.scale)
+        result = session.query("A", "D", bound=1.0)
+        self.assertEqual(result.distance, 0.6)
+        self.assertEqual(session.distances["C"], 0.3)
+        self.assertEqual(result.path, ["A", "B", "C", "D"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.server import QueryServer, load_graph
+from src.session import SolverSession
+
+async def http(reader, writer, method, target, body=None):
+    """Envia um pedido numa ligação keep-alive e devolve (status, JSON)."""
+    data = json.dumps(body).encode() if body is not None else b''
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b'\r\n':
+            break
+        name, _, value = line.decode().partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+class TestQueryServer(unittest.TestCase):
+    def setUp(self):
+        self.graph = load_graph(os.path.join(BASE_DIR, 'data', 'cenario_complexo.json'))
+
+    def run_server(self, scenario, processes=0):
+        async def main():
+            server = QueryServer(self.graph, {'k': 3, 't': 1}, processes=processes)
+            try:
+                await scenario(server)
+            finally:
+                await server.close()
+        asyncio.run(main())
+
+    def test_pedidos_da_mesma_origem_partilham_um_solve(self):
+        async def scenario(server):
+            routes = await asyncio.gather(*(server.route("A", target) for target in ("F", "D", "F", "C", "A")))
+            self.assertEqual(routes[0]['path'], ['A', 'B', 'C', 'D', 'F'])
+            self.assertEqual(routes[2], routes[0])
+            self.assertEqual((routes[0]['distance'], routes[4]['path']), (20.0, ['A']))
+            self.assertEqual((server.metrics.solves, server.metrics.coalesced), (1, 4))
+            self.assertEqual(server.metrics.max_queue_depth, 1)
+            self.assertEqual(server.metrics.queue_depth, 0)
+
+            # Terminado o solve, um pedido novo corre outra vez
+            await server.route("A", "F")
+            self.assertEqual(server.metrics.solves, 2)
+        self.run_server(scenario)
+
+    def test_http_com_pool_de_processos(self):
+        session = SolverSession(self.graph, {'k': 3, 't': 1})
+        nodes = list(self.graph.labels)
+
+        async def scenario(server):
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                status, route = await http(reader, writer, 'GET', '/route?source=A&target=F')
+                self.assertEqual((status, route['distance'], route['path']), (200, 20.0, ['A', 'B', 'C', 'D', 'F']))
+
+                status, table = await http(reader, writer, 'POST', '/table',
+                                           {'origins': nodes[:4], 'destinations': nodes})
+                self.assertEqual(status, 200)
+                for row, origin in zip(table['distances'], nodes[:4]):
+                    session.solve({origin})
+                    expected = [session.distance(v) for v in nodes]
+                    self.assertEqual([float('inf') if d is None else d for d in row], expected)
+
+                status, error = await http(reader, writer, 'GET', '/route?source=NAO_EXISTE&target=F')
+                self.assertEqual(status, 404)
+                status, _ = await http(reader, writer, 'GET', '/route?source=A')
+                self.assertEqual(status, 400)
+
+                status, metrics = await http(reader, writer, 'GET', '/metrics')
+                self.assertEqual(status, 200)
+                self.assertEqual(metrics['latency']['/route']['count'], 1)
+                self.assertEqual(metrics['errors'], 2)
+                self.assertIn('p99_ms', metrics['latency']['/table'])
+            finally:
+                writer.close()
+        self.run_server(scenario, processes=2)
+
+    def test_content_length_invalido_responde_400(self):
+        async def scenario(server):
+            listener = await server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            for value in (b'abc', b'-5'):
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                try:
+                    writer.write(b"POST /table HTTP/1.1\r\nHost: x\r\nContent-Length: " + value + b"\r\n\r\n")
+                    await writer.drain()
+                    status_line = await asyncio.wait_for(reader.readline(), 5)
+                    self.assertEqual(int(status_line.split()[1]), 400, msg=value)
+                finally:
+                    writer.close()
+            # A ligação seguinte continua a ser servida
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                status, result = await http(reader, writer, 'GET', '/distance?source=B&target=F')
+                self.assertEqual((status, result['distance']), (200, 15.0))
+            finally:
+                writer.close()
+        self.run_server(scenario)
+
+    @unittest.skipUnless(hasattr(asyncio, 'start_unix_server'), "sem Unix sockets")
+    def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bmssp.sock')
+
+            async def scenario(server):
+                await server.start(unix_path=path)
+                reader, writer = await asyncio.open_unix_connection(path)
+                try:
+                    status, result = await http(reader, writer, 'GET', '/distance?source=B&target=F')
+                    self.assertEqual((status, result['distance']), (200, 15.0))
+                finally:
+                    writer.close()
+            self.run_server(scenario)
+
+if __name__ == "__main__":
+    unittest.main()
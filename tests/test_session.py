@@ -0,0 +1,110 @@
+import unittest
+import json
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.structures import SimpleGraph
+from src.session import SolverSession, VersionedMap
+from src.solver import BoundedMultiSourceShortestPath
+
+class TestVersionedMap(unittest.TestCase):
+    def test_reset_invalida_so_por_versao(self):
+        dist = VersionedMap(["A", "B", "C"])
+        dist["B"] = 2.0
+        self.assertEqual((dist["A"], dist["B"], dist.touched), (float('inf'), 2.0, 1))
+
+        dist.reset()
+        self.assertEqual(dist["B"], float('inf'))
+        self.assertEqual(dist.touched, 0)
+        self.assertEqual(len(dist), 3)
+
+    def test_ids_inteiros_sem_dicionario(self):
+        dist = VersionedMap(range(4))
+        dist[3] = 1.5
+        self.assertEqual(list(dist.touched_items()), [(3, 1.5)])
+        self.assertIn(3, dist)
+        self.assertNotIn(4, dist)
+
+class TestSolverSession(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join(BASE_DIR, 'data', 'cenario_complexo.json'), 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+        self.graph = SimpleGraph()
+        for e in self.data['edges']:
+            self.graph.add_edge(e['u'], e['v'], e['w'])
+        self.session = SolverSession(self.graph, {'k': 3, 't': 1}, nodes=self.data['nodes'])
+
+    def fresh_distances(self, source):
+        dist_map = {node: float('inf') for node in self.data['nodes']}
+        dist_map[source] = 0.0
+        BoundedMultiSourceShortestPath(self.graph, dist_map, {'k': 3, 't': 1}).solve({source})
+        return dist_map
+
+    def test_consultas_repetidas_batem_com_solver_novo(self):
+        for source in self.data['nodes']:
+            self.session.solve({source})
+            expected = self.fresh_distances(source)
+            self.assertEqual({n: self.session.distance(n) for n in self.data['nodes']}, expected, msg=source)
+        self.assertEqual(self.session.queries, len(self.data['nodes']))
+
+    def test_query_reaproveita_buffers(self):
+        first = self.session.query("A", "F")
+        second = self.session.query("A", "F")
+        self.assertEqual((first.distance, first.path), (second.distance, second.path))
+        self.assertEqual(first.path, ['A', 'B', 'C', 'D', 'F'])
+        # Só os nós tocados pela última consulta ficam escritos no buffer
+        self.assertLess(self.session.dist.touched, len(self.data['nodes']))
+
+        self.session.query("N1", "F")
+        self.assertEqual(self.session.distance("A"), float('inf'))
+        self.assertEqual(self.session.path_to("F")[0], "N1")
+
+    def test_multi_fonte_reinicia_as_donas(self):
+        first = self.session.multi_source(["A", "N1"])
+        second = self.session.multi_source({"A": 0.0}, bound=10.0)
+        self.assertEqual(second.owner_of("A"), "A")
+        self.assertEqual(set(second.partition()["A"]), second.settled)
+        self.assertTrue(all(self.session.distance(v) < 10.0 for v in second.settled))
+        self.assertIsNone(second.owner_of("N1"))
+        self.assertEqual(first.sources, ["A", "N1"])
+
+    def test_solver_corre_sobre_ids_e_traduz_na_fronteira(self):
+        # Os buffers e o solver só veem inteiros; rótulos só à entrada e à saída
+        self.assertIs(self.session.dist._slots, None)
+        result = self.session.query("A", "F")
+        self.assertTrue(all(isinstance(v, int) for v in self.session.solver.path_to(self.graph.id_of("F"))))
+        self.assertEqual(result.path, ['A', 'B', 'C', 'D', 'F'])
+        self.assertEqual(self.session.distances["F"], result.distance)
+        self.assertEqual(set(self.session.distances), set(self.data['nodes']))
+
+        solved = self.session.solve({"A"})
+        self.assertIn("F", solved.settled)
+        cells = self.session.multi_source(["A", "N1"]).partition()
+        self.assertEqual(sorted(v for cell in cells.values() for v in cell),
+                         sorted(v for v in self.data['nodes'] if self.session.distance(v) < float('inf')))
+
+    def test_no_isolado_recebe_id(self):
+        session = SolverSession(self.graph, {'k': 3, 't': 1}, nodes=self.data['nodes'] + ["ILHA"])
+        self.assertEqual(session.query("A", "ILHA").distance, float('inf'))
+        self.assertEqual(session.distances["ILHA"], float('inf'))
+
+    def test_nos_novos_no_grafo_depois_da_sessao(self):
+        to_f = self.session.query("A", "F").distance
+        self.session.multi_source(["A", "N1"])
+        self.graph.add_edge("F", "NOVO", 1.0)
+        self.graph.add_node("SOLTO")
+        self.assertEqual(self.session.distance("SOLTO"), float('inf'))
+        self.assertEqual(self.session.query("A", "NOVO").distance, to_f + 1.0)
+        self.assertEqual(self.session.path_to("NOVO")[-2:], ["F", "NOVO"])
+        cells = self.session.multi_source(["A", "N1"])
+        self.assertIn(cells.owner_of("NOVO"), ("A", "N1"))
+        self.session.solve({"NOVO"})
+        self.assertEqual(self.session.distance("NOVO"), 0.0)
+        self.assertEqual(len(self.session.tree_arrays()[0]), self.graph.num_nodes)
+
+if __name__ == "__main__":
+    unittest.main()
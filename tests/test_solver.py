@@ -1,7 +1,10 @@
 import unittest
+import heapq
 import json
 import os
+import random
 import sys
+import tempfile
 
 # Garante que o projeto seja encontrado
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -10,34 +13,46 @@ if BASE_DIR not in sys.path:
 
 from src.structures import SimpleGraph
 from src.solver import BoundedMultiSourceShortestPath
+from src.loaders import read_json_graph
 from main import visualize_interactive_gps
 
 class TestBMSSPAutomated(unittest.TestCase):
     def setUp(self):
         self.data_dir = os.path.join(BASE_DIR, 'data')
+        # HTML gerado num diretório temporário: os testes não mexem em output/
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
 
     def run_scenario_logic(self, json_file):
         """Este é o molde que processa qualquer JSON."""
         path = os.path.join(self.data_dir, json_file)
         
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
+        # Leitura em streaming: arestas em colunas, restantes chaves (nodes, test_params) à parte
+        edges, data = read_json_graph(path)
+
         # Criação do grafo (A variável 'graph' nasce aqui)
-        graph = SimpleGraph()
-        for e in data['edges']:
-            graph.add_edge(e['u'], e['v'], e['w'])
-            
+        graph = edges.to_simple_graph()
+
         tp = data['test_params']
         dist_map = {node: float('inf') for node in data['nodes']}
         dist_map[tp['start_node']] = 0.0
         
-        solver = BoundedMultiSourceShortestPath(graph, dist_map, tp['constants'])
+        solver = BoundedMultiSourceShortestPath(graph, dist_map, tp['constants'], track_predecessors=True)
         solver.bmssp(level=tp['level'], bound=tp['bound'], sources={tp['start_node']})
         
         # Validação
         self.assertAlmostEqual(dist_map[tp['target_node']], tp['expected_cost'], places=4)
 
+        # A rota pelos predecessores tem de somar exatamente o custo encontrado
+        path = solver.path_to(tp['target_node'])
+        self.assertEqual(path[0], tp['start_node'])
+        self.assertEqual(path[-1], tp['target_node'])
+        cost = sum(min(w for v, w in graph.get_outgoing_edges(a) if v == b) for a, b in zip(path, path[1:]))
+        self.assertAlmostEqual(cost, tp['expected_cost'], places=4)
+
         # Geração do HTML individual
         output_name = f"resultado_{json_file.replace('.json', '.html')}"
         visualize_interactive_gps(
@@ -45,8 +60,11 @@ class TestBMSSPAutomated(unittest.TestCase):
             dist_map, 
             tp['start_node'], 
             tp['target_node'], 
-            filename=output_name
+            filename=output_name,
+            path=path,
+            output_dir=self.output_dir
         )
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, output_name)))
 
     def test_cenario_simples(self):
         """Gatilho para o teste simples."""
@@ -56,5 +74,177 @@ class TestBMSSPAutomated(unittest.TestCase):
         """Gatilho para o teste complexo."""
         self.run_scenario_logic('cenario_complexo.json')
 
+    def test_query_para_antes_da_execucao_completa(self):
+        with open(os.path.join(self.data_dir, 'cenario_complexo.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        graph = SimpleGraph()
+        for e in data['edges']:
+            graph.add_edge(e['u'], e['v'], e['w'])
+        tp = data['test_params']
+
+        dist_map = {node: float('inf') for node in data['nodes']}
+        solver = BoundedMultiSourceShortestPath(graph, dist_map, {'k': 2, 't': 1}, track_predecessors=True)
+        result = solver.query(tp['start_node'], tp['target_node'])
+
+        self.assertAlmostEqual(result.distance, tp['expected_cost'], places=4)
+        self.assertEqual(result.path, ['A', 'B', 'C', 'D', 'F'])
+        self.assertLess(result.settled, result.total_vertices)
+
+def reference_dijkstra(graph, nodes, start):
+    dist = {node: float('inf') for node in nodes}
+    dist[start] = 0.0
+    pq = [(0.0, start)]
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]: continue
+        for v, w in graph.get_outgoing_edges(u):
+            if d + w < dist[v]:
+                dist[v] = d + w
+                heapq.heappush(pq, (d + w, v))
+    return dist
+
+class TestBMSSPRandomGraphs(unittest.TestCase):
+    """Compara o BMSSP (com pivôs e Pull limitado por M) com um Dijkstra de referência."""
+
+    def random_graph(self, rng):
+        n = rng.randint(1, 40)
+        graph = SimpleGraph()
+        for _ in range(rng.randint(0, 4 * n)):
+            graph.add_edge(rng.randrange(n), rng.randrange(n), rng.choice([0, 1, 2, 3, rng.random() * 5]))
+        return graph, list(range(n))
+
+    def test_grafos_aleatorios_com_empates(self):
+        for seed in range(300):
+            rng = random.Random(seed)
+            graph, nodes = self.random_graph(rng)
+
+            constants = {'k': rng.randint(1, 4), 't': rng.randint(1, 3)}
+            dist_map = {node: float('inf') for node in nodes}
+            dist_map[0] = 0.0
+            solver = BoundedMultiSourceShortestPath(graph, dist_map, constants, track_predecessors=True)
+            solver.solve({0}, level=rng.randint(0, 4))
+
+            expected = reference_dijkstra(graph, nodes, 0)
+            for node in nodes:
+                self.assertAlmostEqual(dist_map[node], expected[node], places=9, msg=f"seed={seed} nó={node}")
+
+            # Cada aresta da árvore de predecessores é justa: d[pai] + w == d[filho]
+            for child, parent in solver.shortest_path_tree().items():
+                candidates = [dist_map[parent] + w for v, w in graph.get_outgoing_edges(parent) if v == child]
+                self.assertIn(dist_map[child], candidates, msg=f"seed={seed} nó={child}")
+                self.assertEqual(solver.path_to(child)[0], 0)
+
+    def test_query_ponto_a_ponto(self):
+        for seed in range(100):
+            rng = random.Random(seed)
+            graph, nodes = self.random_graph(rng)
+            expected = reference_dijkstra(graph, nodes, 0)
+            constants = {'k': rng.randint(1, 4), 't': rng.randint(1, 3)}
+
+            for target in nodes:
+                dist_map = {node: float('inf') for node in nodes}
+                solver = BoundedMultiSourceShortestPath(graph, dist_map, constants, track_predecessors=True)
+                result = solver.query(0, target)
+
+                self.assertAlmostEqual(result.distance, expected[target], places=9, msg=f"seed={seed} alvo={target}")
+                self.assertLessEqual(result.settled, result.total_vertices)
+                if expected[target] < float('inf'):
+                    self.assertEqual((result.path[0], result.path[-1]), (0, target))
+                else:
+                    self.assertIsNone(result.path)
+
+    def test_query_seguida_de_solve_no_mesmo_solver(self):
+        # O alvo já completado da query não pode fazer o solve seguinte parar cedo
+        graph = SimpleGraph()
+        nodes = list(range(10))
+        for i in range(9):
+            graph.add_edge(i, i + 1, 1.0)
+        dist_map = {node: float('inf') for node in nodes}
+        solver = BoundedMultiSourceShortestPath(graph, dist_map, {'k': 2, 't': 1}, track_predecessors=True)
+        self.assertEqual(solver.query(0, 3).distance, 3.0)
+
+        for node in nodes:
+            dist_map[node] = float('inf')
+        dist_map[5] = 0.0
+        result = solver.solve({5})
+        self.assertEqual(set(result.settled), set(range(5, 10)))
+        self.assertEqual([dist_map[i] for i in range(5, 10)], [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    def test_multi_fonte_com_dona_e_limite(self):
+        for seed in range(150):
+            rng = random.Random(seed)
+            graph, nodes = self.random_graph(rng)
+            sources = {rng.randrange(len(nodes)): float(rng.randint(0, 3)) for _ in range(rng.randint(1, 4))}
+            bound = rng.choice([float('inf'), rng.random() * 8])
+
+            # Referência: um Dijkstra por fonte, somando o custo inicial
+            per_source = {s: reference_dijkstra(graph, nodes, s) for s in sources}
+            expected = {v: min(c + per_source[s][v] for s, c in sources.items()) for v in nodes}
+
+            dist_map = {node: float('inf') for node in nodes}
+            solver = BoundedMultiSourceShortestPath(graph, dist_map, {'k': rng.randint(1, 4), 't': 2}, track_predecessors=True)
+            result = solver.multi_source(sources, bound)
+
+            self.assertEqual(result.settled, {v for v in nodes if expected[v] < bound}, msg=f"seed={seed}")
+            cells = result.partition()
+            self.assertEqual(sorted(v for cell in cells.values() for v in cell), sorted(result.settled))
+            for owner, cell in cells.items():
+                for v in cell:
+                    self.assertAlmostEqual(dist_map[v], expected[v], places=9)
+                    self.assertAlmostEqual(sources[owner] + per_source[owner][v], expected[v], places=9)
+                    self.assertEqual(solver.path_to(v)[0], owner)
+
+    def test_multi_fonte_seguida_de_solve_nao_mexe_nas_donas(self):
+        graph = SimpleGraph()
+        nodes = list(range(8))
+        for i in range(7):
+            graph.add_edge(i, i + 1, 1.0)
+        dist_map = {node: float('inf') for node in nodes}
+        solver = BoundedMultiSourceShortestPath(graph, dist_map, {'k': 2, 't': 1}, track_predecessors=True)
+        result = solver.multi_source([0, 4])
+        owners = dict(result.owner)
+
+        for node in nodes:
+            dist_map[node] = float('inf')
+        dist_map[2] = 0.0
+        solver.solve({2})
+        self.assertEqual(dict(result.owner), owners)
+        self.assertIsNone(solver.owner)
+        self.assertEqual(dist_map[7], 5.0)
+
+    def test_orcamento_atingido_e_reportado_sem_distancias_incompletas(self):
+        # Cadeia longa com k=1, t=1 e nível 1: o orçamento k * 2^(l*t) = 2 esgota-se cedo
+        graph = SimpleGraph()
+        nodes = list(range(50))
+        for i in range(49):
+            graph.add_edge(i, i + 1, 1.0)
+        dist_map = {node: float('inf') for node in nodes}
+        dist_map[0] = 0.0
+
+        solver = BoundedMultiSourceShortestPath(graph, dist_map, {'k': 1, 't': 1})
+        result = solver.solve({0}, level=1)
+
+        self.assertGreater(result.budget_hits, 0)
+        self.assertGreater(result.resumes, 0)
+        self.assertEqual(result.bound, float('inf'))
+        self.assertEqual(set(result.settled), set(nodes))
+        self.assertEqual([dist_map[i] for i in nodes], [float(i) for i in nodes])
+
+    def test_niveis_acima_do_limite_de_recursao(self):
+        # Pilha explícita: mais níveis do que o limite de recursão do Python não rebenta
+        graph = SimpleGraph()
+        nodes = list(range(30))
+        for i in range(29):
+            graph.add_edge(i, i + 1, 1.0)
+        dist_map = {node: float('inf') for node in nodes}
+        dist_map[0] = 0.0
+
+        solver = BoundedMultiSourceShortestPath(graph, dist_map, {'k': 2, 't': 1})
+        reached_bound, settled = solver.bmssp(sys.getrecursionlimit() + 100, float('inf'), {0})
+
+        self.assertEqual(reached_bound, float('inf'))
+        self.assertEqual(settled, set(nodes))
+        self.assertEqual([dist_map[i] for i in nodes], [float(i) for i in nodes])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,213 @@
+import unittest
+import os
+import random
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.structures import BatchQueue, IndexedHeap, SimpleGraph
+
+class TestBatchQueue(unittest.TestCase):
+    def make_queue(self, m, bound=100.0):
+        queue = BatchQueue()
+        queue.initialize(m, bound)
+        return queue
+
+    def test_pull_respeita_m_e_separa_pelo_limite(self):
+        queue = self.make_queue(m=3)
+        for i, d in enumerate([9.0, 1.0, 7.0, 3.0, 5.0, 2.0, 8.0]):
+            queue.insert(f"v{i}", d)
+
+        bound, batch = queue.pull()
+        self.assertEqual(batch, {"v1", "v5", "v3"})
+        self.assertEqual(bound, 5.0)
+        self.assertEqual(len(queue), 4)
+
+        bound, batch = queue.pull()
+        self.assertEqual(batch, {"v4", "v2", "v6"})
+        self.assertEqual(bound, 9.0)
+
+        bound, batch = queue.pull()
+        self.assertEqual((bound, batch), (100.0, {"v0"}))
+        self.assertTrue(queue.is_empty())
+
+    def test_insert_mantem_menor_valor_e_ignora_fora_do_limite(self):
+        queue = self.make_queue(m=10, bound=10.0)
+        queue.insert("a", 5.0)
+        queue.insert("a", 7.0)
+        queue.insert("a", 4.0)
+        queue.insert("b", 10.0)
+        self.assertEqual(len(queue), 1)
+        self.assertEqual(queue.pull(), (10.0, {"a"}))
+
+    def test_batch_prepend_vem_antes_dos_inserts(self):
+        queue = self.make_queue(m=2)
+        queue.insert("x", 50.0)
+        queue.insert("y", 60.0)
+        queue.batch_prepend([("p", 3.0), ("q", 1.0), ("r", 2.0), ("q", 0.5)])
+
+        bound, batch = queue.pull()
+        self.assertEqual(batch, {"q", "r"})
+        self.assertEqual(bound, 3.0)
+        bound, batch = queue.pull()
+        self.assertEqual(batch, {"p", "x"})
+        self.assertEqual(bound, 60.0)
+
+    def test_empates_nao_ficam_dos_dois_lados_do_limite(self):
+        queue = self.make_queue(m=2)
+        for vertex in "abc":
+            queue.insert(vertex, 4.0)
+        queue.insert("d", 1.0)
+
+        self.assertEqual(queue.pull(), (4.0, {"d"}))
+        # Só empates: devolve o grupo inteiro, mesmo acima de M
+        self.assertEqual(queue.pull(), (100.0, {"a", "b", "c"}))
+
+class TestSimpleGraph(unittest.TestCase):
+    EDGES = [("A", "B", 4.0), ("B", "D", 2.0), ("A", "C", 20.0), ("B", "C", 8.0), ("C", "D", 7.0), ("A", "B", 1.0)]
+
+    def test_index_view_usa_ids(self):
+        graph = SimpleGraph()
+        graph.add_edges(self.EDGES)
+        view = graph.index_view()
+        a, b = graph.id_of("A"), graph.id_of("B")
+        self.assertEqual(view.get_outgoing_edges(a), [(b, 4.0), (graph.id_of("C"), 20.0), (b, 1.0)])
+        self.assertEqual([(graph.label_of(u), w) for u, w in view.get_incoming_edges(graph.id_of("D"))],
+                         graph.get_incoming_edges("D"))
+        # A vista acompanha as alterações do grafo
+        graph.remove_edge("A", "C")
+        self.assertEqual(view.get_outgoing_edges(a), [(b, 4.0), (b, 1.0)])
+
+    def test_add_edges_e_from_arrays_iguais_a_add_edge(self):
+        expected = SimpleGraph()
+        for u, v, w in self.EDGES:
+            expected.add_edge(u, v, w)
+
+        bulk = SimpleGraph()
+        bulk.add_edges(self.EDGES[:3])
+        bulk.add_edges(iter(self.EDGES[3:]))
+        arrays = SimpleGraph.from_arrays(["A", "B", "C", "D"], [0, 1, 0, 1, 2, 0], [1, 3, 2, 2, 3, 1], [4, 2, 20, 8, 7, 1])
+
+        for graph in (bulk, arrays):
+            self.assertEqual(dict(graph.edges), dict(expected.edges))
+            self.assertEqual(dict(graph.reverse_edges), dict(expected.reverse_edges))
+        self.assertEqual(expected.get_outgoing_edges("A"), [("B", 4.0), ("C", 20.0), ("B", 1.0)])
+        self.assertEqual(expected.get_incoming_edges("D"), [("B", 2.0), ("C", 7.0)])
+        self.assertEqual((expected.num_nodes, expected.num_edges), (4, 6))
+        self.assertEqual(expected.get_outgoing_edges("inexistente"), [])
+
+    def test_sem_indice_inverso(self):
+        graph = SimpleGraph(track_reverse=False)
+        graph.add_edges(self.EDGES)
+        graph.add_edge("D", "A", 3.0)
+        self.assertEqual(graph.get_outgoing_edges("D"), [("A", 3.0)])
+        with self.assertRaises(RuntimeError):
+            graph.get_incoming_edges("D")
+
+    def test_from_arrays_valida_colunas(self):
+        with self.assertRaises(ValueError):
+            SimpleGraph.from_arrays(["A", "B"], [0], [1, 0], [1.0])
+        with self.assertRaises(ValueError):
+            SimpleGraph.from_arrays(["A", "A"], [0], [1], [1.0])
+
+    def test_compactacao_e_cache_seguem_as_alteracoes(self):
+        for cache_adjacency in (False, True):
+            with self.subTest(cache_adjacency=cache_adjacency):
+                self.check_alteracoes(SimpleGraph(cache_adjacency=cache_adjacency))
+
+    def check_alteracoes(self, graph):
+        # Modelo de referência: listas por nó na ordem de inserção, com remoções e pesos novos
+        rng = random.Random(5)
+        out, inc = {}, {}
+        for step in range(600):
+            u, v = rng.randrange(12), rng.randrange(12)
+            action = rng.random()
+            if action < 0.6:
+                w = float(rng.randint(1, 9))
+                graph.add_edge(u, v, w)
+                out.setdefault(u, []).append((v, w))
+                inc.setdefault(v, []).append((u, w))
+                out.setdefault(v, [])
+            elif graph.has_edge(u, v):
+                index = [x for x, _ in out[u]].index(v)
+                old = out[u][index][1]
+                back = inc[v].index((u, old))
+                if action < 0.8:
+                    graph.remove_edge(u, v)
+                    del out[u][index], inc[v][back]
+                else:
+                    graph.set_weight(u, v, old + 1)
+                    out[u][index], inc[v][back] = (v, old + 1), (u, old + 1)
+            # Leituras intercaladas: compactações, blocos com arestas encadeadas e cache
+            if step % 7 == 0:
+                for node in out:
+                    self.assertEqual(graph.get_outgoing_edges(node), out[node], msg=step)
+                    self.assertEqual(graph.get_incoming_edges(node), inc.get(node, []), msg=step)
+                    node_id = graph.id_of(node)
+                    ids = [(graph.id_of(x), w) for x, w in out[node]]
+                    self.assertEqual(graph.index_view().get_outgoing_edges(node_id), ids)
+        self.assertEqual(graph.num_edges, sum(map(len, out.values())))
+
+        graph.clear_cache()
+        graph.compact()
+        self.assertEqual({node: graph.get_outgoing_edges(node) for node in out}, out)
+
+    def test_remocao_pequena_nao_compacta(self):
+        rng = random.Random(8)
+        edges = [(rng.randrange(40), rng.randrange(40), float(rng.randint(1, 9))) for _ in range(400)]
+        graph = SimpleGraph()
+        graph.add_edges(edges)
+        graph.compact()
+        out = {}
+        for u, v, w in edges:
+            out.setdefault(u, []).append((v, w))
+        compactions = []
+        original = graph.compact
+        graph.compact = lambda: (compactions.append(1), original())
+        # Remoções no início, no meio e no fim dos blocos, cada uma seguida de leituras
+        for u, v, _ in rng.sample(edges, 60):
+            if not graph.has_edge(u, v):
+                continue
+            graph.remove_edge(u, v)
+            del out[u][[x for x, _ in out[u]].index(v)]
+            self.assertEqual(graph.get_outgoing_edges(u), out[u])
+            self.assertEqual(graph.index_view().get_outgoing_edges(graph.id_of(u)),
+                             [(graph.id_of(x), w) for x, w in out[u]])
+        self.assertEqual(compactions, [])
+        for u, v, _ in rng.sample(edges, 60):
+            if graph.has_edge(u, v):
+                graph.remove_edge(u, v)
+                del out[u][[x for x, _ in out[u]].index(v)]
+        self.assertEqual({u: graph.get_outgoing_edges(u) for u in out}, out)
+        self.assertEqual(len(compactions), 1)
+
+class TestIndexedHeap(unittest.TestCase):
+    def test_decrease_key_sem_duplicados(self):
+        heap = IndexedHeap()
+        self.assertTrue(heap.push("a", 5.0))
+        self.assertTrue(heap.push("b", 3.0))
+        self.assertFalse(heap.push("a", 7.0))
+        self.assertTrue(heap.push("a", 1.0))
+        self.assertEqual(len(heap), 2)
+        self.assertEqual(heap.key("a"), 1.0)
+        self.assertEqual([heap.pop(), heap.pop()], [(1.0, "a"), (3.0, "b")])
+        self.assertNotIn("a", heap)
+        self.assertFalse(heap)
+
+    def test_ordem_igual_a_ordenacao_com_chaves_finais(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            heap, best = IndexedHeap(), {}
+            for _ in range(rng.randint(1, 200)):
+                item, key = rng.randrange(40), rng.choice([rng.random(), float(rng.randint(0, 5))])
+                heap.push(item, key)
+                best[item] = min(key, best.get(item, float('inf')))
+                self.assertLessEqual(len(heap), 40)
+            popped = [heap.pop() for _ in range(len(heap))]
+            self.assertEqual(sorted(k for k, _ in popped), [k for k, _ in popped])
+            self.assertEqual(dict((item, key) for key, item in popped), best)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import os
+import random
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from src.csr import CSRGraph
+from src.solver import BoundedMultiSourceShortestPath
+from src.structures import SimpleGraph
+from src.vectorized import FrontierRelaxer
+
+class TestVectorizedRelaxation(unittest.TestCase):
+    def random_csr(self, seed):
+        rng = random.Random(seed)
+        n = rng.randint(1, 60)
+        edges = [(rng.randrange(n), rng.randrange(n), rng.choice([0, 1, 2, rng.random() * 5]))
+                 for _ in range(rng.randint(0, 5 * n))]
+        return CSRGraph.from_edges(edges, nodes=range(n)), rng
+
+    def test_relax_faz_scatter_min_e_separa_por_mascaras(self):
+        graph = CSRGraph.from_edges([(0, 1, 5.0), (0, 2, 1.0), (3, 1, 2.0), (3, 2, 9.0)], nodes=range(4))
+        dist = np.array([0.0, np.inf, 4.0, 1.0])
+        relaxer = FrontierRelaxer(graph)
+
+        insert_ids, insert_dists, prepend_ids = relaxer.relax(
+            dist, np.array([0, 3]), batch_bound=2.0, rec_bound=0.5, global_bound=10.0)
+
+        self.assertEqual(dist.tolist(), [0.0, 3.0, 1.0, 1.0])
+        self.assertEqual(insert_ids.tolist(), [1])
+        self.assertEqual(insert_dists.tolist(), [3.0])
+        self.assertEqual(prepend_ids.tolist(), [2])
+
+    def test_resultado_identico_ao_caminho_escalar(self):
+        for seed in range(200):
+            graph, rng = self.random_csr(seed)
+            constants = {'k': rng.randint(1, 4), 't': rng.randint(1, 3)}
+            level = rng.randint(0, 3)
+
+            dist_map = {node: float('inf') for node in graph.labels}
+            dist_map[0] = 0.0
+            scalar_solver = BoundedMultiSourceShortestPath(graph, dist_map, constants, track_predecessors=True)
+            scalar = scalar_solver.solve({0}, level=level)
+
+            dist_array = np.full(graph.num_nodes, np.inf)
+            dist_array[0] = 0.0
+            vector_solver = BoundedMultiSourceShortestPath(graph, dist_array, constants, vectorized=True, track_predecessors=True)
+            vectorized = vector_solver.solve({0}, level=level)
+
+            self.assertEqual(dist_array.tolist(), [dist_map[node] for node in graph.labels], msg=f"seed={seed}")
+            self.assertEqual(vectorized.settled, scalar.settled, msg=f"seed={seed}")
+            self.assertEqual(vector_solver.shortest_path_tree(), scalar_solver.shortest_path_tree(), msg=f"seed={seed}")
+
+    def test_exige_csr_graph(self):
+        with self.assertRaises(TypeError):
+            BoundedMultiSourceShortestPath(SimpleGraph(), np.zeros(1), {}, vectorized=True)
+
+if __name__ == "__main__":
+    unittest.main()